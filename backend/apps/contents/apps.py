@@ -5,3 +5,6 @@ class ContentsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.contents"
     label = "contents"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,118 @@
+# type: ignore
+import fcntl
+import json
+import os
+import socket
+import threading
+import uuid
+from pathlib import Path
+
+from apps.users.models import User
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Content, DownloadLog
+from .rollups import insert_logs_with_rollups
+
+SPOOL_SUFFIX = ".jsonl"
+DRAINING_SUFFIX = ".draining"
+
+_write_lock = threading.Lock()
+
+
+def spool_dir() -> Path:
+    path = Path(settings.DOWNLOAD_LOG_SPOOL_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _spool_path() -> Path:
+    return spool_dir() / f"{socket.gethostname()}-{os.getpid()}{SPOOL_SUFFIX}"
+
+
+def enqueue_download(user_id, content_id) -> str:
+    """
+    Appends a download record to this process's spool file and returns its id.
+    The row is written to `download_logs` later by `drain_download_logs`.
+    """
+    record_id = str(uuid.uuid4())
+    line = json.dumps({"id": record_id, "user_id": str(user_id), "content_id": str(content_id), "created_at": timezone.now().isoformat()}) + "\n"
+    path = _spool_path()
+    with _write_lock:
+        while True:
+            with open(path, "a", encoding="utf-8") as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                # The drainer may have renamed the file between open() and flock(); write to a fresh one instead.
+                try:
+                    same_file = os.stat(path).st_ino == os.fstat(handle.fileno()).st_ino
+                except FileNotFoundError:
+                    same_file = False
+                if same_file:
+                    handle.write(line)
+                    return record_id
+
+
+def pending_bytes() -> int:
+    return sum(path.stat().st_size for path in spool_dir().iterdir() if path.suffix in (SPOOL_SUFFIX, DRAINING_SUFFIX))
+
+
+def claim_spool_files() -> list[Path]:
+    """
+    Renames every live spool file to `.draining` so writers start new files,
+    and returns all claimed files including ones left over from an interrupted drain.
+    """
+    directory = spool_dir()
+    for path in directory.glob(f"*{SPOOL_SUFFIX}"):
+        target = path.with_name(f"{path.stem}.{timezone.now():%Y%m%d%H%M%S%f}{DRAINING_SUFFIX}")
+        try:
+            path.rename(target)
+        except FileNotFoundError:
+            continue
+    return sorted(directory.glob(f"*{DRAINING_SUFFIX}"))
+
+
+def read_spool_file(path: Path) -> list[dict]:
+    with open(path, "r+", encoding="utf-8") as handle:
+        # Wait for any writer that opened the file before it was renamed.
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        lines = handle.read().splitlines()
+    records = []
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return records
+
+
+def write_batch(records: list[dict]) -> int:
+    """
+    Inserts one batch of spooled records and updates the daily rollups.
+    Rows whose user or content no longer exists are dropped, and ids already
+    present are skipped, so replaying a batch after a crash never duplicates rows.
+    """
+    content_ids = set(Content.objects.filter(id__in={r["content_id"] for r in records}).values_list("id", flat=True))
+    user_ids = set(User.objects.filter(id__in={r["user_id"] for r in records}).values_list("id", flat=True))
+    logs = [
+        DownloadLog(id=r["id"], user_id=r["user_id"], content_id=r["content_id"], created_at=parse_datetime(r["created_at"]))
+        for r in records
+        if uuid.UUID(r["content_id"]) in content_ids and uuid.UUID(r["user_id"]) in user_ids
+    ]
+    insert_logs_with_rollups(logs)
+    return len(logs)
+
+
+def drain(batch_size: int) -> int:
+    """
+    Writes every pending spooled record to the database in batches.
+    A spool file is removed only after all of its batches have committed.
+    """
+    written = 0
+    for path in claim_spool_files():
+        records = read_spool_file(path)
+        for start in range(0, len(records), batch_size):
+            end = start + batch_size
+            written += write_batch(records[start:end])
+        path.unlink()
+    return written
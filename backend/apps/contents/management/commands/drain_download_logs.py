@@ -0,0 +1,58 @@
+# type: ignore
+import logging
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection
+
+from ...ingest import drain, pending_bytes
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Writes spooled download logs to the database in batches. Runs until SIGTERM/SIGINT unless --once is given."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Drain everything pending and exit.")
+        parser.add_argument("--batch-size", type=int, default=settings.DOWNLOAD_LOG_BATCH_SIZE)
+        parser.add_argument("--interval", type=float, default=settings.DOWNLOAD_LOG_FLUSH_INTERVAL, help="Maximum seconds between flushes.")
+        parser.add_argument("--flush-bytes", type=int, default=settings.DOWNLOAD_LOG_FLUSH_BYTES, help="Flush early once this much is spooled.")
+        parser.add_argument("--poll", type=float, default=0.5)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if options["once"]:
+            self.flush(batch_size)
+            return
+
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        last_flush = time.monotonic()
+        while not self.stopping:
+            if time.monotonic() - last_flush >= options["interval"] or pending_bytes() >= options["flush_bytes"]:
+                self.flush(batch_size)
+                last_flush = time.monotonic()
+            time.sleep(options["poll"])
+
+        # Graceful shutdown: nothing accepted before the signal is left behind.
+        self.flush(batch_size)
+        self.stdout.write("Stopped.")
+
+    def stop(self, signum, frame):
+        self.stopping = True
+
+    def flush(self, batch_size):
+        try:
+            written = drain(batch_size)
+        except DatabaseError:
+            # Unfinished `.draining` files stay put and are replayed on the next pass; ids already written are skipped.
+            logger.exception("Draining download logs failed; retrying on the next flush")
+            connection.close()
+            return
+        if written:
+            self.stdout.write(f"Wrote {written} download logs.")
@@ -0,0 +1,57 @@
+# type: ignore
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...partitions import (
+    add_months,
+    archive_partition,
+    attached_partitions,
+    create_partition,
+    detach_partition,
+    detached_partitions,
+    drop_partition,
+    month_floor,
+)
+
+
+class Command(BaseCommand):
+    help = "Pre-creates upcoming monthly partitions of download_logs and retires partitions older than the retention window: " "each is detached, archived to a gzipped CSV and dropped. Run it daily."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ahead", type=int, default=settings.DOWNLOAD_LOG_PARTITIONS_AHEAD, help="Months to create beyond the current one.")
+        parser.add_argument("--retain", type=int, default=settings.DOWNLOAD_LOG_RETENTION_MONTHS, help="Months to keep, including the current one.")
+        parser.add_argument("--archive-dir", default=settings.DOWNLOAD_LOG_ARCHIVE_DIR)
+        parser.add_argument("--keep-detached", action="store_true", help="Detach and archive old partitions but do not drop them.")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        current = month_floor(timezone.now().date())
+        attached = attached_partitions()
+
+        for offset in range(options["ahead"] + 1):
+            month = add_months(current, offset)
+            if month in attached:
+                continue
+            if options["dry_run"]:
+                self.stdout.write(f"Would create partition for {month:%Y-%m}")
+            else:
+                self.stdout.write(f"Created {create_partition(month)}")
+
+        oldest_kept = add_months(current, -(max(options["retain"], 1) - 1))
+        retiring = {month: name for month, name in attached.items() if month < oldest_kept}
+        if not options["keep_detached"]:
+            # Partitions whose retirement stopped after the detach are archived and dropped now.
+            retiring.update((month, name) for month, name in detached_partitions().items() if month < oldest_kept)
+        for month, name in sorted(retiring.items()):
+            if options["dry_run"]:
+                self.stdout.write(f"Would retire {name}")
+                continue
+            # The detach commits on its own, so download_logs is not locked while the archive is written.
+            detach_partition(name)
+            archive = archive_partition(name, Path(options["archive_dir"]))
+            if not options["keep_detached"]:
+                drop_partition(name)
+            self.stdout.write(f"Retired {name} -> {archive}")
@@ -0,0 +1,41 @@
+# type: ignore
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from ...rollups import log_day_range, rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes content_download_daily from download_logs, one chunk of days per transaction. "
+        "Days still receiving downloads may be off by in-flight batches; stop drain_download_logs or limit --until to past days."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", type=date.fromisoformat, help="First day to rebuild (YYYY-MM-DD). Defaults to the oldest log.")
+        parser.add_argument("--until", type=date.fromisoformat, help="Last day to rebuild, inclusive. Defaults to the newest log.")
+        parser.add_argument("--chunk-days", type=int, default=7)
+
+    def handle(self, *args, **options):
+        bounds = log_day_range()
+        if bounds is None and not (options["since"] and options["until"]):
+            self.stdout.write("No download logs to roll up.")
+            return
+
+        start = options["since"] or bounds[0]
+        end = (options["until"] or bounds[1]) + timedelta(days=1)
+        if start >= end:
+            raise CommandError("--since must not be after --until.")
+
+        chunk = timedelta(days=max(options["chunk_days"], 1))
+        total = 0
+        while start < end:
+            chunk_end = min(start + chunk, end)
+            with transaction.atomic():
+                written = rebuild_rollups(start, chunk_end)
+            total += written
+            self.stdout.write(f"{start} .. {chunk_end - timedelta(days=1)}: {written} rollup rows")
+            start = chunk_end
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {total} rollup rows."))
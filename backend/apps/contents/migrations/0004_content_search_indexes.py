@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:10
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contents", "0003_initial"),
+        ("courses", "0004_course_trigram_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="content",
+            name="contents_tags_0372ee_idx",
+        ),
+        migrations.AddIndex(
+            model_name="content",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["tags"],
+                name="contents_tags_path_ops",
+                opclasses=["jsonb_path_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="content",
+            index=django.contrib.postgres.indexes.GinIndex(fields=["title"], name="contents_title_trgm", opclasses=["gin_trgm_ops"]),
+        ),
+    ]
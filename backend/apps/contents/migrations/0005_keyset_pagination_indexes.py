@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contents", "0004_content_search_indexes"),
+        ("courses", "0005_course_offering_cohort_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="content",
+            index=models.Index(fields=["created_at", "id"], name="contents_created_db9d05_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="downloadlog",
+            index=models.Index(fields=["created_at", "id"], name="download_lo_created_fad3d1_idx"),
+        ),
+        migrations.RemoveIndex(
+            model_name="downloadlog",
+            name="download_lo_created_4ffce5_idx",
+        ),
+    ]
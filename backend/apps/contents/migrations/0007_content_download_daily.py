@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contents", "0006_download_log_created_at_default"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContentDownloadDaily",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("download_count", models.PositiveIntegerField(default=0)),
+                (
+                    "content",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_downloads",
+                        to="contents.content",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Daily Content Downloads",
+                "verbose_name_plural": "Daily Content Downloads",
+                "db_table": "content_download_daily",
+                "indexes": [models.Index(fields=["day", "content"], name="content_dow_day_9a397f_idx")],
+                "constraints": [models.UniqueConstraint(fields=("content", "day"), name="content_download_daily_unique")],
+            },
+        ),
+    ]
@@ -0,0 +1,102 @@
+from datetime import date
+
+from django.db import migrations
+from django.utils import timezone
+
+INDEXES = {
+    "download_lo_user_id_970f04_idx": "(user_id)",
+    "download_lo_content_be3601_idx": "(content_id)",
+    "download_lo_created_fad3d1_idx": "(created_at, id)",
+}
+
+PARTITIONS_AHEAD = 3
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_download_logs(apps, schema_editor):
+    """
+    Rebuilds download_logs as a table range-partitioned by month on created_at.
+    The primary key becomes (id, created_at) because a partitioned table's keys
+    must include the partition column; Django keeps treating `id` as the pk.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        for name in INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
+        cursor.execute("ALTER TABLE download_logs RENAME TO download_logs_unpartitioned")
+        cursor.execute("ALTER TABLE download_logs_unpartitioned RENAME CONSTRAINT download_logs_pkey TO download_logs_unpartitioned_pkey")
+        cursor.execute(
+            """
+            CREATE TABLE download_logs (
+                id uuid NOT NULL,
+                created_at timestamp with time zone NOT NULL,
+                updated_at timestamp with time zone NOT NULL,
+                content_id uuid NOT NULL REFERENCES contents (id) DEFERRABLE INITIALLY DEFERRED,
+                user_id uuid NOT NULL REFERENCES users (id) DEFERRABLE INITIALLY DEFERRED,
+                PRIMARY KEY (id, created_at)
+            ) PARTITION BY RANGE (created_at)
+            """
+        )
+        for name, columns in INDEXES.items():
+            cursor.execute(f"CREATE INDEX {name} ON download_logs {columns}")
+
+        cursor.execute("SELECT MIN(created_at) FROM download_logs_unpartitioned")
+        oldest = cursor.fetchone()[0]
+        current = timezone.now().date().replace(day=1)
+        month = oldest.date().replace(day=1) if oldest else current
+        last = add_months(current, PARTITIONS_AHEAD)
+        while month <= last:
+            cursor.execute(
+                f"CREATE TABLE download_logs_p{month:%Y_%m} PARTITION OF download_logs " f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+            )
+            month = add_months(month, 1)
+
+        cursor.execute(
+            """
+            INSERT INTO download_logs (id, created_at, updated_at, content_id, user_id)
+            SELECT id, created_at, updated_at, content_id, user_id FROM download_logs_unpartitioned
+            """
+        )
+        cursor.execute("DROP TABLE download_logs_unpartitioned")
+
+
+def unpartition_download_logs(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("ALTER TABLE download_logs RENAME TO download_logs_partitioned")
+        for name in INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
+        cursor.execute("ALTER TABLE download_logs_partitioned RENAME CONSTRAINT download_logs_pkey TO download_logs_partitioned_pkey")
+        cursor.execute(
+            """
+            CREATE TABLE download_logs (
+                id uuid NOT NULL PRIMARY KEY,
+                created_at timestamp with time zone NOT NULL,
+                updated_at timestamp with time zone NOT NULL,
+                content_id uuid NOT NULL REFERENCES contents (id) DEFERRABLE INITIALLY DEFERRED,
+                user_id uuid NOT NULL REFERENCES users (id) DEFERRABLE INITIALLY DEFERRED
+            )
+            """
+        )
+        for name, columns in INDEXES.items():
+            cursor.execute(f"CREATE INDEX {name} ON download_logs {columns}")
+        cursor.execute(
+            """
+            INSERT INTO download_logs (id, created_at, updated_at, content_id, user_id)
+            SELECT id, created_at, updated_at, content_id, user_id FROM download_logs_partitioned
+            """
+        )
+        cursor.execute("DROP TABLE download_logs_partitioned")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contents", "0007_content_download_daily"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_download_logs, unpartition_download_logs),
+    ]
@@ -3,7 +3,9 @@ from typing import Any
 
 from apps.courses.models import Course
 from apps.users.models import User
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.utils import timezone
 from utils.normalization import normalize_capitalization
 
 
@@ -46,7 +48,9 @@ class Content(models.Model):
         indexes = [
             models.Index(fields=["course"]),
             models.Index(fields=["type"]),
-            models.Index(fields=["tags"]),
+            GinIndex(name="contents_tags_path_ops", fields=["tags"], opclasses=["jsonb_path_ops"]),
+            GinIndex(name="contents_title_trgm", fields=["title"], opclasses=["gin_trgm_ops"]),
+            models.Index(fields=["created_at", "id"]),
         ]
 
 
@@ -55,7 +59,8 @@ class DownloadLog(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="download_logs")
     content = models.ForeignKey(Content, on_delete=models.CASCADE, related_name="download_logs")
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Not auto_now_add: spooled logs keep the time of the click, not of the batch insert.
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
@@ -68,5 +73,25 @@ class DownloadLog(models.Model):
         indexes = [
             models.Index(fields=["user"]),
             models.Index(fields=["content"]),
-            models.Index(fields=["created_at"]),
+            models.Index(fields=["created_at", "id"]),
+        ]
+
+
+class ContentDownloadDaily(models.Model):
+    content = models.ForeignKey(Content, on_delete=models.CASCADE, related_name="daily_downloads")
+    day = models.DateField()
+    download_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.content_id} on {self.day}: {self.download_count}"
+
+    class Meta:
+        db_table = "content_download_daily"
+        verbose_name = "Daily Content Downloads"
+        verbose_name_plural = "Daily Content Downloads"
+        constraints = [
+            models.UniqueConstraint(fields=["content", "day"], name="content_download_daily_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["day", "content"]),
         ]
@@ -0,0 +1,110 @@
+# type: ignore
+import gzip
+import re
+from datetime import date
+from pathlib import Path
+
+from django.db import connection
+
+from .models import DownloadLog
+
+PARENT_TABLE = DownloadLog._meta.db_table
+PARTITION_RE = re.compile(rf"^{PARENT_TABLE}_p(\d{{4}})_(\d{{2}})$")
+
+
+def month_floor(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_p{month:%Y_%m}"
+
+
+def _by_month(names) -> dict[date, str]:
+    partitions = {}
+    for name in names:
+        match = PARTITION_RE.match(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+def attached_partitions() -> dict[date, str]:
+    """
+    Monthly partitions currently attached to download_logs, keyed by month.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            """,
+            [PARENT_TABLE],
+        )
+        return _by_month(row[0] for row in cursor.fetchall())
+
+
+def create_partition(month: date) -> str:
+    name = partition_name(month)
+    with connection.cursor() as cursor:
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} " f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{add_months(month, 1).isoformat()} 00:00:00+00')")
+    return name
+
+
+def detached_partitions() -> dict[date, str]:
+    """
+    Monthly partition tables no longer attached to download_logs: those whose
+    retirement stopped after the detach, or that were kept with --keep-detached.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT relname
+            FROM pg_class
+            WHERE relkind = 'r' AND relname LIKE %s
+            AND NOT EXISTS (SELECT 1 FROM pg_inherits WHERE inhrelid = pg_class.oid)
+            """,
+            [f"{PARENT_TABLE}_p%"],
+        )
+        return _by_month(row[0] for row in cursor.fetchall())
+
+
+def detach_partition(name: str) -> None:
+    """
+    Detaches a partition with DETACH PARTITION ... CONCURRENTLY, which takes only
+    a SHARE UPDATE EXCLUSIVE lock on download_logs, so inserts and reads go on.
+    It must run outside a transaction. A detach that was interrupted part way is
+    completed with FINALIZE.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT inhdetachpending FROM pg_inherits WHERE inhrelid = %s::regclass", [name])
+        row = cursor.fetchone()
+        if row is None:
+            return
+        cursor.execute(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name} {'FINALIZE' if row[0] else 'CONCURRENTLY'}")
+
+
+def archive_partition(name: str, directory: Path) -> Path:
+    """
+    Streams a (detached) partition to `<directory>/<name>.csv.gz` with COPY.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    target = directory / f"{name}.csv.gz"
+    with connection.cursor() as cursor, gzip.open(target, "wb") as archive:
+        with cursor.copy(f"COPY {name} TO STDOUT WITH (FORMAT csv, HEADER true)") as copy:
+            for chunk in copy:
+                archive.write(chunk)
+    return target
+
+
+def drop_partition(name: str) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE {name}")
@@ -0,0 +1,114 @@
+# type: ignore
+from datetime import datetime, time, timezone
+
+from django.db import connection
+from django.db.models import Count, Max, Min, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, TruncDate
+
+from .models import Content, ContentDownloadDaily, DownloadLog
+
+# Inserts the logs and bumps the matching (content, day) rollups in one statement.
+# Only rows that were actually inserted are counted, so replayed batches do not inflate the rollups.
+INSERT_AND_ROLL_UP_SQL = """
+WITH inserted AS (
+    INSERT INTO {logs} (id, user_id, content_id, created_at, updated_at)
+    VALUES {values}
+    ON CONFLICT DO NOTHING
+    RETURNING content_id, created_at
+)
+INSERT INTO {rollups} (content_id, day, download_count)
+SELECT content_id, (created_at AT TIME ZONE 'UTC')::date, COUNT(*)
+FROM inserted
+GROUP BY 1, 2
+ON CONFLICT (content_id, day) DO UPDATE
+SET download_count = {rollups}.download_count + EXCLUDED.download_count
+"""
+
+INCREMENT_SQL = """
+INSERT INTO {rollups} (content_id, day, download_count)
+VALUES (%s, (%s AT TIME ZONE 'UTC')::date, 1)
+ON CONFLICT (content_id, day) DO UPDATE
+SET download_count = {rollups}.download_count + 1
+"""
+
+
+def insert_logs_with_rollups(logs) -> None:
+    """
+    Bulk-inserts DownloadLog instances, skipping ids that already exist, and
+    adds them to the daily rollups.
+    """
+    if not logs:
+        return
+    params = []
+    for log in logs:
+        params.extend([log.id, log.user_id, log.content_id, log.created_at, log.created_at])
+    sql = INSERT_AND_ROLL_UP_SQL.format(
+        logs=DownloadLog._meta.db_table,
+        rollups=ContentDownloadDaily._meta.db_table,
+        values=", ".join(["(%s, %s, %s, %s, %s)"] * len(logs)),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def increment_rollup(log) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute(INCREMENT_SQL.format(rollups=ContentDownloadDaily._meta.db_table), [log.content_id, log.created_at])
+
+
+def download_count_subquery(since=None):
+    """
+    Total downloads per content from the rollups, optionally from `since` (a date) onwards.
+    """
+    rollups = ContentDownloadDaily.objects.filter(content=OuterRef("pk"))
+    if since is not None:
+        rollups = rollups.filter(day__gte=since)
+    total = rollups.order_by().values("content").annotate(total=Sum("download_count")).values("total")
+    return Coalesce(Subquery(total), 0)
+
+
+def trending_contents(since, course_id=None, limit=10) -> list:
+    """
+    Most downloaded contents from `since` onwards, read from the rollups only.
+    Each returned content carries its window total as `download_count`.
+    """
+    rollups = ContentDownloadDaily.objects.filter(day__gte=since)
+    if course_id:
+        rollups = rollups.filter(content__course_id=course_id)
+    top = list(rollups.values("content_id").annotate(total=Sum("download_count")).order_by("-total", "content_id")[:limit])
+    contents = Content.objects.select_related("uploaded_by").in_bulk([row["content_id"] for row in top])
+
+    ranked = []
+    for row in top:
+        content = contents.get(row["content_id"])
+        if content is not None:
+            content.download_count = row["total"]
+            ranked.append(content)
+    return ranked
+
+
+def log_day_range():
+    bounds = DownloadLog.objects.aggregate(first=Min("created_at"), last=Max("created_at"))
+    if bounds["first"] is None:
+        return None
+    return bounds["first"].date(), bounds["last"].date()
+
+
+def rebuild_rollups(start, end) -> int:
+    """
+    Recomputes the rollups for days in [start, end) from the raw log.
+    Callers wrap this in a transaction.
+    """
+    ContentDownloadDaily.objects.filter(day__gte=start, day__lt=end).delete()
+    counts = (
+        DownloadLog.objects.filter(
+            created_at__gte=datetime.combine(start, time.min, tzinfo=timezone.utc),
+            created_at__lt=datetime.combine(end, time.min, tzinfo=timezone.utc),
+        )
+        .annotate(day=TruncDate("created_at"))
+        .values("content_id", "day")
+        .annotate(download_count=Count("id"))
+        .order_by()
+    )
+    rollups = ContentDownloadDaily.objects.bulk_create(ContentDownloadDaily(**row) for row in counts.iterator())
+    return len(rollups)
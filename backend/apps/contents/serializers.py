@@ -1,4 +1,5 @@
 # type: ignore
+from apps.summarizer.models import ContentSummary
 from apps.users.models import User
 from rest_framework import serializers
 
@@ -13,6 +14,7 @@ class UserSummarySerializer(serializers.ModelSerializer):
 
 class ContentSerializer(serializers.ModelSerializer):
     uploaded_by = UserSummarySerializer(read_only=True)
+    download_count = serializers.IntegerField(read_only=True, default=0)
 
     class Meta:
         model = Content
@@ -26,10 +28,26 @@ class ContentSerializer(serializers.ModelSerializer):
             "file",
             "tags",
             "uploaded_by",
+            "download_count",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "created_at", "updated_at", "uploaded_by"]
+        read_only_fields = ["id", "created_at", "updated_at", "uploaded_by", "download_count"]
+
+
+class ContentSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ContentSummary
+        fields = [
+            "content",
+            "status",
+            "summaries",
+            "prompt_version",
+            "error",
+            "updated_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
 
 
 class DownloadLogSerializer(serializers.ModelSerializer):
@@ -45,3 +63,12 @@ class DownloadLogSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["id", "created_at", "updated_at", "user"]
+
+
+class DownloadLogIngestSerializer(serializers.Serializer):
+    content = serializers.UUIDField()
+
+
+class DownloadLogWindowSerializer(serializers.Serializer):
+    since = serializers.DateField(required=False)
+    until = serializers.DateField(required=False)
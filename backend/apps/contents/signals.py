@@ -0,0 +1,12 @@
+# type: ignore
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import DownloadLog
+from .rollups import increment_rollup
+
+
+@receiver(post_save, sender=DownloadLog)
+def count_download(sender, instance, created, **kwargs):
+    if created:
+        increment_rollup(instance)
@@ -0,0 +1,38 @@
+# type: ignore
+import uuid
+
+import pytest
+from apps.contents.models import Content
+from apps.courses.models import Course
+from apps.summarizer.models import ContentSummary
+from apps.users.models import User
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def lecture(db):
+    course = Course.objects.create(code="SUM101", name="Summaries", abbreviation="SUM", status=Course.Status.COMPULSORY)
+    return Content.objects.create(course=course, title="Lecture", type=Content.ContentType.LECTURE, path="https://res.cloudinary.com/notes.pdf", file={})
+
+
+@pytest.fixture
+def client(db):
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(email="reader@example.com", password="secret", first_name="Summary", last_name="Reader"))
+    return client
+
+
+def test_summary_is_served_for_a_lecture(client, lecture):
+    ContentSummary.objects.create(content=lecture, status=ContentSummary.Status.COMPLETED, summaries={"formal": {"100": "Short."}})
+    response = client.get(f"/v1/contents/{lecture.pk}/summary/")
+    assert response.status_code == 200
+    assert response.json()["summaries"] == {"formal": {"100": "Short."}}
+
+
+@pytest.mark.parametrize("pk", ["not-a-uuid", str(uuid.uuid4())])
+def test_unknown_content_is_not_found(client, pk):
+    assert client.get(f"/v1/contents/{pk}/summary/").status_code == 404
+
+
+def test_lecture_without_a_summary_is_not_found(client, lecture):
+    assert client.get(f"/v1/contents/{lecture.pk}/summary/").status_code == 404
@@ -0,0 +1,76 @@
+# type: ignore
+import signal
+import time
+from io import StringIO
+
+import pytest
+from apps.contents import ingest
+from apps.contents.management.commands.drain_download_logs import Command
+from apps.contents.models import Content, DownloadLog
+from apps.courses.models import Course
+from apps.users.models import User
+from django.core.management import call_command
+from django.db import OperationalError
+
+
+@pytest.fixture
+def spool(settings, tmp_path):
+    settings.DOWNLOAD_LOG_SPOOL_DIR = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def download(transactional_db):
+    user = User.objects.create_user(email="drain@example.com", password="secret", first_name="Drain", last_name="Test")
+    course = Course.objects.create(code="DRN101", name="Draining", abbreviation="DRN", status=Course.Status.COMPULSORY)
+    content = Content.objects.create(course=course, title="Spooled", type=Content.ContentType.LECTURE, path="https://res.cloudinary.com/notes.pdf", file={})
+    return user, content
+
+
+def test_sigterm_drains_every_spooled_record(spool, download, monkeypatch):
+    user, content = download
+    ids, polls = [], []
+
+    def poll(seconds):
+        # Records arrive and SIGTERM lands while the loop waits, long before the interval would flush them.
+        if not polls:
+            ids.extend(ingest.enqueue_download(user.pk, content.pk) for _ in range(250))
+            signal.raise_signal(signal.SIGTERM)
+        polls.append(seconds)
+
+    monkeypatch.setattr(time, "sleep", poll)
+    handlers = {signum: signal.getsignal(signum) for signum in (signal.SIGTERM, signal.SIGINT)}
+    output = StringIO()
+    try:
+        call_command("drain_download_logs", "--interval", "3600", "--flush-bytes", str(2**40), "--poll", "0.05", "--batch-size", "7", stdout=output)
+    finally:
+        for signum, handler in handlers.items():
+            signal.signal(signum, handler)
+
+    assert polls == [0.05]
+    assert output.getvalue().splitlines() == [f"Wrote {len(ids)} download logs.", "Stopped."]
+    assert DownloadLog.objects.filter(id__in=ids).count() == len(ids)
+    assert not list(spool.iterdir())
+
+
+def test_database_error_keeps_spool_files_for_the_next_flush(spool, download, monkeypatch):
+    user, content = download
+    ids = [ingest.enqueue_download(user.pk, content.pk) for _ in range(10)]
+    write_batch = ingest.write_batch
+
+    def failing(records):
+        raise OperationalError("connection lost")
+
+    def failing_after_first_batch(records):
+        monkeypatch.setattr(ingest, "write_batch", failing)
+        return write_batch(records)
+
+    monkeypatch.setattr(ingest, "write_batch", failing_after_first_batch)
+    Command().flush(batch_size=4)
+    assert DownloadLog.objects.filter(id__in=ids).count() == 4
+    assert [path.suffix for path in spool.iterdir()] == [ingest.DRAINING_SUFFIX]
+
+    monkeypatch.setattr(ingest, "write_batch", write_batch)
+    Command().flush(batch_size=4)
+    assert DownloadLog.objects.filter(id__in=ids).count() == len(ids)
+    assert not list(spool.iterdir())
@@ -0,0 +1,69 @@
+# type: ignore
+import gzip
+from datetime import UTC, date, datetime
+
+import pytest
+from apps.contents import partitions
+from apps.contents.models import Content, DownloadLog
+from apps.courses.models import Course
+from apps.users.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+OLD_MONTHS = [date(2001, 1, 1), date(2001, 2, 1)]
+
+
+def retire_old_months(archive_dir):
+    # Keeps every month after OLD_MONTHS, so only the partitions made here are retired.
+    current = partitions.month_floor(timezone.now().date())
+    retain = (current.year - 2001) * 12 + current.month - 3 + 1
+    call_command("manage_download_log_partitions", "--archive-dir", str(archive_dir), "--ahead", "0", "--retain", str(retain))
+
+
+@pytest.fixture
+def old_partitions(transactional_db):
+    user = User.objects.create_user(email="partitions@example.com", password="secret", first_name="Partition", last_name="Test")
+    course = Course.objects.create(code="PRT101", name="Partitioning", abbreviation="PRT", status=Course.Status.COMPULSORY)
+    content = Content.objects.create(course=course, title="Archived", type=Content.ContentType.LECTURE, path="https://res.cloudinary.com/notes.pdf", file={})
+    names = [partitions.create_partition(month) for month in OLD_MONTHS]
+    for month in OLD_MONTHS:
+        DownloadLog.objects.create(user=user, content=content, created_at=datetime(month.year, month.month, 15, tzinfo=UTC))
+    yield names
+    with connection.cursor() as cursor:
+        for name in names:
+            cursor.execute(f"DROP TABLE IF EXISTS {name}")
+
+
+def locks_on_download_logs():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT count(*) FROM pg_locks WHERE relation = %s::regclass AND pid = pg_backend_pid()", [partitions.PARENT_TABLE])
+        return cursor.fetchone()[0]
+
+
+def test_retired_partitions_are_archived_without_locking_download_logs(old_partitions, tmp_path, monkeypatch):
+    archive_partition = partitions.archive_partition
+    locks = []
+
+    def archive(name, directory):
+        locks.append(locks_on_download_logs())
+        return archive_partition(name, directory)
+
+    monkeypatch.setattr("apps.contents.management.commands.manage_download_log_partitions.archive_partition", archive)
+    retire_old_months(tmp_path)
+
+    assert locks == [0, 0]
+    assert not set(old_partitions) & set(partitions.attached_partitions().values())
+    assert not set(old_partitions) & set(partitions.detached_partitions().values())
+    for name in old_partitions:
+        with gzip.open(tmp_path / f"{name}.csv.gz", "rt") as archive:
+            assert len(archive.read().splitlines()) == 2
+
+
+def test_a_retirement_stopped_after_the_detach_is_finished_next_run(old_partitions, tmp_path):
+    partitions.detach_partition(old_partitions[0])
+    assert partitions.detached_partitions() == {OLD_MONTHS[0]: old_partitions[0]}
+
+    retire_old_months(tmp_path)
+    assert partitions.detached_partitions() == {}
+    assert sorted(path.name for path in tmp_path.iterdir()) == [f"{name}.csv.gz" for name in old_partitions]
@@ -1,36 +1,90 @@
 # type: ignore
+import re
+from datetime import datetime, time, timedelta
+from datetime import timezone as dt_timezone
+
+from apps.summarizer.content_summaries import submit_content_summary
+from apps.summarizer.models import ContentSummary
+from apps.users.authentication import TokenUserAuthentication
+from django.conf import settings
+from django.contrib.postgres.search import TrigramWordSimilarity
 from django.db.models import Q
-from rest_framework import filters, viewsets
+from django.http import Http404
+from django.utils import timezone
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
+from .ingest import enqueue_download
 from .models import Content, DownloadLog
 from .pagination import ContentPagination
 from .permissions import IsAdminOrModeratorOrReadOnly
-from .serializers import ContentSerializer, DownloadLogSerializer
+from .rollups import download_count_subquery, trending_contents
+from .serializers import (
+    ContentSerializer,
+    ContentSummarySerializer,
+    DownloadLogIngestSerializer,
+    DownloadLogSerializer,
+    DownloadLogWindowSerializer,
+)
+
+WINDOW_RE = re.compile(r"^(\d+)d$")
+TRENDING_DEFAULT_WINDOW_DAYS = 7
+TRENDING_MAX_WINDOW_DAYS = 90
+TRENDING_LIMIT = 10
 
 
 class ContentViewSet(viewsets.ModelViewSet):
     queryset = Content.objects.all().order_by("-created_at")
     serializer_class = ContentSerializer
     permission_classes = [IsAuthenticated, IsAdminOrModeratorOrReadOnly]
-    filter_backends = [filters.SearchFilter]
-    search_fields = ["title", "tags"]
+    authentication_classes = [TokenUserAuthentication]
     pagination_class = ContentPagination
 
     def perform_create(self, serializer):
-        serializer.save(uploaded_by=self.request.user)
+        content = serializer.save(uploaded_by=self.request.user)
+        if content.type == Content.ContentType.LECTURE:
+            submit_content_summary(content)
 
     def get_queryset(self):
-        queryset = Content.objects.all().order_by("-created_at")
+        queryset = Content.objects.select_related("uploaded_by").annotate(download_count=download_count_subquery()).order_by("-created_at")
         course_id = self.request.query_params.get("course_id")
-        search = self.request.query_params.get("search")
+        tags = self.request.query_params.getlist("tag")
+        search = self.request.query_params.get("search", "").strip()
 
         if course_id:
             queryset = queryset.filter(course_id=course_id)
+        if tags:
+            queryset = queryset.filter(tags__contains=tags)
         if search:
-            queryset = queryset.filter(Q(title__icontains=search) | Q(tags__icontains=search))
+            queryset = (
+                queryset.filter(Q(title__trigram_word_similar=search) | Q(tags__contains=[search])).annotate(similarity=TrigramWordSimilarity(search, "title")).order_by("-similarity", "-created_at")
+            )
+
+        return queryset
 
-        return queryset.distinct()
+    @action(detail=False, methods=["get"], url_path="trending")
+    def trending(self, request):
+        match = WINDOW_RE.match(request.query_params.get("window", f"{TRENDING_DEFAULT_WINDOW_DAYS}d"))
+        if not match or not 1 <= int(match.group(1)) <= TRENDING_MAX_WINDOW_DAYS:
+            return Response({"error": f"window must look like 7d, between 1d and {TRENDING_MAX_WINDOW_DAYS}d"}, status=status.HTTP_400_BAD_REQUEST)
+
+        since = timezone.now().date() - timedelta(days=int(match.group(1)) - 1)
+        contents = trending_contents(since, request.query_params.get("course_id"), TRENDING_LIMIT)
+        return Response(self.get_serializer(contents, many=True).data)
+
+    @action(detail=True, methods=["get"], url_path="summary")
+    def summary(self, request, pk=None):
+        """
+        Summaries generated when the lecture was uploaded, read straight from the database.
+        """
+        content = self.get_object()
+        try:
+            summary = content.summary
+        except ContentSummary.DoesNotExist:
+            raise Http404
+        return Response(ContentSummarySerializer(summary).data)
 
 
 class DownloadLogViewSet(viewsets.ModelViewSet):
@@ -44,7 +98,21 @@ class DownloadLogViewSet(viewsets.ModelViewSet):
         content_id = self.request.query_params.get("content_id")
         if content_id:
             queryset = queryset.filter(content_id=content_id)
+        if self.action != "list":
+            return queryset
+
+        # A bounded created_at range lets PostgreSQL prune download_logs partitions outside it.
+        params = DownloadLogWindowSerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        since = params.validated_data.get("since") or timezone.now().date() - timedelta(days=settings.DOWNLOAD_LOG_DEFAULT_WINDOW_DAYS)
+        queryset = queryset.filter(created_at__gte=datetime.combine(since, time.min, tzinfo=dt_timezone.utc))
+        until = params.validated_data.get("until")
+        if until:
+            queryset = queryset.filter(created_at__lt=datetime.combine(until + timedelta(days=1), time.min, tzinfo=dt_timezone.utc))
         return queryset
 
-    def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+    def create(self, request, *args, **kwargs):
+        serializer = DownloadLogIngestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        log_id = enqueue_download(request.user.id, serializer.validated_data["content"])
+        return Response({"id": log_id}, status=status.HTTP_202_ACCEPTED)
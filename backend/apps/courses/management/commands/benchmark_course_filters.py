@@ -0,0 +1,78 @@
+# type: ignore
+import random
+import statistics
+import time
+
+from apps.departments.models import Department
+from apps.schools.models import School
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from ...models import Course, CourseOffering
+
+
+class Rollback(Exception):
+    pass
+
+
+def legacy_queryset(department_id, year, semester):
+    return Course.objects.filter(course_offerings__department_id=department_id).filter(course_offerings__year=year).filter(course_offerings__semester=semester).order_by("-created_at").distinct()
+
+
+def exists_queryset(department_id, year, semester):
+    return Course.objects.offered_to(department_id=department_id, year=year, semester=semester).order_by("-created_at")
+
+
+class Command(BaseCommand):
+    help = "Times the COUNT and first-page queries of cohort-filtered /v1/courses/ for the JOIN+DISTINCT and EXISTS paths."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed-courses", type=int, default=0, help="Seed this many courses inside a rolled-back transaction before measuring.")
+        parser.add_argument("--departments", type=int, default=30)
+        parser.add_argument("--offerings-per-course", type=int, default=6)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--page-size", type=int, default=10)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                if options["seed_courses"]:
+                    self.seed(options["seed_courses"], options["departments"], options["offerings_per_course"])
+                self.measure(options["repeat"], options["page_size"])
+                if options["seed_courses"]:
+                    raise Rollback
+        except Rollback:
+            self.stdout.write("Seeded rows rolled back.")
+
+    def seed(self, course_count, department_count, offerings_per_course):
+        school = School.objects.create(name=f"Benchmark School {time.time_ns()}")
+        departments = Department.objects.bulk_create(Department(name=f"Benchmark Department {i}", code=f"BD{i}", school=school) for i in range(department_count))
+        courses = Course.objects.bulk_create(Course(code=f"B{i:08d}", name=f"Benchmark Course {i}", abbreviation="BC", status=Course.Status.COMPULSORY) for i in range(course_count))
+        rng = random.Random(42)
+        offerings = [CourseOffering(course=course, department=rng.choice(departments), year=rng.randint(1, 5), semester=rng.randint(1, 2)) for course in courses for _ in range(offerings_per_course)]
+        CourseOffering.objects.bulk_create(offerings, batch_size=5000)
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Course._meta.db_table}, {CourseOffering._meta.db_table}")
+        self.stdout.write(f"Seeded {len(courses)} courses and {len(offerings)} offerings across {len(departments)} departments.")
+
+    def measure(self, repeat, page_size):
+        cohort = CourseOffering.objects.values_list("department_id", "year", "semester").order_by("?").first()
+        if cohort is None:
+            self.stdout.write(self.style.WARNING("No course offerings to measure; pass --seed-courses."))
+            return
+
+        self.stdout.write(f"Cohort department={cohort[0]} year={cohort[1]} semester={cohort[2]}, {repeat} runs each")
+        for label, build in (("join+distinct", legacy_queryset), ("exists", exists_queryset)):
+            queryset = build(*cohort)
+            count_ms = self.time(lambda: queryset.count(), repeat)
+            page_ms = self.time(lambda: list(queryset[:page_size]), repeat)
+            self.stdout.write(f"{label:>14}: rows={queryset.count():<6} count p50={count_ms:8.2f} ms   page p50={page_ms:8.2f} ms")
+
+    @staticmethod
+    def time(run, repeat):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:09
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+from django.db.models.functions import Cast
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill_search_vector(apps, schema_editor):
+    Course = apps.get_model("courses", "Course")
+    vector = (
+        SearchVector("code", weight="A", config="simple")
+        + SearchVector("abbreviation", weight="B", config="simple")
+        + SearchVector("name", weight="C", config="simple")
+        + SearchVector(Cast("tags", output_field=models.TextField()), weight="D", config="simple")
+    )
+    last_pk = None
+    while True:
+        batch = Course.objects.order_by("pk")
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        pks = list(batch.values_list("pk", flat=True)[:BACKFILL_BATCH_SIZE])
+        if not pks:
+            break
+        Course.objects.filter(pk__in=pks).update(search_vector=vector)
+        last_pk = pks[-1]
+
+
+class Migration(migrations.Migration):
+
+    # Each backfill batch commits on its own so the courses table is never locked as a whole.
+    atomic = False
+
+    dependencies = [
+        ("courses", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="course",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="course",
+            index=django.contrib.postgres.indexes.GinIndex(fields=["search_vector"], name="courses_search__875182_gin"),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0004_course_trigram_indexes"),
+        ("departments", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="courseoffering",
+            index=models.Index(
+                fields=["department", "year", "semester", "course"],
+                name="course_offe_departm_0e369e_idx",
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name="courseoffering",
+            name="course_offe_departm_7e2f93_idx",
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0005_course_offering_cohort_index"),
+        ("departments", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(fields=["created_at", "id"], name="courses_created_a9274f_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="courseassignment",
+            index=models.Index(fields=["created_at", "id"], name="course_assi_created_46468f_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="courseoffering",
+            index=models.Index(fields=["created_at", "id"], name="course_offe_created_01ab5e_idx"),
+        ),
+    ]
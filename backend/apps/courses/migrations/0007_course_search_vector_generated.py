@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:58
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+from django.db.models.functions import Cast
+
+
+class Migration(migrations.Migration):
+    """
+    Turns `search_vector` into a stored generated column, so PostgreSQL keeps it
+    current on every write path. A column cannot be altered into a generated one,
+    so it is dropped and added again; adding it rewrites the courses table once.
+    """
+
+    dependencies = [
+        ("courses", "0006_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="course",
+            name="courses_search__875182_gin",
+        ),
+        migrations.RemoveField(
+            model_name="course",
+            name="search_vector",
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=SearchVector("code", config="simple", weight="A")
+                + SearchVector("abbreviation", config="simple", weight="B")
+                + SearchVector("name", config="simple", weight="C")
+                + SearchVector(Cast("tags", output_field=models.TextField()), config="simple", weight="D"),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="course",
+            index=django.contrib.postgres.indexes.GinIndex(fields=["search_vector"], name="courses_search__875182_gin"),
+        ),
+    ]
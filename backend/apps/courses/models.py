@@ -1,19 +1,39 @@
 import uuid
 from typing import Any
 
+from apps.departments.models import Department
+from apps.users.models import User
 from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from utils.normalization import normalize_capitalization
-from apps.departments.models import Department
-from apps.users.models import User
+
+from .search import course_search_vector
+
+
+class CourseQuerySet(models.QuerySet):
+    def offered_to(self, department_id=None, year=None, semester=None):
+        """
+        Courses with at least one offering matching every given cohort value.
+        Uses a correlated EXISTS so no join fan-out or DISTINCT is needed.
+        """
+        criteria = {
+            "department_id": department_id,
+            "year": year,
+            "semester": semester,
+        }
+        criteria = {field: value for field, value in criteria.items() if value not in (None, "")}
+        if not criteria:
+            return self
+        return self.filter(models.Exists(CourseOffering.objects.filter(course_id=models.OuterRef("pk"), **criteria)))
 
 
 class Course(models.Model):
     class Status(models.TextChoices):
-        COMPULSORY = 'COMPULSORY', 'Compulsory'
-        SUPPORTIVE = 'SUPPORTIVE', 'Supportive'
-        COMMON = 'COMMON', 'Common'
-        ELECTIVE = 'ELECTIVE', 'Elective'
+        COMPULSORY = "COMPULSORY", "Compulsory"
+        SUPPORTIVE = "SUPPORTIVE", "Supportive"
+        COMMON = "COMMON", "Common"
+        ELECTIVE = "ELECTIVE", "Elective"
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     code = models.CharField(max_length=10, unique=True)
@@ -28,9 +48,13 @@ class Course(models.Model):
     homework_hours = models.PositiveIntegerField(null=True, blank=True)
     credit_hours = models.PositiveIntegerField(null=True, blank=True)
     tags = models.JSONField(default=list, blank=True)  # type: ignore
+    # Kept by PostgreSQL on every write, including bulk_create() and QuerySet.update().
+    search_vector = models.GeneratedField(expression=course_search_vector(), output_field=SearchVectorField(), db_persist=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CourseQuerySet.as_manager()
+
     def save(self, *args: Any, **kwargs: Any) -> None:
         if self.name:
             self.name = normalize_capitalization(self.name)
@@ -39,62 +63,69 @@ class Course(models.Model):
         super().save(*args, **kwargs)
 
     def __str__(self):
-        return f'{self.name} ({self.code})'
+        return f"{self.name} ({self.code})"
 
     def __repr__(self):
-        return f'<Course {self.code} | {self.name}>'
+        return f"<Course {self.code} | {self.name}>"
 
     class Meta:
-        db_table = 'courses'
-        verbose_name = 'Course'
-        verbose_name_plural = 'Courses'
+        db_table = "courses"
+        verbose_name = "Course"
+        verbose_name_plural = "Courses"
         indexes: list[Any] = [
-            models.Index(fields=['code']),
-            models.Index(fields=['abbreviation']),
-            GinIndex(fields=['tags']),
+            models.Index(fields=["code"]),
+            models.Index(fields=["abbreviation"]),
+            GinIndex(fields=["tags"]),
+            GinIndex(fields=["search_vector"]),
+            GinIndex(name="courses_code_trgm", fields=["code"], opclasses=["gin_trgm_ops"]),
+            GinIndex(name="courses_abbreviation_trgm", fields=["abbreviation"], opclasses=["gin_trgm_ops"]),
+            GinIndex(name="courses_name_trgm", fields=["name"], opclasses=["gin_trgm_ops"]),
+            models.Index(fields=["created_at", "id"]),
         ]
 
 
 class CourseOffering(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='course_offerings')
-    department = models.ForeignKey(Department, on_delete=models.CASCADE, related_name='course_offerings')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="course_offerings")
+    department = models.ForeignKey(Department, on_delete=models.CASCADE, related_name="course_offerings")
     year = models.PositiveIntegerField()
     semester = models.PositiveIntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f'{self.course.name} - {self.department.name} ({self.year} / {self.semester})'
+        return f"{self.course.name} - {self.department.name} ({self.year} / {self.semester})"
 
     def __repr__(self):
-        return f'<CourseOffering {self.course.code} | {self.department.name} | {self.year}/{self.semester}>'
+        return f"<CourseOffering {self.course.code} | {self.department.name} | {self.year}/{self.semester}>"
 
     class Meta:
-        db_table = 'course_offerings'
+        db_table = "course_offerings"
         indexes = [
-            models.Index(fields=['course']),
-            models.Index(fields=['department']),
-            models.Index(fields=['year', 'semester']),
+            models.Index(fields=["course"]),
+            models.Index(fields=["department", "year", "semester", "course"]),
+            models.Index(fields=["year", "semester"]),
+            models.Index(fields=["created_at", "id"]),
         ]
 
 
 class CourseAssignment(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='course_assignments')
-    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='course_assignments')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="course_assignments")
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="course_assignments")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f'{self.user.get_full_name()} -> {self.course.code}'
+        return f"{self.user.get_full_name()} -> {self.course.code}"
 
     def __repr__(self):
-        return f'<CourseAssignment {self.user.email} | {self.course.code}>'
+        return f"<CourseAssignment {self.user.email} | {self.course.code}>"
 
     class Meta:
-        db_table = 'course_assignments'
+        db_table = "course_assignments"
         indexes = [
-            models.Index(fields=['user']),
-            models.Index(fields=['course']),
+            models.Index(fields=["user"]),
+            models.Index(fields=["course"]),
+            models.Index(fields=["created_at", "id"]),
         ]
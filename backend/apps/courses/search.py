@@ -0,0 +1,63 @@
+# type: ignore
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db.models import F, Q, TextField
+from django.db.models.functions import Cast, Greatest
+from rest_framework.filters import BaseFilterBackend
+
+# Course codes and abbreviations must not be stemmed, so every weight uses the same unstemmed config.
+SEARCH_CONFIG = "simple"
+
+
+def course_search_vector():
+    """
+    Weighted document for a course row: code > abbreviation > name > tags.
+    """
+    return (
+        SearchVector("code", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("abbreviation", weight="B", config=SEARCH_CONFIG)
+        + SearchVector("name", weight="C", config=SEARCH_CONFIG)
+        + SearchVector(Cast("tags", output_field=TextField()), weight="D", config=SEARCH_CONFIG)
+    )
+
+
+class CourseFullTextSearchFilter(BaseFilterBackend):
+    """
+    Ranked full-text search over `Course.search_vector`, enabled with `?q=`.
+    Accepts web-search syntax ("quoted phrases", OR, -excluded).
+    """
+
+    search_param = "q"
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, "").strip()
+        if not term:
+            return queryset
+
+        query = SearchQuery(term, config=SEARCH_CONFIG, search_type="websearch")
+        return queryset.filter(search_vector=query).annotate(rank=SearchRank(F("search_vector"), query)).order_by("-rank", "-created_at")
+
+
+def suggest_courses(queryset, term, limit):
+    """
+    Typeahead matches for partial or misspelled input ("cs 20", "cosc201"),
+    ranked by trigram word similarity against code, abbreviation and name.
+    Every predicate is served by the `gin_trgm_ops` indexes on those columns.
+    """
+    compact = "".join(term.split())
+    return (
+        queryset.filter(Q(code__trigram_word_similar=compact) | Q(abbreviation__trigram_word_similar=compact) | Q(name__trigram_word_similar=term))
+        .annotate(
+            similarity=Greatest(
+                TrigramWordSimilarity(compact, "code"),
+                TrigramWordSimilarity(compact, "abbreviation"),
+                TrigramWordSimilarity(term, "name"),
+            )
+        )
+        .order_by("-similarity", "code")
+        .values("id", "code", "name", "abbreviation", "similarity")[:limit]
+    )
@@ -0,0 +1,42 @@
+# type: ignore
+import pytest
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Course
+from ..search import SEARCH_CONFIG
+
+
+def matching_codes(term):
+    query = SearchQuery(term, config=SEARCH_CONFIG, search_type="websearch")
+    return sorted(Course.objects.filter(search_vector=query).values_list("code", flat=True))
+
+
+@pytest.mark.django_db
+def test_bulk_created_courses_are_searchable():
+    Course.objects.bulk_create(
+        [
+            Course(code="BLK101", name="Bulk Imports", abbreviation="BLK", status=Course.Status.COMPULSORY, tags=["catalogue"]),
+            Course(code="BLK102", name="Bulk Exports", abbreviation="BLX", status=Course.Status.ELECTIVE),
+        ]
+    )
+    assert matching_codes("bulk") == ["BLK101", "BLK102"]
+    assert matching_codes("catalogue") == ["BLK101"]
+
+
+@pytest.mark.django_db
+def test_updated_courses_are_searchable_by_their_new_name():
+    course = Course.objects.create(code="UPD101", name="Old Title", abbreviation="UPD", status=Course.Status.COMPULSORY)
+    Course.objects.filter(pk=course.pk).update(name="Renamed Title")
+    assert matching_codes("renamed") == ["UPD101"]
+    assert matching_codes("old") == []
+
+
+@pytest.mark.django_db
+def test_save_writes_the_course_row_once():
+    course = Course(code="ONE101", name="Single Write", abbreviation="one", status=Course.Status.COMPULSORY)
+    with CaptureQueriesContext(connection) as context:
+        course.save()
+    assert [query["sql"].split()[0] for query in context.captured_queries if '"courses"' in query["sql"]] == ["INSERT"]
+    assert matching_codes("one101") == ["ONE101"]
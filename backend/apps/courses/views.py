@@ -1,54 +1,70 @@
 # type: ignore
+from apps.users.authentication import TokenUserAuthentication
 from rest_framework import filters, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
-from .models import Course, CourseOffering, CourseAssignment
+from .models import Course, CourseAssignment, CourseOffering
 from .pagination import StandardResultsSetPagination
 from .permissions import IsAdminOrModeratorOrReadOnly
+from .search import CourseFullTextSearchFilter, suggest_courses
 from .serializers import (
-    CourseSerializer,
-    CourseOfferingSerializer,
     CourseAssignmentSerializer,
+    CourseOfferingSerializer,
+    CourseSerializer,
 )
 
+SUGGEST_MIN_LENGTH = 2
+SUGGEST_DEFAULT_LIMIT = 8
+SUGGEST_MAX_LIMIT = 20
+
 
 class CourseViewSet(viewsets.ModelViewSet):
-    queryset = Course.objects.all().order_by('-created_at')
+    queryset = Course.objects.all().order_by("-created_at")
     serializer_class = CourseSerializer
     permission_classes = [IsAuthenticated, IsAdminOrModeratorOrReadOnly]
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['name', 'code', 'abbreviation', 'tags']
+    authentication_classes = [TokenUserAuthentication]
+    filter_backends = [CourseFullTextSearchFilter, filters.SearchFilter]
+    search_fields = ["name", "code", "abbreviation", "tags"]
     pagination_class = StandardResultsSetPagination
 
     def get_queryset(self):
-        queryset = Course.objects.all().order_by('-created_at')
-        department_id = self.request.query_params.get('departmentId')
-        year = self.request.query_params.get('year')
-        semester = self.request.query_params.get('semester')
+        queryset = Course.objects.defer("search_vector").order_by("-created_at")
+        return queryset.offered_to(
+            department_id=self.request.query_params.get("departmentId"),
+            year=self.request.query_params.get("year"),
+            semester=self.request.query_params.get("semester"),
+        )
 
-        if department_id:
-            queryset = queryset.filter(course_offerings__department_id=department_id)
-        if year:
-            queryset = queryset.filter(course_offerings__year=year)
-        if semester:
-            queryset = queryset.filter(course_offerings__semester=semester)
+    @action(detail=False, methods=["get"], url_path="suggest")
+    def suggest(self, request):
+        term = request.query_params.get("q", "").strip()
+        if len(term) < SUGGEST_MIN_LENGTH:
+            return Response([])
+
+        try:
+            limit = min(int(request.query_params.get("limit", SUGGEST_DEFAULT_LIMIT)), SUGGEST_MAX_LIMIT)
+        except ValueError:
+            limit = SUGGEST_DEFAULT_LIMIT
 
-        return queryset.distinct()
+        return Response(list(suggest_courses(Course.objects.all(), term, max(limit, 1))))
 
 
 class CourseOfferingViewSet(viewsets.ModelViewSet):
-    queryset = CourseOffering.objects.all().order_by('-created_at')
+    queryset = CourseOffering.objects.all().order_by("-created_at")
     serializer_class = CourseOfferingSerializer
     permission_classes = [IsAuthenticated, IsAdminOrModeratorOrReadOnly]
+    authentication_classes = [TokenUserAuthentication]
     filter_backends = [filters.SearchFilter]
-    search_fields = ['id']
+    search_fields = ["id"]
     pagination_class = StandardResultsSetPagination
 
     def get_queryset(self):
-        queryset = CourseOffering.objects.all().order_by('-created_at')
-        department_id = self.request.query_params.get('departmentId')
-        year = self.request.query_params.get('year')
-        semester = self.request.query_params.get('semester')
+        queryset = CourseOffering.objects.all().order_by("-created_at")
+        department_id = self.request.query_params.get("departmentId")
+        year = self.request.query_params.get("year")
+        semester = self.request.query_params.get("semester")
 
         if department_id:
             queryset = queryset.filter(department_id=department_id)
@@ -61,17 +77,18 @@ class CourseOfferingViewSet(viewsets.ModelViewSet):
 
 
 class CourseAssignmentViewSet(viewsets.ModelViewSet):
-    queryset = CourseAssignment.objects.all().order_by('-created_at')
+    queryset = CourseAssignment.objects.all().order_by("-created_at")
     serializer_class = CourseAssignmentSerializer
     permission_classes = [IsAuthenticated, IsAdminOrModeratorOrReadOnly]
+    authentication_classes = [TokenUserAuthentication]
     filter_backends = [filters.SearchFilter]
-    search_fields = ['user__first_name', 'user__last_name', 'course__code', 'course__name']
+    search_fields = ["user__first_name", "user__last_name", "course__code", "course__name"]
     pagination_class = StandardResultsSetPagination
 
     def get_queryset(self):
-        queryset = CourseAssignment.objects.all().order_by('-created_at')
-        user_id = self.request.query_params.get('userId')
-        course_id = self.request.query_params.get('courseId')
+        queryset = CourseAssignment.objects.all().order_by("-created_at")
+        user_id = self.request.query_params.get("userId")
+        course_id = self.request.query_params.get("courseId")
 
         if user_id:
             queryset = queryset.filter(user_id=user_id)
@@ -1,4 +1,5 @@
 # type: ignore
+from apps.users.authentication import TokenUserAuthentication
 from rest_framework import filters, viewsets
 from rest_framework.permissions import IsAuthenticated
 
@@ -11,6 +12,7 @@ class DepartmentViewSet(viewsets.ModelViewSet):
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
     permission_classes = [IsAuthenticated, IsAdminOrModeratorOrReadOnly]
+    authentication_classes = [TokenUserAuthentication]
     filter_backends = [filters.SearchFilter]
     search_fields = ["name"]
 
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class FeedConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.feed"
+    label = "feed"
+
+    def ready(self):
+        from utils import checks  # noqa: F401
+
+        from . import signals  # noqa: F401
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.cache import cache
+
+
+def cohort_cache_key(department_id, year, semester) -> str:
+    return f"feed:{department_id}:{year}:{semester}"
+
+
+def get_cached_feed(department_id, year, semester):
+    return cache.get(cohort_cache_key(department_id, year, semester))
+
+
+def set_cached_feed(department_id, year, semester, data) -> None:
+    cache.set(cohort_cache_key(department_id, year, semester), data, settings.FEED_CACHE_TIMEOUT)
+
+
+def invalidate_cohorts(cohorts) -> None:
+    """
+    Drops the cached feed of every (department_id, year, semester) cohort given.
+    """
+    keys = {cohort_cache_key(*cohort) for cohort in cohorts}
+    if keys:
+        cache.delete_many(list(keys))
@@ -0,0 +1,17 @@
+# type: ignore
+from apps.contents.serializers import ContentSerializer
+from apps.courses.serializers import CourseSerializer
+from rest_framework import serializers
+
+
+class FeedCourseSerializer(CourseSerializer):
+    latest_contents = ContentSerializer(many=True, read_only=True)
+
+    class Meta(CourseSerializer.Meta):
+        fields = CourseSerializer.Meta.fields + ["latest_contents"]
+
+
+class FeedQuerySerializer(serializers.Serializer):
+    departmentId = serializers.UUIDField()
+    year = serializers.IntegerField(min_value=1)
+    semester = serializers.IntegerField(min_value=1)
@@ -0,0 +1,41 @@
+# type: ignore
+from apps.contents.models import Content
+from apps.courses.models import Course, CourseOffering
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import invalidate_cohorts
+
+
+def invalidate_course_cohorts(course_id):
+    invalidate_cohorts(CourseOffering.objects.filter(course_id=course_id).values_list("department_id", "year", "semester"))
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_feed_on_course_change(sender, instance, **kwargs):
+    invalidate_course_cohorts(instance.pk)
+
+
+@receiver(post_save, sender=Content)
+@receiver(post_delete, sender=Content)
+def invalidate_feed_on_content_change(sender, instance, **kwargs):
+    invalidate_course_cohorts(instance.course_id)
+
+
+@receiver(pre_save, sender=CourseOffering)
+def remember_previous_offering_cohort(sender, instance, **kwargs):
+    if instance._state.adding:
+        instance._previous_cohort = None
+        return
+    instance._previous_cohort = CourseOffering.objects.filter(pk=instance.pk).values_list("department_id", "year", "semester").first()
+
+
+@receiver(post_save, sender=CourseOffering)
+@receiver(post_delete, sender=CourseOffering)
+def invalidate_feed_on_offering_change(sender, instance, **kwargs):
+    cohorts = [(instance.department_id, instance.year, instance.semester)]
+    previous = getattr(instance, "_previous_cohort", None)
+    if previous:
+        cohorts.append(previous)
+    invalidate_cohorts(cohorts)
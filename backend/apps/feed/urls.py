@@ -0,0 +1,7 @@
+from django.urls import URLPattern, path
+
+from .views import FeedView
+
+urlpatterns: list[URLPattern] = [
+    path("feed/", FeedView.as_view(), name="feed"),
+]
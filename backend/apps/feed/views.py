@@ -0,0 +1,62 @@
+# type: ignore
+from apps.contents.models import Content
+from apps.contents.rollups import download_count_subquery
+from apps.courses.models import Course
+from apps.users.authentication import TokenUserAuthentication
+from django.conf import settings
+from django.db.models import Prefetch
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .cache import get_cached_feed, set_cached_feed
+from .serializers import FeedCourseSerializer, FeedQuerySerializer
+
+
+def build_feed(department_id, year, semester):
+    latest_contents = Content.objects.select_related("uploaded_by").annotate(download_count=download_count_subquery()).order_by("-created_at")[: settings.FEED_CONTENTS_PER_COURSE]
+    courses = (
+        Course.objects.offered_to(department_id=department_id, year=year, semester=semester)
+        .defer("search_vector")
+        .order_by("code")
+        .prefetch_related(Prefetch("contents", queryset=latest_contents, to_attr="latest_contents"))
+    )
+    return {
+        "department": str(department_id),
+        "year": year,
+        "semester": semester,
+        "courses": FeedCourseSerializer(courses, many=True).data,
+    }
+
+
+class FeedView(APIView):
+    """
+    Courses offered to a (department, year, semester) cohort together with
+    their most recent contents. Defaults to the requesting user's cohort.
+    """
+
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [TokenUserAuthentication]
+
+    def get(self, request):
+        user = request.user
+        params = FeedQuerySerializer(
+            data={
+                "departmentId": request.query_params.get("departmentId", user.department_id),
+                "year": request.query_params.get("year", user.year),
+                "semester": request.query_params.get("semester", user.semester),
+            }
+        )
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        department_id = params.validated_data["departmentId"]
+        year = params.validated_data["year"]
+        semester = params.validated_data["semester"]
+
+        feed = get_cached_feed(department_id, year, semester)
+        if feed is None:
+            feed = build_feed(department_id, year, semester)
+            set_cached_feed(department_id, year, semester, feed)
+        return Response(feed, status=status.HTTP_200_OK)
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contents", "0005_keyset_pagination_indexes"),
+        ("courses", "0006_keyset_pagination_indexes"),
+        ("departments", "0001_initial"),
+        ("intake", "0002_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="intake",
+            index=models.Index(fields=["created_at", "id"], name="intake_created_8465a0_idx"),
+        ),
+    ]
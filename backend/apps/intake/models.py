@@ -68,4 +68,5 @@ class Intake(models.Model):
         indexes = [
             models.Index(fields=["type"]),
             models.Index(fields=["status"]),
+            models.Index(fields=["created_at", "id"]),
         ]
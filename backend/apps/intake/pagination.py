@@ -1,8 +1,8 @@
 # type: ignore
-from rest_framework.pagination import PageNumberPagination
+from utils.pagination import CursorPageNumberPagination
 
 
-class IntakePagination(PageNumberPagination):
+class IntakePagination(CursorPageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
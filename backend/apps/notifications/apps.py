@@ -5,3 +5,8 @@ class NotificationsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.notifications"
     label = "notifications"
+
+    def ready(self):
+        from utils import checks  # noqa: F401
+
+        from . import signals  # noqa: F401
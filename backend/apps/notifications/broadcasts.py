@@ -0,0 +1,92 @@
+# type: ignore
+from apps.courses.models import CourseOffering
+from django.db import connection
+from django.db.models import Exists, OuterRef, Q, Value
+
+from .models import Broadcast, BroadcastReceipt
+from .recipients import (
+    cohort_member_ids,
+    cohort_recipients,
+    course_member_ids,
+    course_recipients,
+)
+
+INBOX_FIELDS = ("id", "kind", "title", "message", "type", "is_read", "created_at", "updated_at")
+
+
+def broadcast_audience(broadcast):
+    """
+    Active users a broadcast is addressed to. A course narrows the audience to the
+    exact (department, year, semester) cohorts the course is offered to.
+    """
+    if broadcast.course_id:
+        return course_recipients(broadcast.course_id, broadcast.department_id, broadcast.year, broadcast.semester)
+    return cohort_recipients(broadcast.department_id, broadcast.year, broadcast.semester)
+
+
+def count_broadcast_audience(broadcast) -> int:
+    # Course and full-cohort audiences come from the cached cohort sets; wider ones are counted in SQL.
+    if broadcast.course_id:
+        return len(course_member_ids(broadcast.course_id, broadcast.department_id, broadcast.year, broadcast.semester))
+    if broadcast.department_id and broadcast.year and broadcast.semester:
+        return len(cohort_member_ids(broadcast.department_id, broadcast.year, broadcast.semester))
+    return broadcast_audience(broadcast).count()
+
+
+def broadcasts_for(user):
+    """
+    Broadcasts addressed to `user`: every criterion is either unset or matches the
+    user's cohort. Broadcasts sent before the user joined are left out, as they
+    would have been when every send was copied to each recipient.
+    """
+    offered_courses = CourseOffering.objects.filter(department_id=user.department_id, year=user.year, semester=user.semester).values("course_id")
+    return Broadcast.objects.filter(
+        Q(department__isnull=True) | Q(department_id=user.department_id),
+        Q(year__isnull=True) | Q(year=user.year),
+        Q(semester__isnull=True) | Q(semester=user.semester),
+        Q(course__isnull=True) | Q(course_id__in=offered_courses),
+        created_at__gte=user.date_joined,
+    )
+
+
+def create_broadcast(**fields) -> Broadcast:
+    """
+    Stores a broadcast once, recording how many users it reached when it was sent.
+    """
+    broadcast = Broadcast(**fields)
+    broadcast.recipient_count = count_broadcast_audience(broadcast)
+    broadcast.save()
+    return broadcast
+
+
+def mark_broadcasts_read(user, broadcasts) -> int:
+    """
+    Records a receipt for every broadcast in `broadcasts` that `user` has not read yet,
+    in a single INSERT ... SELECT. Returns the number of broadcasts newly marked read.
+    """
+    unread = broadcasts.exclude(Exists(BroadcastReceipt.objects.filter(broadcast_id=OuterRef("pk"), user=user))).order_by().values("id")
+    sql, params = unread.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {BroadcastReceipt._meta.db_table} (id, broadcast_id, user_id, read_at)
+            SELECT gen_random_uuid(), unread.id, %s, now() FROM ({sql}) AS unread
+            ON CONFLICT DO NOTHING
+            """,
+            [user.pk, *params],
+        )
+        return cursor.rowcount
+
+
+def with_read_state(broadcasts, user):
+    return broadcasts.annotate(is_read=Exists(BroadcastReceipt.objects.filter(broadcast_id=OuterRef("pk"), user=user)), kind=Value("broadcast"))
+
+
+def inbox_parts(direct, broadcasts, user):
+    """
+    The two halves of a user's inbox, shaped to the same columns so the paginator
+    can union them: the user's direct notifications and the broadcasts that match them.
+    """
+    direct = direct.annotate(kind=Value("direct")).values(*INBOX_FIELDS)
+    broadcasts = with_read_state(broadcasts, user).values(*INBOX_FIELDS)
+    return [direct, broadcasts]
@@ -0,0 +1,111 @@
+# type: ignore
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Notification, NotificationDispatch
+from .recipients import resolve_recipients
+from .unread import invalidate_unread_counts
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=settings.NOTIFICATION_FANOUT_WORKERS, thread_name_prefix="notification-fanout")
+
+# Writes one chunk of notifications straight from the recipient query, keyed on user id so a
+# dispatch can resume where it stopped. Returns the rows written, the last user id covered and the users notified.
+CHUNK_SQL = """
+WITH batch AS (
+    SELECT recipients.id
+    FROM ({recipients}) AS recipients
+    WHERE %s::uuid IS NULL OR recipients.id > %s::uuid
+    ORDER BY recipients.id
+    LIMIT %s
+),
+inserted AS (
+    INSERT INTO {notifications} (id, user_id, title, message, type, is_read, created_at, updated_at)
+    SELECT gen_random_uuid(), batch.id, %s, %s, %s, false, now(), now()
+    FROM batch
+    RETURNING user_id
+)
+SELECT (SELECT COUNT(*) FROM inserted), (SELECT id FROM batch ORDER BY id DESC LIMIT 1), (SELECT array_agg(user_id) FROM inserted)
+"""
+
+
+class DispatchTakenOver(Exception):
+    """
+    Another worker recorded progress on the dispatch since this one read it.
+    """
+
+
+def write_chunk(dispatch, recipients_sql, recipients_params):
+    sql = CHUNK_SQL.format(recipients=recipients_sql, notifications=Notification._meta.db_table)
+    after = dispatch.last_user_id
+    params = [*recipients_params, after, after, settings.NOTIFICATION_FANOUT_CHUNK_SIZE, dispatch.title, dispatch.message, dispatch.type]
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            written, last_user_id, user_ids = cursor.fetchone()
+        # Progress only moves on from where this worker read it; otherwise the chunk is rolled back.
+        if written and not NotificationDispatch.objects.filter(pk=dispatch.pk, last_user_id=after).update(sent_count=F("sent_count") + written, last_user_id=last_user_id, updated_at=timezone.now()):
+            raise DispatchTakenOver(dispatch.pk)
+    # One delete_many per chunk instead of an increment per recipient; counters are rebuilt on the next read.
+    invalidate_unread_counts(user_ids or [])
+    return written, last_user_id
+
+
+def claimable(stale_after=None):
+    """
+    Dispatches a worker may claim: pending ones, and running ones that made no
+    progress for `stale_after` seconds (default `NOTIFICATION_DISPATCH_STALE_AFTER`).
+    """
+    stale_after = settings.NOTIFICATION_DISPATCH_STALE_AFTER if stale_after is None else stale_after
+    stale_before = timezone.now() - timedelta(seconds=stale_after)
+    return NotificationDispatch.objects.filter(Q(status=NotificationDispatch.Status.PENDING) | Q(status=NotificationDispatch.Status.RUNNING, updated_at__lt=stale_before))
+
+
+def run_dispatch(dispatch_id, stale_after=None) -> None:
+    """
+    Fans a dispatch out in bounded chunks, committing progress after each one.
+    Claims the dispatch first, which fails while another worker is making
+    progress on it. A worker that stalled longer than `stale_after` seconds
+    loses its claim, and its next chunk is rolled back once the dispatch has
+    moved on, so no recipient is notified twice.
+    """
+    claimed = claimable(stale_after).filter(pk=dispatch_id).update(status=NotificationDispatch.Status.RUNNING, updated_at=timezone.now())
+    if not claimed:
+        return
+
+    dispatch = NotificationDispatch.objects.get(pk=dispatch_id)
+    recipients_sql, recipients_params = resolve_recipients(dispatch.target).order_by().values("id").query.sql_with_params()
+    try:
+        while True:
+            written, last_user_id = write_chunk(dispatch, recipients_sql, recipients_params)
+            if last_user_id is None:
+                break
+            dispatch.sent_count += written
+            dispatch.last_user_id = last_user_id
+        NotificationDispatch.objects.filter(pk=dispatch_id).update(status=NotificationDispatch.Status.COMPLETED, finished_at=timezone.now())
+    except DispatchTakenOver:
+        logger.warning("Notification dispatch %s was resumed by another worker", dispatch_id)
+    except Exception as error:
+        logger.exception("Notification dispatch %s failed", dispatch_id)
+        NotificationDispatch.objects.filter(pk=dispatch_id).update(status=NotificationDispatch.Status.FAILED, error=str(error), finished_at=timezone.now())
+
+
+def _run_in_background(dispatch_id) -> None:
+    try:
+        run_dispatch(dispatch_id)
+    finally:
+        connection.close()
+
+
+def submit_dispatch(dispatch) -> None:
+    """
+    Runs the dispatch on the fan-out thread pool once the current transaction commits.
+    """
+    transaction.on_commit(lambda: _executor.submit(_run_in_background, dispatch.pk))
@@ -0,0 +1,21 @@
+# type: ignore
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...fanout import claimable, run_dispatch
+from ...models import NotificationDispatch
+
+
+class Command(BaseCommand):
+    help = "Runs pending notification dispatches and resumes ones whose worker stopped mid-way (e.g. after a restart)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--stale-after", type=int, default=settings.NOTIFICATION_DISPATCH_STALE_AFTER, help="Seconds without progress before a RUNNING dispatch is resumed.")
+
+    def handle(self, *args, **options):
+        dispatches = claimable(options["stale_after"]).order_by("created_at")
+
+        for dispatch_id in dispatches.values_list("id", flat=True):
+            run_dispatch(dispatch_id, options["stale_after"])
+            dispatch = NotificationDispatch.objects.get(pk=dispatch_id)
+            self.stdout.write(f"{dispatch.id}: {dispatch.status}, {dispatch.sent_count} sent")
@@ -0,0 +1,146 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:23
+
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0006_keyset_pagination_indexes"),
+        ("departments", "0001_initial"),
+        ("notifications", "0004_notification_dispatch"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Broadcast",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("title", models.CharField(max_length=255)),
+                ("message", models.TextField()),
+                (
+                    "type",
+                    models.CharField(
+                        choices=[
+                            ("INFO", "Info"),
+                            ("ALERT", "Alert"),
+                            ("REMINDER", "Reminder"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("year", models.PositiveIntegerField(blank=True, null=True)),
+                ("semester", models.PositiveIntegerField(blank=True, null=True)),
+                ("recipient_count", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "course",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="broadcasts",
+                        to="courses.course",
+                    ),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="broadcasts",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "department",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="broadcasts",
+                        to="departments.department",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Broadcast",
+                "verbose_name_plural": "Broadcasts",
+                "db_table": "notification_broadcasts",
+            },
+        ),
+        migrations.CreateModel(
+            name="BroadcastReceipt",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("read_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "broadcast",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="receipts",
+                        to="notifications.broadcast",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="broadcast_receipts",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Broadcast Receipt",
+                "verbose_name_plural": "Broadcast Receipts",
+                "db_table": "notification_broadcast_receipts",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="broadcast",
+            index=models.Index(fields=["created_at", "id"], name="notificatio_created_25ff2d_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="broadcast",
+            index=models.Index(
+                fields=["department", "year", "semester"],
+                name="notificatio_departm_620633_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="broadcast",
+            index=models.Index(fields=["course"], name="notificatio_course__a45b10_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="broadcastreceipt",
+            index=models.Index(fields=["broadcast"], name="notificatio_broadca_ba5d58_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="broadcastreceipt",
+            constraint=models.UniqueConstraint(fields=("user", "broadcast"), name="broadcast_receipt_unique"),
+        ),
+    ]
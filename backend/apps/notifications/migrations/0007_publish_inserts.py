@@ -0,0 +1,73 @@
+from django.db import migrations
+
+# Statement-level triggers publish every insert on the `notifications` channel,
+# whether it comes from save(), bulk_create() or a raw INSERT ... SELECT. pg_notify
+# delivers on commit, so listeners never see rows that were rolled back.
+PUBLISH_SQL = """
+CREATE FUNCTION notifications_publish_inserts() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify(
+        'notifications',
+        json_build_object(
+            'kind', 'direct',
+            'id', id,
+            'user', user_id,
+            'title', title,
+            'type', type,
+            'created_at', created_at
+        )::text
+    )
+    FROM new_rows;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER notifications_publish
+AFTER INSERT ON notifications
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notifications_publish_inserts();
+
+CREATE FUNCTION notification_broadcasts_publish_inserts() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify(
+        'notifications',
+        json_build_object(
+            'kind', 'broadcast',
+            'id', id,
+            'department', department_id,
+            'year', year,
+            'semester', semester,
+            'course', course_id,
+            'title', title,
+            'type', type,
+            'created_at', created_at
+        )::text
+    )
+    FROM new_rows;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER notification_broadcasts_publish
+AFTER INSERT ON notification_broadcasts
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notification_broadcasts_publish_inserts();
+"""
+
+UNPUBLISH_SQL = """
+DROP TRIGGER IF EXISTS notification_broadcasts_publish ON notification_broadcasts;
+DROP FUNCTION IF EXISTS notification_broadcasts_publish_inserts();
+DROP TRIGGER IF EXISTS notifications_publish ON notifications;
+DROP FUNCTION IF EXISTS notifications_publish_inserts();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0006_unread_partial_index"),
+    ]
+
+    operations = [
+        migrations.RunSQL(PUBLISH_SQL, UNPUBLISH_SQL),
+    ]
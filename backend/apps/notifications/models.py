@@ -1,5 +1,7 @@
 import uuid
 
+from apps.courses.models import Course
+from apps.departments.models import Department
 from apps.users.models import User
 from django.db import models
 
@@ -27,6 +29,9 @@ class Notification(models.Model):
             models.Index(fields=["user"]),
             models.Index(fields=["is_read"]),
             models.Index(fields=["type"]),
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["user", "created_at", "id"]),
+            models.Index(fields=["user", "created_at"], condition=models.Q(is_read=False), name="notifications_unread_idx"),
         ]
 
     def __str__(self):
@@ -34,3 +39,105 @@ class Notification(models.Model):
 
     def __repr__(self):
         return f"<Notification user={self.user.email} title={self.title}>"
+
+
+class NotificationDispatch(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        RUNNING = "RUNNING", "Running"
+        COMPLETED = "COMPLETED", "Completed"
+        FAILED = "FAILED", "Failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    type = models.CharField(max_length=20, choices=Notification.NotificationType.choices)
+    target = models.JSONField(default=dict)  # type: ignore
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    sent_count = models.PositiveIntegerField(default=0)
+    last_user_id = models.UUIDField(null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="notification_dispatches")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "notification_dispatches"
+        verbose_name = "Notification Dispatch"
+        verbose_name_plural = "Notification Dispatches"
+        indexes = [
+            models.Index(fields=["status"]),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.status}, {self.sent_count} sent)"
+
+    def __repr__(self):
+        return f"<NotificationDispatch {self.id} | {self.status} | {self.sent_count}>"
+
+
+class Broadcast(models.Model):
+    """
+    A notification stored once for everyone matching its targeting criteria.
+    Empty criteria address all active users; set criteria narrow the audience
+    to a department, year, semester, or the cohorts a course is offered to.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    type = models.CharField(max_length=20, choices=Notification.NotificationType.choices)
+    department = models.ForeignKey(Department, on_delete=models.CASCADE, null=True, blank=True, related_name="broadcasts")
+    year = models.PositiveIntegerField(null=True, blank=True)
+    semester = models.PositiveIntegerField(null=True, blank=True)
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, null=True, blank=True, related_name="broadcasts")
+    recipient_count = models.PositiveIntegerField(default=0)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="broadcasts")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "notification_broadcasts"
+        verbose_name = "Broadcast"
+        verbose_name_plural = "Broadcasts"
+        indexes = [
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["department", "year", "semester"]),
+            models.Index(fields=["course"]),
+        ]
+
+    def __str__(self):
+        return f"{self.title} (broadcast)"
+
+    def __repr__(self):
+        return f"<Broadcast {self.id} | {self.title}>"
+
+
+class BroadcastReceipt(models.Model):
+    """
+    Marks a broadcast as read by one user. Only reads are stored, so unread
+    broadcasts cost nothing per recipient.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    broadcast = models.ForeignKey(Broadcast, on_delete=models.CASCADE, related_name="receipts")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="broadcast_receipts")
+    read_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "notification_broadcast_receipts"
+        verbose_name = "Broadcast Receipt"
+        verbose_name_plural = "Broadcast Receipts"
+        constraints = [
+            models.UniqueConstraint(fields=["user", "broadcast"], name="broadcast_receipt_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["broadcast"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user} read {self.broadcast}"
+
+    def __repr__(self):
+        return f"<BroadcastReceipt user={self.user_id} broadcast={self.broadcast_id}>"
@@ -3,6 +3,11 @@ from apps.users.models import User
 from rest_framework.permissions import SAFE_METHODS, BasePermission
 
 
+class IsAdmin(BasePermission):
+    def has_permission(self, request, view):
+        return request.user.role == User.Role.ADMIN
+
+
 class IsAdminOrReadOnly(BasePermission):
     def has_permission(self, request, view):
         if request.method in SAFE_METHODS:
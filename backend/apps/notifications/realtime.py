@@ -0,0 +1,139 @@
+# type: ignore
+import asyncio
+import json
+import logging
+from collections import defaultdict
+
+import psycopg
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Channel the notifications triggers publish on (see migration 0007_publish_inserts).
+CHANNEL = "notifications"
+RECONNECT_DELAY = 2
+
+
+def listen_conninfo() -> dict:
+    """
+    Connection parameters of the default database, including its `OPTIONS` (sslmode,
+    sslrootcert, ...), minus Django's cursor class and adapters, which are sync-only.
+    """
+    params = connections["default"].get_connection_params()
+    params.pop("cursor_factory", None)
+    params.pop("context", None)
+    return params
+
+
+class Subscription:
+    """
+    One open stream: the user it belongs to, their cohort for matching broadcasts,
+    and a bounded queue of events waiting to be written to the client.
+    """
+
+    def __init__(self, user, course_ids):
+        self.user_id = str(user.pk)
+        self.department_id = str(user.department_id) if user.department_id else None
+        self.year = user.year
+        self.semester = user.semester
+        self.course_ids = {str(course_id) for course_id in course_ids}
+        self.queue = asyncio.Queue(maxsize=settings.NOTIFICATION_STREAM_QUEUE_SIZE)
+        self.lagged = False
+
+    def matches(self, event) -> bool:
+        return (
+            event["department"] in (None, self.department_id)
+            and event["year"] in (None, self.year)
+            and event["semester"] in (None, self.semester)
+            and (event["course"] is None or event["course"] in self.course_ids)
+        )
+
+    def deliver(self, event) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A client this far behind is told to refetch its inbox instead.
+            self.lagged = True
+
+
+class NotificationListener:
+    """
+    Holds a single LISTEN connection for the whole process and routes each event to
+    the open streams it concerns: by user for direct notifications, by cohort for
+    broadcasts. The connection is opened with the first subscriber and reopened
+    after errors.
+    """
+
+    def __init__(self):
+        self.subscriptions = defaultdict(set)
+        self.listening = asyncio.Event()
+        self._task = None
+
+    def subscribe(self, subscription) -> None:
+        self.subscriptions[subscription.user_id].add(subscription)
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self.listening = asyncio.Event()
+            self._task = loop.create_task(self._listen())
+
+    def unsubscribe(self, subscription) -> None:
+        subscriptions = self.subscriptions.get(subscription.user_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self.subscriptions[subscription.user_id]
+
+    def route(self, payload: str) -> int:
+        event = json.loads(payload)
+        if event["kind"] == "direct":
+            targets = self.subscriptions.get(event["user"], ())
+        else:
+            targets = [subscription for subscriptions in self.subscriptions.values() for subscription in subscriptions if subscription.matches(event)]
+        for subscription in targets:
+            subscription.deliver(event)
+        return len(targets)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(**listen_conninfo(), autocommit=True) as connection:
+                    await connection.execute(f"LISTEN {CHANNEL}")
+                    self.listening.set()
+                    async for notify in connection.notifies():
+                        self.route(notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.listening.clear()
+                logger.exception("Notification listener lost its connection; reconnecting")
+                await asyncio.sleep(RECONNECT_DELAY)
+
+
+listener = NotificationListener()
+
+
+def format_event(event) -> str:
+    return f"id: {event['id']}\nevent: notification\ndata: {json.dumps(event)}\n\n"
+
+
+async def stream_events(subscription):
+    """
+    Server-sent events for one subscription. Sends a keep-alive comment when idle so
+    proxies keep the connection open, and a `resync` event if the client fell behind.
+    """
+    listener.subscribe(subscription)
+    try:
+        yield f"retry: {settings.NOTIFICATION_STREAM_RETRY_MS}\n\n"
+        while True:
+            if subscription.lagged:
+                subscription.lagged = False
+                yield "event: resync\ndata: {}\n\n"
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=settings.NOTIFICATION_STREAM_HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_event(event)
+    finally:
+        listener.unsubscribe(subscription)
@@ -0,0 +1,91 @@
+# type: ignore
+from apps.courses.models import CourseOffering
+from apps.users.models import User
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef
+
+COHORT_FIELDS = ("department_id", "year", "semester")
+
+
+def active_users():
+    return User.objects.filter(is_active=True)
+
+
+def explicit_recipients(user_ids):
+    """
+    Active users among `user_ids`, resolved with a single `id__in` query.
+    """
+    return active_users().filter(id__in=list(user_ids))
+
+
+def cohort_recipients(department_id=None, year=None, semester=None):
+    users = active_users()
+    if department_id:
+        users = users.filter(department_id=department_id)
+    if year:
+        users = users.filter(year=year)
+    if semester:
+        users = users.filter(semester=semester)
+    return users
+
+
+def course_recipients(course_id, department_id=None, year=None, semester=None):
+    """
+    Active users whose (department, year, semester) equals one of the course's
+    offerings, as a single semi-join against course_offerings.
+    """
+    offerings = CourseOffering.objects.filter(course_id=course_id, department_id=OuterRef("department_id"), year=OuterRef("year"), semester=OuterRef("semester"))
+    return cohort_recipients(department_id, year, semester).filter(Exists(offerings))
+
+
+def resolve_recipients(target):
+    """
+    Active users addressed by a dispatch target: `{"all_users": true}`,
+    `{"course_id": ...}` or `{"user_ids": [...]}`.
+    """
+    if target.get("all_users"):
+        return active_users()
+    if target.get("course_id"):
+        return course_recipients(target["course_id"])
+    return explicit_recipients(target.get("user_ids", []))
+
+
+def cohort_cache_key(department_id, year, semester) -> str:
+    return f"notifications:cohort:{department_id}:{year}:{semester}"
+
+
+def cohort_member_ids(department_id, year, semester) -> frozenset:
+    """
+    Ids of the active users in one (department, year, semester) cohort, cached.
+    """
+    key = cohort_cache_key(department_id, year, semester)
+    members = cache.get(key)
+    if members is None:
+        members = frozenset(str(user_id) for user_id in cohort_recipients(department_id, year, semester).values_list("id", flat=True))
+        cache.set(key, members, settings.NOTIFICATION_COHORT_CACHE_TIMEOUT)
+    return members
+
+
+def course_member_ids(course_id, department_id=None, year=None, semester=None) -> frozenset:
+    """
+    Ids of the active users a course reaches, built from the cached sets of the
+    cohorts it is offered to, optionally narrowed to a department, year or semester.
+    """
+    offerings = CourseOffering.objects.filter(course_id=course_id)
+    if department_id:
+        offerings = offerings.filter(department_id=department_id)
+    if year:
+        offerings = offerings.filter(year=year)
+    if semester:
+        offerings = offerings.filter(semester=semester)
+    members = frozenset()
+    for cohort in set(offerings.values_list(*COHORT_FIELDS)):
+        members |= cohort_member_ids(*cohort)
+    return members
+
+
+def invalidate_cohort_members(cohorts) -> None:
+    keys = {cohort_cache_key(*cohort) for cohort in cohorts if all(cohort)}
+    if keys:
+        cache.delete_many(list(keys))
@@ -1,44 +1,119 @@
 # type: ignore
-from apps.users.models import User
 from rest_framework import serializers
 
-from .models import Notification
+from .broadcasts import create_broadcast
+from .models import Broadcast, Notification, NotificationDispatch
+
+# Request fields that turn a send into a broadcast, mapped to the broadcast's targeting fields.
+BROADCAST_CRITERIA = {"department_id": "department", "year": "year", "semester": "semester", "course_id": "course"}
+RECIPIENT_FIELDS = ("user", "user_id", "all_users", *BROADCAST_CRITERIA)
 
 
 class NotificationSerializer(serializers.ModelSerializer):
     user = serializers.ListField(child=serializers.UUIDField(), required=False, write_only=True)
+    # Older clients send the recipients as `user_id`.
+    user_id = serializers.ListField(child=serializers.UUIDField(), required=False, write_only=True)
     all_users = serializers.BooleanField(write_only=True, required=False, default=False)
+    department_id = serializers.UUIDField(required=False, allow_null=True, write_only=True)
+    year = serializers.IntegerField(required=False, allow_null=True, min_value=0, write_only=True)
+    semester = serializers.IntegerField(required=False, allow_null=True, min_value=0, write_only=True)
+    course_id = serializers.UUIDField(required=False, allow_null=True, write_only=True)
 
     class Meta:
         model = Notification
         fields = [
             "id",
             "user",
+            "user_id",
             "title",
             "message",
             "type",
             "is_read",
             "all_users",
+            "department_id",
+            "year",
+            "semester",
+            "course_id",
             "created_at",
             "updated_at",
         ]
         read_only_fields = ["id", "created_at", "updated_at", "is_read"]
 
+    def validate(self, attrs):
+        if (attrs.get("user") or attrs.get("user_id")) and (attrs.get("all_users") or self.broadcast_criteria(attrs)):
+            raise serializers.ValidationError("Send either to the listed users or to a broadcast audience (all_users, department_id, year, semester, course_id), not both.")
+        return attrs
+
+    @staticmethod
+    def broadcast_criteria(attrs):
+        """
+        The broadcast targeting fields given in `attrs`, by their `Broadcast` field name.
+        """
+        return {field: attrs[key] for key, field in BROADCAST_CRITERIA.items() if attrs.get(key) is not None}
+
+    def update(self, instance, validated_data):
+        # Recipients are chosen when a notification is sent and cannot be changed afterwards.
+        for field in RECIPIENT_FIELDS:
+            validated_data.pop(field, None)
+        return super().update(instance, validated_data)
+
+
+class NotificationDispatchSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = NotificationDispatch
+        fields = [
+            "id",
+            "title",
+            "type",
+            "target",
+            "status",
+            "sent_count",
+            "error",
+            "created_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+
+class BroadcastSerializer(serializers.ModelSerializer):
+    read_count = serializers.IntegerField(read_only=True, default=0)
+
+    class Meta:
+        model = Broadcast
+        fields = [
+            "id",
+            "title",
+            "message",
+            "type",
+            "department",
+            "year",
+            "semester",
+            "course",
+            "recipient_count",
+            "read_count",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = ["id", "recipient_count", "created_at", "updated_at"]
+
     def create(self, validated_data):
-        all_users = validated_data.pop("all_users", False)
-        users = validated_data.pop("user", [])
-
-        notifications = []
-
-        if all_users:
-            users = User.objects.filter(is_active=True)
-            for user in users:
-                note = Notification.objects.create(user=user, **validated_data)
-                notifications.append(note)
-        else:
-            for uid in users:
-                user = User.objects.get(id=uid)
-                note = Notification.objects.create(user=user, **validated_data)
-                notifications.append(note)
-
-        return notifications[0] if notifications else None
+        return create_broadcast(**validated_data)
+
+
+class InboxItemSerializer(serializers.Serializer):
+    """
+    One entry of a user's inbox: a direct notification or a broadcast addressed to them.
+    """
+
+    id = serializers.UUIDField()
+    kind = serializers.CharField()
+    title = serializers.CharField()
+    message = serializers.CharField()
+    type = serializers.CharField()
+    is_read = serializers.BooleanField()
+    created_at = serializers.DateTimeField()
+    updated_at = serializers.DateTimeField()
+
+
+class MarkReadSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, max_length=500)
@@ -0,0 +1,57 @@
+# type: ignore
+from apps.users.models import User
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Broadcast, Notification
+from .recipients import COHORT_FIELDS, invalidate_cohort_members
+from .unread import (
+    adjust_unread_count,
+    invalidate_all_unread_counts,
+    invalidate_unread_counts,
+)
+
+
+@receiver(post_save, sender=Notification)
+def count_notification(sender, instance, created, **kwargs):
+    if created:
+        adjust_unread_count(instance.user_id, 0 if instance.is_read else 1)
+    else:
+        invalidate_unread_counts([instance.user_id])
+
+
+@receiver(post_delete, sender=Notification)
+def uncount_notification(sender, instance, **kwargs):
+    invalidate_unread_counts([instance.user_id])
+
+
+@receiver(post_save, sender=Broadcast)
+@receiver(post_delete, sender=Broadcast)
+def recount_broadcasts(sender, instance, **kwargs):
+    invalidate_all_unread_counts()
+
+
+@receiver(post_save, sender=User)
+def recount_user(sender, instance, **kwargs):
+    # A user's cohort decides which broadcasts they see.
+    invalidate_unread_counts([instance.pk])
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_user_cohort(sender, instance, update_fields=None, **kwargs):
+    instance._previous_cohort = None
+    if instance._state.adding or (update_fields is not None and not {*COHORT_FIELDS, "department", "is_active"} & set(update_fields)):
+        return
+    instance._previous_cohort = User.objects.filter(pk=instance.pk).values_list(*COHORT_FIELDS).first()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cohort(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not {*COHORT_FIELDS, "department", "is_active"} & set(update_fields):
+        return
+    cohorts = [tuple(getattr(instance, field) for field in COHORT_FIELDS)]
+    previous = getattr(instance, "_previous_cohort", None)
+    if previous:
+        cohorts.append(previous)
+    invalidate_cohort_members(cohorts)
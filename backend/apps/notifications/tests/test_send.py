@@ -0,0 +1,73 @@
+# type: ignore
+import pytest
+from apps.users.models import User
+from rest_framework.test import APIClient
+
+from ..models import Broadcast, NotificationDispatch
+
+URL = "/v1/notifications/"
+
+
+@pytest.fixture
+def submitted(monkeypatch):
+    dispatches = []
+    monkeypatch.setattr("apps.notifications.views.submit_dispatch", dispatches.append)
+    return dispatches
+
+
+@pytest.fixture
+def admin(db):
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(email="sender@example.com", password="secret", first_name="Send", last_name="Er", role=User.Role.ADMIN))
+    return client
+
+
+@pytest.fixture
+def student(db):
+    return User.objects.create_user(email="recipient@example.com", password="secret", first_name="Re", last_name="Cipient")
+
+
+def message(**fields):
+    return {"title": "Exam", "message": "Room 4", "type": "INFO", **fields}
+
+
+@pytest.mark.parametrize("field", ["user", "user_id"])
+def test_direct_send_is_dispatched(admin, student, submitted, field):
+    response = admin.post(URL, message(**{field: [str(student.pk)]}), format="json")
+    assert response.status_code == 202
+    assert response.json()["target"] == {"user_ids": [str(student.pk)]}
+    assert [dispatch.pk for dispatch in submitted] == [NotificationDispatch.objects.get().pk]
+
+
+@pytest.mark.parametrize("user_id", ["not-a-list", ["not-a-uuid"], [None]])
+def test_malformed_user_id_is_rejected_before_dispatch(admin, submitted, user_id):
+    response = admin.post(URL, message(user_id=user_id), format="json")
+    assert response.status_code == 400
+    assert "user_id" in response.json()
+    assert not submitted
+    assert not NotificationDispatch.objects.exists()
+
+
+def test_criteria_send_is_a_broadcast(admin, student, submitted):
+    response = admin.post(URL, message(year=2, semester=1), format="json")
+    assert response.status_code == 201
+    broadcast = Broadcast.objects.get()
+    assert (broadcast.year, broadcast.semester, broadcast.department_id) == (2, 1, None)
+    assert not submitted
+
+
+@pytest.mark.parametrize("audience", [{"all_users": True}, {"year": 2}, {"course_id": "5b0c5d7e-8f57-4a0f-9d53-9f0c2f3f6a10"}])
+def test_listed_users_and_a_broadcast_audience_are_rejected_together(admin, student, submitted, audience):
+    response = admin.post(URL, message(user=[str(student.pk)], **audience), format="json")
+    assert response.status_code == 400
+    assert not submitted
+    assert not Broadcast.objects.exists()
+    assert not NotificationDispatch.objects.exists()
+
+
+@pytest.mark.parametrize("criteria", [{"year": "second"}, {"department_id": "not-a-uuid"}])
+def test_malformed_criteria_are_rejected(admin, criteria):
+    response = admin.post(URL, message(**criteria), format="json")
+    assert response.status_code == 400
+    assert list(response.json()) == list(criteria)
+    assert not Broadcast.objects.exists()
@@ -0,0 +1,70 @@
+# type: ignore
+import asyncio
+import random
+
+import psycopg
+from apps.users.models import User
+from asgiref.sync import sync_to_async
+from django.db import connections
+
+from ..models import Broadcast, Notification
+from ..realtime import Subscription, listen_conninfo, listener
+
+SUBSCRIBERS = 200
+NOTIFICATIONS = 300
+BROADCASTS = 3
+TIMEOUT = 10
+
+
+def test_one_listener_delivers_every_event_to_its_subscribers(transactional_db):
+    users = User.objects.bulk_create(User(email=f"stream{index}@example.com", first_name="Stream", last_name=str(index)) for index in range(SUBSCRIBERS))
+    rng = random.Random(42)
+    recipients = [rng.choice(users) for _ in range(NOTIFICATIONS)]
+    expected = {str(user.pk): BROADCASTS for user in users}
+    for user in recipients:
+        expected[str(user.pk)] += 1
+
+    def insert():
+        Notification.objects.bulk_create(Notification(user=user, title="Stream test", message="Direct", type=Notification.NotificationType.INFO) for user in recipients)
+        for _ in range(BROADCASTS):
+            Broadcast.objects.create(title="Stream test", message="Everyone", type=Notification.NotificationType.INFO)
+
+    async def simulate():
+        subscriptions = [Subscription(user, []) for user in users]
+        for subscription in subscriptions:
+            listener.subscribe(subscription)
+        task = listener._task
+        await asyncio.wait_for(listener.listening.wait(), TIMEOUT)
+
+        received = {subscription.user_id: [] for subscription in subscriptions}
+
+        async def consume(subscription):
+            while len(received[subscription.user_id]) < expected[subscription.user_id]:
+                received[subscription.user_id].append(await subscription.queue.get())
+
+        consumers = asyncio.gather(*(consume(subscription) for subscription in subscriptions))
+        await sync_to_async(insert)()
+        try:
+            await asyncio.wait_for(consumers, TIMEOUT)
+        finally:
+            for subscription in subscriptions:
+                listener.unsubscribe(subscription)
+        # Every subscriber shared the one LISTEN connection opened by the first.
+        assert listener._task is task
+        return subscriptions, received
+
+    subscriptions, received = asyncio.run(simulate())
+    assert {user_id: len(events) for user_id, events in received.items()} == expected
+    for subscription in subscriptions:
+        assert not subscription.lagged
+        assert all(event["user"] == subscription.user_id for event in received[subscription.user_id] if event["kind"] == "direct")
+
+
+def test_listen_conninfo_keeps_the_database_options(monkeypatch):
+    monkeypatch.setitem(connections["default"].settings_dict, "OPTIONS", {"sslmode": "disable", "application_name": "notifications"})
+    params = listen_conninfo()
+    assert params["dbname"] == connections["default"].settings_dict["NAME"]
+    assert (params["sslmode"], params["application_name"]) == ("disable", "notifications")
+    assert not {"cursor_factory", "context"} & set(params)
+    with psycopg.connect(**params) as connection:
+        assert connection.execute("SHOW application_name").fetchone() == ("notifications",)
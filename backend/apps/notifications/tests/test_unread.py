@@ -0,0 +1,40 @@
+# type: ignore
+import pytest
+from apps.users.models import User
+from django.core.cache import cache
+from utils.checks import check_atomic_incr
+
+from ..models import Notification
+from ..unread import get_unread_count, unread_cache_key
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+REDIS = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://localhost:6379/0"}}
+DATABASE = {"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "django_cache"}}
+
+
+@pytest.fixture
+def user(db):
+    user = User.objects.create_user(email="unread@example.com", password="secret", first_name="Unread", last_name="Test")
+    Notification.objects.create(user=user, title="Unread", message="One", type=Notification.NotificationType.INFO)
+    return user
+
+
+def test_atomic_cache_adjusts_the_counter_in_place(user, settings):
+    settings.CACHES = LOCMEM
+    assert get_unread_count(user) == 1
+    Notification.objects.create(user=user, title="Unread", message="Two", type=Notification.NotificationType.INFO)
+    assert cache.get(unread_cache_key(user.pk)) == 2
+
+
+def test_database_cache_drops_the_counter_for_a_recount(user, settings):
+    settings.CACHES = DATABASE
+    assert get_unread_count(user) == 1
+    Notification.objects.create(user=user, title="Unread", message="Two", type=Notification.NotificationType.INFO)
+    assert cache.get(unread_cache_key(user.pk)) is None
+    assert get_unread_count(user) == 2
+
+
+@pytest.mark.parametrize("debug, caches, expected", [(False, DATABASE, ["utils.E002"]), (True, DATABASE, ["utils.W002"]), (False, REDIS, [])])
+def test_check_requires_an_atomic_incr_outside_debug(settings, debug, caches, expected):
+    settings.DEBUG, settings.CACHES = debug, caches
+    assert [message.id for message in check_atomic_incr(None)] == expected
@@ -0,0 +1,94 @@
+# type: ignore
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .broadcasts import broadcasts_for, mark_broadcasts_read
+from .models import BroadcastReceipt, Notification
+
+GENERATION_KEY = "notifications:unread:generation"
+
+# Backends whose incr() is one atomic operation. Elsewhere (e.g. DatabaseCache) it is a get
+# and a set that concurrent requests can interleave, so counters are dropped instead; the
+# utils.E002 check rejects such a cache outside DEBUG.
+ATOMIC_INCR_CACHES = ("RedisCache", "PyMemcacheCache", "PyLibMCCache", "LocMemCache")
+
+
+def _generation() -> int:
+    # Bumped whenever a broadcast is added or removed, which can change every user's count at once.
+    return cache.get_or_set(GENERATION_KEY, time.time_ns, None)
+
+
+def unread_cache_key(user_id) -> str:
+    return f"notifications:unread:{_generation()}:{user_id}"
+
+
+def count_unread(user) -> int:
+    """
+    Unread direct notifications (served by the partial `notifications_unread_idx`) plus
+    broadcasts addressed to the user that have no read receipt from them.
+    """
+    direct = Notification.objects.filter(user=user, is_read=False).count()
+    broadcasts = broadcasts_for(user).exclude(Exists(BroadcastReceipt.objects.filter(broadcast_id=OuterRef("pk"), user=user))).count()
+    return direct + broadcasts
+
+
+def get_unread_count(user) -> int:
+    key = unread_cache_key(user.pk)
+    count = cache.get(key)
+    if count is None:
+        count = count_unread(user)
+        cache.set(key, count, settings.NOTIFICATION_UNREAD_CACHE_TIMEOUT)
+    return count
+
+
+def adjust_unread_count(user_id, delta: int) -> None:
+    """
+    Applies `delta` to a user's cached counter. A counter that is not cached is
+    left alone; it is counted from the database on the next read. Without an
+    atomic `incr`, the counter is dropped and recounted instead.
+    """
+    if not delta:
+        return
+    if type(caches["default"]).__name__ not in ATOMIC_INCR_CACHES:
+        cache.delete(unread_cache_key(user_id))
+        return
+    try:
+        cache.incr(unread_cache_key(user_id), delta)
+    except ValueError:
+        pass
+
+
+def invalidate_unread_counts(user_ids) -> None:
+    generation = _generation()
+    keys = [f"notifications:unread:{generation}:{user_id}" for user_id in user_ids]
+    if keys:
+        cache.delete_many(keys)
+
+
+def invalidate_all_unread_counts() -> None:
+    cache.set(GENERATION_KEY, time.time_ns(), None)
+
+
+def mark_read(user, ids) -> int:
+    """
+    Marks the given direct notifications and broadcasts as read for `user` with one
+    UPDATE and one INSERT ... SELECT. Returns how many were unread before.
+    """
+    with transaction.atomic():
+        direct = Notification.objects.filter(user=user, id__in=ids, is_read=False).update(is_read=True, updated_at=timezone.now())
+        broadcasts = mark_broadcasts_read(user, broadcasts_for(user).filter(id__in=ids))
+    adjust_unread_count(user.pk, -(direct + broadcasts))
+    return direct + broadcasts
+
+
+def mark_all_read(user) -> int:
+    with transaction.atomic():
+        direct = Notification.objects.filter(user=user, is_read=False).update(is_read=True, updated_at=timezone.now())
+        broadcasts = mark_broadcasts_read(user, broadcasts_for(user))
+    cache.set(unread_cache_key(user.pk), 0, settings.NOTIFICATION_UNREAD_CACHE_TIMEOUT)
+    return direct + broadcasts
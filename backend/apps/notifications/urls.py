@@ -1,9 +1,15 @@
 # type: ignore
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from .views import NotificationViewSet
+from .views import BroadcastViewSet, NotificationViewSet, notification_stream
 
 router = DefaultRouter()
+# Registered first so `broadcasts/` is not taken for a notification id.
+router.register(r"notifications/broadcasts", BroadcastViewSet, basename="broadcast")
 router.register(r"notifications", NotificationViewSet, basename="notification")
 
-urlpatterns = router.urls
+urlpatterns = [
+    path("notifications/stream/", notification_stream, name="notification-stream"),
+    *router.urls,
+]
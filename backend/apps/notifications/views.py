@@ -1,14 +1,32 @@
 # type: ignore
 from apps.courses.models import CourseOffering
+from apps.users.authentication import CachedUserAuthentication
 from apps.users.models import User
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.db.models import Count
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from rest_framework import filters, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, NotAuthenticated
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from .models import Notification
+from .broadcasts import broadcasts_for, inbox_parts, with_read_state
+from .fanout import submit_dispatch
+from .models import Broadcast, Notification, NotificationDispatch
 from .pagination import NotificationPagination
-from .permissions import IsAdminOrReadOnly
-from .serializers import NotificationSerializer
+from .permissions import IsAdmin, IsAdminOrReadOnly
+from .realtime import Subscription, stream_events
+from .serializers import (
+    BroadcastSerializer,
+    InboxItemSerializer,
+    MarkReadSerializer,
+    NotificationDispatchSerializer,
+    NotificationSerializer,
+)
+from .unread import get_unread_count, mark_all_read, mark_read
 
 
 class NotificationViewSet(viewsets.ModelViewSet):
@@ -25,35 +43,127 @@ class NotificationViewSet(viewsets.ModelViewSet):
             return Notification.objects.filter(user_id=user).order_by("-created_at")
         return Notification.objects.all().order_by("-created_at")
 
+    def list(self, request, *args, **kwargs):
+        if request.user.role != User.Role.STUDENT:
+            return super().list(request, *args, **kwargs)
+
+        # A student's inbox merges their direct notifications with the broadcasts addressed to them.
+        direct = self.filter_queryset(self.get_queryset())
+        broadcasts = self.filter_queryset(broadcasts_for(request.user))
+        page = self.paginate_queryset(inbox_parts(direct, broadcasts, request.user))
+        return self.get_paginated_response(InboxItemSerializer(page, many=True).data)
+
     def create(self, request, *args, **kwargs):
-        all_users = request.data.get("all_users", False)
-        course_id = request.data.get("course_id", None)
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        if all_users:
-            users = User.objects.filter(is_active=True)
-        elif course_id:
-            course_offerings = CourseOffering.objects.filter(course_id=course_id)
-            users = User.objects.filter(
-                department_id__in=course_offerings.values_list("department_id", flat=True),
-                year__in=course_offerings.values_list("year", flat=True),
-                semester__in=course_offerings.values_list("semester", flat=True),
-                is_active=True,
-            )
-        else:
-            user_list = request.data.get("user_id", [])
-            users = User.objects.filter(id__in=user_list, is_active=True)
-
-        notifications = [
-            Notification(
-                user_id=user,
-                title=serializer.validated_data["title"],
-                message=serializer.validated_data["message"],
-                type=serializer.validated_data["type"],
-            )
-            for user in users
-        ]
-        Notification.objects.bulk_create(notifications)
-
-        return Response({"message": f"Notification sent to {len(users)} users."}, status=status.HTTP_201_CREATED)
+        all_users = serializer.validated_data.get("all_users")
+        criteria = {} if all_users else serializer.broadcast_criteria(serializer.validated_data)
+        if all_users or criteria:
+            content = {key: serializer.validated_data[key] for key in ("title", "message", "type")}
+            broadcast = BroadcastSerializer(data={**content, **criteria})
+            broadcast.is_valid(raise_exception=True)
+            broadcast.save(created_by=request.user)
+            return Response(broadcast.data, status=status.HTTP_201_CREATED)
+
+        user_ids = serializer.validated_data.get("user") or serializer.validated_data.get("user_id", [])
+        target = {"user_ids": [str(user_id) for user_id in user_ids]}
+        dispatch = NotificationDispatch.objects.create(
+            title=serializer.validated_data["title"],
+            message=serializer.validated_data["message"],
+            type=serializer.validated_data["type"],
+            target=target,
+            created_by=request.user,
+        )
+        submit_dispatch(dispatch)
+
+        return Response(NotificationDispatchSerializer(dispatch).data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated], url_path="unread-count")
+    def unread_count(self, request):
+        return Response({"unread_count": get_unread_count(request.user)})
+
+    @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated], url_path="mark-read")
+    def mark_read(self, request):
+        serializer = MarkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        marked = mark_read(request.user, serializer.validated_data["ids"])
+        return Response({"marked": marked, "unread_count": get_unread_count(request.user)})
+
+    @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated], url_path="mark-all-read")
+    def mark_all_read(self, request):
+        marked = mark_all_read(request.user)
+        return Response({"marked": marked, "unread_count": 0})
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated, IsAdmin], url_path=r"dispatches/(?P<dispatch_id>[0-9a-f-]+)")
+    def dispatch_status(self, request, dispatch_id=None):
+        dispatch = get_object_or_404(NotificationDispatch, pk=dispatch_id)
+        return Response(NotificationDispatchSerializer(dispatch).data)
+
+
+class BroadcastViewSet(viewsets.ModelViewSet):
+    """
+    Admins manage broadcasts here, one row per send with its recipient and read counts.
+    Students can fetch the broadcasts addressed to them and mark them as read.
+    """
+
+    queryset = Broadcast.objects.all().order_by("-created_at")
+    serializer_class = BroadcastSerializer
+    permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
+    filter_backends = [filters.SearchFilter]
+    search_fields = ["title", "message", "type"]
+    pagination_class = NotificationPagination
+    http_method_names = ["get", "post", "delete", "head", "options"]
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.role == User.Role.STUDENT:
+            return with_read_state(broadcasts_for(user), user).order_by("-created_at")
+        return Broadcast.objects.annotate(read_count=Count("receipts")).order_by("-created_at")
+
+    def get_serializer_class(self):
+        if self.request.user.role == User.Role.STUDENT:
+            return InboxItemSerializer
+        return BroadcastSerializer
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+    @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated])
+    def read(self, request, pk=None):
+        broadcast = get_object_or_404(broadcasts_for(request.user), pk=pk)
+        mark_read(request.user, [broadcast.pk])
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+def _stream_user(request):
+    # EventSource cannot send headers, so the access token may also come as `?token=`.
+    authentication = CachedUserAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else request.GET.get("token", "").encode() or None
+    if raw_token is None:
+        raise NotAuthenticated()
+    user = authentication.get_user(authentication.get_validated_token(raw_token))
+    course_ids = []
+    if user.department_id:
+        course_ids = list(CourseOffering.objects.filter(department_id=user.department_id, year=user.year, semester=user.semester).values_list("course_id", flat=True))
+    # A stream stays open for a long time; don't hold a database connection for it.
+    connection.close()
+    return user, course_ids
+
+
+async def notification_stream(request):
+    """
+    Server-sent events carrying the current user's new notifications and the
+    broadcasts addressed to them, as they are committed.
+    """
+    try:
+        user, course_ids = await sync_to_async(_stream_user)(request)
+    except APIException as error:
+        detail = error.detail if isinstance(error.detail, dict) else {"detail": error.detail}
+        return JsonResponse(detail, status=error.status_code)
+
+    response = StreamingHttpResponse(stream_events(Subscription(user, course_ids)), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
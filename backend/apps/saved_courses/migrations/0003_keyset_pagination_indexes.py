@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0006_keyset_pagination_indexes"),
+        ("saved_courses", "0002_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="savedcourse",
+            index=models.Index(fields=["user", "saved_at", "id"], name="saved_cours_user_id_0b3abf_idx"),
+        ),
+    ]
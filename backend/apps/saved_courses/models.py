@@ -19,6 +19,7 @@ class SavedCourse(models.Model):
         indexes = [
             models.Index(fields=["user"]),
             models.Index(fields=["course"]),
+            models.Index(fields=["user", "saved_at", "id"]),
         ]
 
     def __str__(self):
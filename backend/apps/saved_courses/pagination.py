@@ -1,8 +1,9 @@
 # type: ignore
-from rest_framework.pagination import PageNumberPagination
+from utils.pagination import CursorPageNumberPagination
 
 
-class SavedCoursePagination(PageNumberPagination):
+class SavedCoursePagination(CursorPageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 50
+    cursor_ordering = ("saved_at", "id")
@@ -1,4 +1,5 @@
 # type: ignore
+from apps.users.authentication import TokenUserAuthentication
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
 
@@ -11,3 +12,4 @@ class SchoolViewSet(viewsets.ModelViewSet):
     queryset = School.objects.all()
     serializer_class = SchoolSerializer
     permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
+    authentication_classes = [TokenUserAuthentication]
@@ -0,0 +1,7 @@
+from django.contrib import admin
+
+from .models import CachedSummary, ContentSummary, SummaryJob
+
+admin.site.register(CachedSummary)
+admin.site.register(SummaryJob)
+admin.site.register(ContentSummary)
@@ -0,0 +1,196 @@
+# type: ignore
+import hashlib
+import json
+import threading
+from collections import Counter
+from concurrent.futures import Future
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+
+from .models import CachedSummary
+from .prompts import PROMPT_VERSION
+
+MEMORY = "memory"
+DATABASE = "database"
+MISS = "miss"
+COALESCED = "coalesced"
+
+_memory = TTLCache(maxsize=settings.SUMMARY_CACHE_MEMORY_SIZE, ttl=settings.SUMMARY_CACHE_MEMORY_TTL)
+# Keys whose database row had `last_used_at` refreshed within the touch interval.
+_touched = TTLCache(maxsize=settings.SUMMARY_CACHE_MEMORY_SIZE, ttl=settings.SUMMARY_CACHE_TOUCH_INTERVAL)
+_lock = threading.Lock()
+_stats = Counter()
+# Upstream calls in progress in this process, keyed by cache key.
+_flights = {}
+
+
+def normalize_text(text):
+    return " ".join(text.split())
+
+
+def summary_cache_key(lecture_text, style, summary_length, prompt_version=PROMPT_VERSION):
+    raw = json.dumps([normalize_text(lecture_text), style, summary_length, prompt_version])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _count(tier):
+    with _lock:
+        _stats[tier] += 1
+
+
+def get_summary(key):
+    """
+    Looks a summary up in the in-process tier, then the database tier.
+    Returns `(summary, tier)`, with `summary` None on a miss. A memory hit
+    refreshes the row's `last_used_at` at most once per
+    `SUMMARY_CACHE_TOUCH_INTERVAL` seconds, so eviction sees it as used.
+    """
+    with _lock:
+        summary = _memory.get(key)
+        touch = summary is not None and key not in _touched
+        if touch:
+            _touched[key] = True
+        if summary is not None:
+            _stats[MEMORY] += 1
+    if summary is not None:
+        if touch:
+            CachedSummary.objects.filter(key=key).update(last_used_at=timezone.now())
+        return summary, MEMORY
+
+    updated = CachedSummary.objects.filter(key=key).update(hits=F("hits") + 1, last_used_at=timezone.now())
+    if updated:
+        summary = CachedSummary.objects.filter(key=key).values_list("summary", flat=True).first()
+    if summary is None:
+        _count(MISS)
+        return None, MISS
+
+    with _lock:
+        _stats[DATABASE] += 1
+        _memory[key] = summary
+        _touched[key] = True
+    return summary, DATABASE
+
+
+def store_summary(key, style, summary_length, summary):
+    with _lock:
+        _memory[key] = summary
+        _touched[key] = True
+    _, created = CachedSummary.objects.update_or_create(
+        key=key,
+        defaults={"style": style, "summary_length": summary_length, "prompt_version": PROMPT_VERSION, "summary": summary, "last_used_at": timezone.now()},
+    )
+    # Only a new row can take the table past its limit.
+    if created and CachedSummary.objects.count() > settings.SUMMARY_CACHE_MAX_ENTRIES:
+        evict(settings.SUMMARY_CACHE_MAX_ENTRIES)
+
+
+def join_flight(key):
+    """
+    Returns `(future, leader)`. The first caller for a key becomes its leader and
+    must settle the future with `finish_flight`; later callers wait on it.
+    """
+    with _lock:
+        flight = _flights.get(key)
+        if flight is not None:
+            _stats[COALESCED] += 1
+            return flight, False
+        flight = _flights[key] = Future()
+        return flight, True
+
+
+def finish_flight(key, flight, summary=None, error=None):
+    with _lock:
+        _flights.pop(key, None)
+    if error is not None:
+        flight.set_exception(error)
+    else:
+        flight.set_result(summary)
+
+
+def advisory_lock_id(key):
+    return int.from_bytes(bytes.fromhex(key[:16]), "big", signed=True)
+
+
+def summarize_once(key, style, summary_length, compute):
+    """
+    Produces a summary missing from the cache with at most one upstream call per
+    key at a time. Concurrent callers in this process wait for the leader's call.
+    Across processes the leader takes a Postgres advisory lock on the key and
+    re-checks the database tier once it holds it, so a summary another worker
+    has just stored is reused. Returns `(summary, tier)`.
+    """
+    flight, leader = join_flight(key)
+    if not leader:
+        return flight.result(), COALESCED
+    try:
+        summary, tier = _summarize_locked(key, style, summary_length, compute)
+    except Exception as error:
+        finish_flight(key, flight, error=error)
+        raise
+    finish_flight(key, flight, summary)
+    return summary, tier
+
+
+def _summarize_locked(key, style, summary_length, compute):
+    lock_id = advisory_lock_id(key)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(%s)", [lock_id])
+    try:
+        summary = CachedSummary.objects.filter(key=key).values_list("summary", flat=True).first()
+        if summary is not None:
+            with _lock:
+                _stats[COALESCED] += 1
+                _memory[key] = summary
+            return summary, COALESCED
+        summary = compute()
+        if summary:
+            store_summary(key, style, summary_length, summary)
+        return summary, MISS
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [lock_id])
+
+
+def evict(max_entries):
+    """
+    Keeps the database tier at `max_entries` rows, dropping the least recently used.
+    `store_summary` calls it once a new row takes the table past the limit.
+    """
+    table = CachedSummary._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE key IN (SELECT key FROM {table} ORDER BY last_used_at DESC OFFSET %s)", [max_entries])
+        return cursor.rowcount
+
+
+def clear_cache(stale_only=False):
+    """
+    Drops cached summaries: those from older prompt versions, or all of them.
+    Only this process's memory tier is cleared; other workers' expire within the memory TTL.
+    """
+    with _lock:
+        _memory.clear()
+        _touched.clear()
+    rows = CachedSummary.objects.all()
+    if stale_only:
+        rows = rows.exclude(prompt_version=PROMPT_VERSION)
+    deleted, _ = rows.delete()
+    return deleted
+
+
+def cache_stats():
+    with _lock:
+        stats = Counter(_stats)
+        memory_size = len(_memory)
+    lookups = stats[MEMORY] + stats[DATABASE] + stats[MISS]
+    return {
+        "prompt_version": PROMPT_VERSION,
+        "memory": {"size": memory_size, "max_size": _memory.maxsize, "ttl": _memory.ttl, "hits": stats[MEMORY]},
+        "database": {"size": CachedSummary.objects.count(), "max_size": settings.SUMMARY_CACHE_MAX_ENTRIES, "hits": stats[DATABASE]},
+        "misses": stats[MISS],
+        "coalesced": stats[COALESCED],
+        "hit_ratio": round((stats[MEMORY] + stats[DATABASE]) / lookups, 4) if lookups else None,
+    }
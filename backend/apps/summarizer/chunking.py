@@ -0,0 +1,54 @@
+# type: ignore
+import re
+
+# Rough token estimate for English prose; good enough to keep prompts inside a budget.
+CHARS_PER_TOKEN = 4
+
+SECTION_BREAK = re.compile(r"\n\s*\n")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _pieces(text, max_tokens):
+    """
+    Splits text into pieces that each fit `max_tokens`, preferring paragraph and
+    section boundaries, then sentence boundaries, then word boundaries.
+    """
+    for paragraph in SECTION_BREAK.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if estimate_tokens(paragraph) <= max_tokens:
+            yield paragraph
+            continue
+        for sentence in SENTENCE_END.split(paragraph):
+            if estimate_tokens(sentence) <= max_tokens:
+                yield sentence
+                continue
+            words, budget = [], max_tokens * CHARS_PER_TOKEN
+            for word in sentence.split():
+                if words and len(" ".join(words)) + len(word) + 1 > budget:
+                    yield " ".join(words)
+                    words = []
+                words.append(word)
+            if words:
+                yield " ".join(words)
+
+
+def split_text(text, max_tokens):
+    """
+    Packs the text into as few chunks of at most `max_tokens` as its boundaries allow,
+    keeping the original order.
+    """
+    chunks, current = [], []
+    for piece in _pieces(text, max_tokens):
+        if current and estimate_tokens("\n\n".join([*current, piece])) > max_tokens:
+            chunks.append("\n\n".join(current))
+            current = []
+        current.append(piece)
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
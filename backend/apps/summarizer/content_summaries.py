@@ -0,0 +1,135 @@
+# type: ignore
+import logging
+from datetime import timedelta
+
+import requests
+from apps.contents.models import Content
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .extraction import ExtractionError, UnsupportedContent, extract_text
+from .models import ContentSummary
+from .pipeline import summarize_variants
+from .prompts import FORMATTING_INSTRUCTIONS, PROMPT_VERSION
+
+logger = logging.getLogger(__name__)
+
+# Claims up to %s pending summaries, oldest first. Rows another worker is claiming are
+# skipped rather than waited on, and `status = 'PENDING'` is re-checked by the UPDATE.
+CLAIM_SQL = """
+UPDATE {summaries} SET status = 'RUNNING', attempts = attempts + 1, updated_at = now()
+WHERE status = 'PENDING' AND content_id IN (
+    SELECT content_id FROM {summaries}
+    WHERE status = 'PENDING'
+    ORDER BY updated_at
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING content_id
+"""
+
+
+def summary_variants():
+    return [(style, summary_length) for style in FORMATTING_INSTRUCTIONS for summary_length in settings.CONTENT_SUMMARY_LENGTHS]
+
+
+def _finish(content_id, status, **fields):
+    ContentSummary.objects.filter(pk=content_id).update(status=status, finished_at=timezone.now(), updated_at=timezone.now(), **fields)
+    return status
+
+
+def claim_content_summaries(limit) -> list:
+    with connection.cursor() as cursor:
+        cursor.execute(CLAIM_SQL.format(summaries=ContentSummary._meta.db_table), [limit])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def requeue_stale_content_summaries(stale_after) -> int:
+    """
+    Puts RUNNING summaries back in the queue when their worker stopped mid-way (e.g. after a restart).
+    """
+    stale_before = timezone.now() - timedelta(seconds=stale_after)
+    return ContentSummary.objects.filter(status=ContentSummary.Status.RUNNING, updated_at__lt=stale_before).update(status=ContentSummary.Status.PENDING, updated_at=timezone.now())
+
+
+def run_content_summary(content_id) -> str | None:
+    """
+    Claims one lecture's pending summary and produces it, so a content is never
+    summarized by two workers at once. Returns the resulting status, or None
+    when the row was not pending.
+    """
+    claimed = ContentSummary.objects.filter(pk=content_id, status=ContentSummary.Status.PENDING).update(status=ContentSummary.Status.RUNNING, attempts=F("attempts") + 1, updated_at=timezone.now())
+    if not claimed:
+        return None
+    return process_content_summary(content_id)
+
+
+def process_content_summary(content_id) -> str:
+    """
+    Extracts a claimed lecture's text and stores its summary in every standard
+    style and length. Returns the resulting status.
+    """
+    try:
+        text = extract_text(Content.objects.get(pk=content_id))
+    except UnsupportedContent as error:
+        return _finish(content_id, ContentSummary.Status.SKIPPED, error=str(error))
+    except (ExtractionError, requests.exceptions.RequestException) as error:
+        return _finish(content_id, ContentSummary.Status.FAILED, error=f"Text extraction failed: {error}")
+    except Exception as error:
+        # e.g. pypdf's DependencyError for an encrypted PDF, or a content deleted since it was claimed.
+        logger.exception("Extracting text from content %s failed", content_id)
+        return _finish(content_id, ContentSummary.Status.FAILED, error=f"Text extraction failed: {error}")
+    if not text:
+        return _finish(content_id, ContentSummary.Status.SKIPPED, error="The file contains no text.")
+
+    try:
+        variants = summarize_variants(text, summary_variants())
+    except requests.exceptions.RequestException as error:
+        return _finish(content_id, ContentSummary.Status.FAILED, error=f"Request failed: {error}")
+    except Exception as error:
+        logger.exception("Summarizing content %s failed", content_id)
+        return _finish(content_id, ContentSummary.Status.FAILED, error=str(error))
+
+    summaries = {}
+    for (style, summary_length), summary in variants.items():
+        summaries.setdefault(style, {})[str(summary_length)] = summary
+    return _finish(content_id, ContentSummary.Status.COMPLETED, summaries=summaries, prompt_version=PROMPT_VERSION, text_chars=len(text), error=None)
+
+
+def submit_content_summary(content) -> None:
+    """
+    Queues a lecture's summaries for `manage.py run_content_summaries`, which
+    claims pending rows; nothing runs on the web worker.
+    """
+    ContentSummary.objects.update_or_create(content=content, defaults={"status": ContentSummary.Status.PENDING, "error": None})
+
+
+def _stale_before():
+    return timezone.now() - timedelta(seconds=settings.SUMMARY_JOB_STALE_AFTER)
+
+
+def backfill_candidates(force=False, retry_failed=False):
+    """
+    Lectures whose summaries are missing, still pending, stuck running, or made with
+    an older prompt; every lecture with `force`. Failed ones are included with `retry_failed`.
+    """
+    lectures = Content.objects.filter(type=Content.ContentType.LECTURE)
+    if force:
+        return lectures
+    criteria = Q(summary__isnull=True) | Q(summary__status=ContentSummary.Status.PENDING)
+    criteria |= Q(summary__status=ContentSummary.Status.RUNNING, summary__updated_at__lt=_stale_before())
+    criteria |= Q(summary__status=ContentSummary.Status.COMPLETED) & ~Q(summary__prompt_version=PROMPT_VERSION)
+    if retry_failed:
+        criteria |= Q(summary__status=ContentSummary.Status.FAILED)
+    return lectures.filter(criteria)
+
+
+def mark_pending(content_ids) -> None:
+    """
+    Queues summaries for `content_ids`, leaving alone ones a live worker is producing.
+    """
+    ContentSummary.objects.bulk_create([ContentSummary(content_id=content_id) for content_id in content_ids], ignore_conflicts=True)
+    live = Q(status=ContentSummary.Status.RUNNING, updated_at__gte=_stale_before())
+    ContentSummary.objects.filter(pk__in=content_ids).exclude(live).update(status=ContentSummary.Status.PENDING, updated_at=timezone.now())
@@ -0,0 +1,125 @@
+# type: ignore
+import io
+import re
+import zipfile
+from pathlib import PurePosixPath
+from urllib.parse import urlparse
+from xml.etree import ElementTree
+
+import requests
+from django.conf import settings
+from pypdf import PdfReader
+from pypdf.errors import PdfReadError
+
+DRAWING_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+SLIDE_RE = re.compile(r"^ppt/slides/slide(\d+)\.xml$")
+
+
+class ExtractionError(Exception):
+    pass
+
+
+class UnsupportedContent(ExtractionError):
+    pass
+
+
+class UntrustedSource(ExtractionError):
+    pass
+
+
+def file_extension(content):
+    """
+    The upload's extension, from the suffix of `path`. The client-supplied
+    `file.extension` is not trusted.
+    """
+    return PurePosixPath(urlparse(content.path).path).suffix.lstrip(".").upper()
+
+
+def check_source(url):
+    """
+    Raises `UntrustedSource` unless `url` is https on one of `CONTENT_SUMMARY_ALLOWED_HOSTS`.
+    A host starting with a dot also allows its subdomains, as in `ALLOWED_HOSTS`.
+    """
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    allowed = any(host == pattern or (pattern.startswith(".") and host.endswith(pattern)) for pattern in settings.CONTENT_SUMMARY_ALLOWED_HOSTS)
+    if parsed.scheme != "https" or not allowed or parsed.username or parsed.password:
+        raise UntrustedSource(f"Refusing to download from {parsed.scheme}://{host}: not a configured storage host")
+
+
+def download(url):
+    """
+    Fetches an uploaded file from configured storage, refusing other hosts and
+    files larger than `CONTENT_SUMMARY_MAX_BYTES`. Redirects are not followed.
+    """
+    check_source(url)
+    limit = settings.CONTENT_SUMMARY_MAX_BYTES
+    with requests.get(url, stream=True, timeout=settings.SUMMARIZER_REQUEST_TIMEOUT, allow_redirects=False) as response:
+        if response.is_redirect:
+            raise UntrustedSource("Refusing to follow a redirect from storage")
+        response.raise_for_status()
+        data = bytearray()
+        for block in response.iter_content(64 * 1024):
+            data.extend(block)
+            if len(data) > limit:
+                raise ExtractionError(f"File is larger than {limit} bytes")
+    return bytes(data)
+
+
+def pdf_text(data):
+    try:
+        return "\n\n".join(page.extract_text() or "" for page in PdfReader(io.BytesIO(data)).pages)
+    except PdfReadError as error:
+        raise ExtractionError(f"Unreadable PDF: {error}") from error
+
+
+def _paragraphs(root, paragraph_tag, text_tag):
+    for paragraph in root.iter(paragraph_tag):
+        text = "".join(node.text or "" for node in paragraph.iter(text_tag)).strip()
+        if text:
+            yield text
+
+
+def pptx_text(data):
+    # Each slide becomes a section, so chunking keeps slides together.
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        slides = sorted((int(match.group(1)), name) for name in archive.namelist() if (match := SLIDE_RE.match(name)))
+        sections = ["\n".join(_paragraphs(ElementTree.fromstring(archive.read(name)), f"{DRAWING_NS}p", f"{DRAWING_NS}t")) for _, name in slides]
+    return "\n\n".join(section for section in sections if section)
+
+
+def docx_text(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        root = ElementTree.fromstring(archive.read("word/document.xml"))
+    return "\n\n".join(_paragraphs(root, f"{WORD_NS}p", f"{WORD_NS}t"))
+
+
+def plain_text(data):
+    return data.decode("utf-8", errors="replace")
+
+
+EXTRACTORS = {
+    "PDF": pdf_text,
+    "PPTX": pptx_text,
+    "DOCX": docx_text,
+    "TXT": plain_text,
+    "MD": plain_text,
+}
+
+
+def extract_text(content):
+    """
+    Downloads a content's file and returns its text, cut to `SUMMARIZER_MAX_INPUT_CHARS`.
+    Raises `UnsupportedContent` for file types without an extractor.
+    """
+    extension = file_extension(content)
+    extractor = EXTRACTORS.get(extension)
+    if extractor is None:
+        raise UnsupportedContent(f'No text extractor for {extension or "files without an extension"}')
+    try:
+        text = extractor(download(content.path))
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as error:
+        raise ExtractionError(f"Unreadable {extension} file: {error}") from error
+    limit = settings.SUMMARIZER_MAX_INPUT_CHARS
+    return text[:limit].strip()
@@ -0,0 +1,163 @@
+# type: ignore
+import re
+
+import numpy as np
+from django.conf import settings
+
+from .chunking import SECTION_BREAK, SENTENCE_END
+
+AUTO = "auto"
+LLM = "llm"
+LOCAL = "local"
+ENGINES = (AUTO, LLM, LOCAL)
+# Reported instead of LOCAL when the local engine stood in for a failed upstream call.
+LOCAL_FALLBACK = "local-fallback"
+
+WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+STOPWORDS = frozenset(
+    """
+    a about above after again against all also am an and any are as at be because been before being below between both but by can
+    could did do does doing down during each few for from further had has have having he her here hers herself him himself his how
+    i if in into is it its itself just may me might more most must my myself no nor not now of off on once only or other our ours
+    ourselves out over own same she should so some such than that the their theirs them themselves then there these they this those
+    through to too under until up us very was we were what when where which while who whom why will with would you your yours
+    yourself yourselves
+    """.split()
+)
+DAMPING = 0.85
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-6
+# Candidates at least this similar to a sentence already picked are skipped as repeats.
+REDUNDANCY = 0.7
+# Shorter fragments (headings, labels, bullet stubs) are only picked when nothing else fits.
+MIN_SENTENCE_WORDS = 4
+
+
+def prefers_local(engine, lecture_text):
+    """
+    Whether to summarize in-process: on request, or for texts of at most `SUMMARIZER_LOCAL_MAX_WORDS` words.
+    """
+    return engine == LOCAL or (engine == AUTO and len(lecture_text.split()) <= settings.SUMMARIZER_LOCAL_MAX_WORDS)
+
+
+def falls_back(engine):
+    """
+    Whether an upstream failure is answered with a local summary instead of an error.
+    """
+    return engine == AUTO and settings.SUMMARIZER_LOCAL_FALLBACK
+
+
+def split_sentences(text):
+    """
+    Returns `(paragraph, sentence)` pairs in order, with whitespace inside sentences collapsed.
+    """
+    sentences = []
+    for paragraph, block in enumerate(SECTION_BREAK.split(text)):
+        for sentence in SENTENCE_END.split(block.strip()):
+            sentence = " ".join(sentence.split())
+            if sentence:
+                sentences.append((paragraph, sentence))
+    return sentences
+
+
+def _tfidf(sentences):
+    """
+    The L2-normalized TF-IDF matrix of the sentences in sparse COO form: parallel
+    `rows`, `cols` and `weights` arrays sorted by row, plus the vocabulary size.
+    """
+    vocabulary, rows, cols = {}, [], []
+    for row, sentence in enumerate(sentences):
+        for word in WORD.findall(sentence.lower()):
+            if word not in STOPWORDS:
+                rows.append(row)
+                cols.append(vocabulary.setdefault(word, len(vocabulary)))
+    terms = len(vocabulary)
+    if not terms:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0), 0
+
+    # Repeated (sentence, term) pairs collapse into term frequencies.
+    pairs, frequencies = np.unique(np.array(rows, dtype=np.int64) * terms + np.array(cols, dtype=np.int64), return_counts=True)
+    rows, cols = np.divmod(pairs, terms)
+    document_frequencies = np.bincount(cols, minlength=terms)
+    weights = (1 + np.log(frequencies)) * (np.log((1 + len(sentences)) / (1 + document_frequencies)) + 1)[cols]
+    norms = np.sqrt(np.bincount(rows, weights=weights**2, minlength=len(sentences)))
+    return rows, cols, weights / norms[rows], terms
+
+
+def _textrank(rows, cols, weights, sentences, terms):
+    """
+    TextRank over the cosine-similarity graph of the sentences. With unit rows X, the
+    similarity matrix is X·Xᵀ, so each product is two sparse passes, X·(Xᵀ·v), and the
+    n×n matrix is never built.
+    """
+    has_terms = np.bincount(rows, minlength=sentences) > 0
+
+    def similarity(vector):
+        # Xᵀ·v, then X·(Xᵀ·v), minus each sentence's similarity of 1 with itself.
+        per_term = np.bincount(cols, weights=weights * vector[rows], minlength=terms)
+        return np.bincount(rows, weights=weights * per_term[cols], minlength=sentences) - vector * has_terms
+
+    degree = similarity(np.ones(sentences))
+    inverse_degree = np.divide(1.0, degree, out=np.zeros(sentences), where=degree > 1e-12)
+    rank = np.full(sentences, 1 / sentences)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) / sentences + DAMPING * similarity(rank * inverse_degree)
+        updated /= updated.sum()
+        converged = np.abs(updated - rank).sum() < TOLERANCE
+        rank = updated
+        if converged:
+            break
+    return rank
+
+
+def extract_summary(text, summary_length):
+    """
+    Extractive summary of at most `summary_length` words, made in-process.
+
+    Sentences are ranked by TextRank over their TF-IDF cosine similarity, picked
+    best first while they fit the word budget and do not repeat one already
+    picked, and returned in their original order and paragraphs. Style is not
+    applied: the summary is the lecture's own sentences.
+    """
+    sentences = split_sentences(text)
+    if not sentences:
+        return ""
+    lengths = [len(sentence.split()) for _, sentence in sentences]
+    if sum(lengths) <= summary_length:
+        chosen = range(len(sentences))
+    else:
+        rows, cols, weights, terms = _tfidf([sentence for _, sentence in sentences])
+        rank = _textrank(rows, cols, weights, len(sentences), terms) if terms else np.zeros(len(sentences))
+        chosen = _select(rank, lengths, rows, cols, weights, summary_length, MIN_SENTENCE_WORDS) or _select(rank, lengths, rows, cols, weights, summary_length, 1)
+        if not chosen:
+            # Even the best sentence is too long; cut it to the budget.
+            best = int(np.argmax(rank))
+            return " ".join(sentences[best][1].split()[:summary_length])
+
+    paragraphs = {}
+    for index in sorted(chosen):
+        paragraph, sentence = sentences[index]
+        paragraphs.setdefault(paragraph, []).append(sentence)
+    return "\n\n".join(" ".join(group) for group in paragraphs.values())
+
+
+def _select(rank, lengths, rows, cols, weights, summary_length, min_words):
+    starts = np.searchsorted(rows, np.arange(len(lengths) + 1))
+
+    def vector(index):
+        start, end = starts[index], starts[index + 1]
+        return dict(zip(cols[start:end].tolist(), weights[start:end].tolist()))
+
+    chosen, picked, words = [], [], 0
+    for index in np.argsort(-rank, kind="stable").tolist():
+        if lengths[index] < min_words or words + lengths[index] > summary_length:
+            continue
+        candidate = vector(index)
+        if any(sum(weight * other.get(term, 0.0) for term, weight in candidate.items()) >= REDUNDANCY for other in picked):
+            continue
+        chosen.append(index)
+        picked.append(candidate)
+        words += lengths[index]
+        if words == summary_length:
+            break
+    return chosen
@@ -0,0 +1,332 @@
+# type: ignore
+import contextvars
+import logging
+import random
+import socket
+import threading
+import time
+from collections import Counter, deque
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+CONNECT_TIMEOUT = 3.05
+# Latencies kept per process for the percentile figures in `metrics()`.
+LATENCY_SAMPLES = 1000
+
+
+class GeminiUnavailable(requests.exceptions.RequestException):
+    """
+    Raised without calling Gemini when the circuit breaker is open or every
+    connection slot is busy. `retry_after` is a hint in seconds for the client.
+    """
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CallCancelled(requests.exceptions.RequestException):
+    """
+    Raised by a call whose `Cancellation` was triggered, e.g. because a hedged
+    duplicate answered first.
+    """
+
+
+class Cancellation:
+    """
+    Lets another thread abort a call in progress. Cancelling stops further
+    retries and shuts down the socket the call is reading from, so a blocked
+    read returns at once instead of waiting out the timeout.
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self._connection = None
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self.event.is_set()
+
+    def cancel(self):
+        with self._lock:
+            self.event.set()
+            connection = self._connection
+        if connection is not None:
+            _shutdown(connection)
+
+    def attach(self, connection):
+        with self._lock:
+            self._connection = connection
+            cancelled = self.event.is_set()
+        if cancelled and connection is not None:
+            _shutdown(connection)
+
+
+def _shutdown(connection):
+    sock = getattr(connection, "sock", None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+# The cancellation of the call running in this thread, if any.
+_cancellation = contextvars.ContextVar("gemini_cancellation", default=None)
+
+
+class _CancellableHTTPPool(HTTPConnectionPool):
+    def _get_conn(self, timeout=None):
+        connection = super()._get_conn(timeout)
+        cancellation = _cancellation.get()
+        if cancellation is not None:
+            cancellation.attach(connection)
+        return connection
+
+
+class _CancellableHTTPSPool(_CancellableHTTPPool, HTTPSConnectionPool):
+    pass
+
+
+class _CancellableAdapter(HTTPAdapter):
+    """
+    Hands each connection taken from the pool to the calling thread's `Cancellation`.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _CancellableHTTPPool, "https": _CancellableHTTPSPool}
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failed calls and rejects calls for
+    `cooldown` seconds. The first call after the cooldown is let through as a
+    probe: success closes the breaker, failure opens it again. A probe that
+    reports nothing within `probe_timeout` seconds is given up on, and the next
+    call probes instead.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold, cooldown, probe_timeout=None):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.probe_timeout = settings.SUMMARIZER_BREAKER_PROBE_TIMEOUT if probe_timeout is None else probe_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started_at = 0.0
+        self._lock = threading.Lock()
+
+    def available(self):
+        """
+        Whether `allow` would let a call through, without claiming the probe.
+        """
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            return now - self.opened_at >= self.cooldown
+        if self.state == self.HALF_OPEN:
+            return now - self.probe_started_at >= self.probe_timeout
+        return True
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            if (self.state == self.OPEN and now - self.opened_at >= self.cooldown) or (self.state == self.HALF_OPEN and now - self.probe_started_at >= self.probe_timeout):
+                self.state = self.HALF_OPEN
+                self.probe_started_at = now
+                return True
+            return False
+
+    def retry_after(self):
+        return max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+
+    def release_probe(self):
+        """
+        Lets the next call probe again when the probe ended without a verdict, e.g. was cancelled.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic() - self.cooldown
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                if self.state != self.OPEN:
+                    logger.warning("Gemini circuit breaker opened after %s consecutive failures", self.failures)
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class GeminiClient:
+    """
+    Thread-safe Gemini client shared by every request in a process.
+
+    Calls reuse keep-alive connections from a pooled session, at most
+    `max_concurrency` run at once, and 429/5xx responses or transport errors are
+    retried with exponential backoff and full jitter until `deadline` seconds
+    after the call started. Calls that still fail
+    count towards the circuit breaker, which then fails fast with
+    `GeminiUnavailable` instead of tying workers up on an unhealthy upstream.
+    """
+
+    def __init__(self, url=None, api_key=None, max_concurrency=None, retries=None, backoff=None, breaker_threshold=None, breaker_cooldown=None, deadline=None):
+        self.url = url
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency or settings.SUMMARIZER_MAX_CONCURRENCY
+        self.retries = settings.SUMMARIZER_RETRIES if retries is None else retries
+        self.backoff = settings.SUMMARIZER_RETRY_BACKOFF if backoff is None else backoff
+        self.deadline = deadline or settings.SUMMARIZER_CALL_DEADLINE
+        self.breaker = CircuitBreaker(breaker_threshold or settings.SUMMARIZER_BREAKER_THRESHOLD, breaker_cooldown or settings.SUMMARIZER_BREAKER_COOLDOWN)
+        self.session = requests.Session()
+        adapter = _CancellableAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._stats = Counter()
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def generate(self, prompt, timeout=None, cancellation=None):
+        """
+        Sends one prompt to Gemini and returns the generated text.
+        Raises `GeminiUnavailable` when rejected up front, `CallCancelled` once
+        `cancellation` is triggered, and another `requests.exceptions.RequestException`
+        when the call fails.
+        """
+        if not self.breaker.available():
+            self._count("rejected_open")
+            raise GeminiUnavailable("Gemini circuit breaker is open", retry_after=self.breaker.retry_after())
+        if not self._slots.acquire(timeout=settings.SUMMARIZER_QUEUE_TIMEOUT):
+            self._count("rejected_busy")
+            raise GeminiUnavailable("All Gemini connections are busy", retry_after=1)
+        # Only a call that holds a slot may claim the half-open probe, so a probe always gets a verdict.
+        if not self.breaker.allow():
+            self._slots.release()
+            self._count("rejected_open")
+            raise GeminiUnavailable("Gemini circuit breaker is open", retry_after=self.breaker.retry_after())
+        self._add_in_flight(1)
+        try:
+            data = self._post_with_retries(prompt, timeout or settings.SUMMARIZER_REQUEST_TIMEOUT, cancellation, time.monotonic() + self.deadline)
+        except requests.exceptions.RequestException as error:
+            if cancellation is not None and cancellation.cancelled:
+                # Whatever the aborted read raised, the call ended because it was cancelled.
+                self._count("cancelled")
+                self.breaker.release_probe()
+                if isinstance(error, CallCancelled):
+                    raise
+                raise CallCancelled("The call was cancelled") from error
+            # Caller errors (4xx other than 429) say nothing about Gemini's health.
+            if not isinstance(error, requests.exceptions.HTTPError) or error.response.status_code in RETRYABLE_STATUSES:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            self._count("failures")
+            raise
+        finally:
+            self._add_in_flight(-1)
+            self._slots.release()
+        self.breaker.record_success()
+        self._count("successes")
+        return data.get("candidates", [])[0].get("content", {}).get("parts", [])[0].get("text", "")
+
+    def _post_with_retries(self, prompt, timeout, cancellation=None, deadline=None):
+        """
+        Posts the prompt, retrying as long as attempts remain and the next one can
+        start before `deadline` (a `time.monotonic()` value). Each attempt's read
+        timeout is cut to the time left, so the call never outlasts the deadline.
+        """
+        url = f"{self.url or settings.GEMINI_URL}?key={self.api_key or settings.GEMINI_API_KEY}"
+        body = {"contents": [{"parts": [{"text": prompt}]}]}
+        sleep = cancellation.event.wait if cancellation is not None else time.sleep
+        deadline = deadline or time.monotonic() + self.deadline
+        for attempt in range(self.retries + 1):
+            if cancellation is not None and cancellation.cancelled:
+                raise CallCancelled("The call was cancelled")
+            retry_after = None
+            started = time.perf_counter()
+            token = _cancellation.set(cancellation)
+            try:
+                response = self.session.post(url, json=body, timeout=(CONNECT_TIMEOUT, max(0.001, min(timeout, deadline - time.monotonic()))))
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as error:
+                if cancellation is not None and cancellation.cancelled:
+                    raise CallCancelled("The call was cancelled") from error
+                self._record_attempt(started, type(error).__name__)
+                last_error = error
+            else:
+                self._record_attempt(started, response.status_code)
+                if response.status_code not in RETRYABLE_STATUSES:
+                    response.raise_for_status()
+                    return response.json()
+                retry_after = _retry_after_seconds(response)
+                last_error = None
+            finally:
+                # The connection goes back to the pool; a late cancel must not shut it down.
+                if cancellation is not None:
+                    cancellation.attach(None)
+                _cancellation.reset(token)
+            pause = retry_after if retry_after is not None else random.uniform(0, self.backoff * 2**attempt)
+            if attempt == self.retries or time.monotonic() + pause >= deadline:
+                if last_error is not None:
+                    raise last_error
+                response.raise_for_status()
+            self._count("retries")
+            sleep(pause)
+
+    def _record_attempt(self, started, outcome):
+        with self._lock:
+            self._latencies.append(time.perf_counter() - started)
+            self._stats["attempts"] += 1
+            self._stats[f"status_{outcome}"] += 1
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _add_in_flight(self, count):
+        with self._lock:
+            self.in_flight += count
+
+    def metrics(self):
+        """
+        Call, retry and error counters plus attempt latency percentiles for this process.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            latencies = sorted(self._latencies)
+        percentiles = {f"p{p}": round(latencies[min(len(latencies) - 1, len(latencies) * p // 100)] * 1000, 1) if latencies else None for p in (50, 95, 99)}
+        return {
+            "breaker": {"state": self.breaker.state, "consecutive_failures": self.breaker.failures},
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "calls": {name: stats.get(name, 0) for name in ("successes", "failures", "rejected_open", "rejected_busy", "cancelled", "attempts", "retries")},
+            "statuses": {name.removeprefix("status_"): count for name, count in stats.items() if name.startswith("status_")},
+            "latency_ms": percentiles,
+        }
+
+
+def _retry_after_seconds(response):
+    try:
+        return min(float(response.headers["Retry-After"]), settings.SUMMARIZER_REQUEST_TIMEOUT)
+    except (KeyError, ValueError):
+        return None
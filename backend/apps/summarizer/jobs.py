@@ -0,0 +1,148 @@
+# type: ignore
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .cache import get_summary, summarize_once, summary_cache_key
+from .gemini import GeminiUnavailable
+from .models import SummaryJob
+from .pipeline import summarize_text
+
+logger = logging.getLogger(__name__)
+
+# Claims up to %s runnable jobs. Each user's pending jobs are ranked by age, offset by the
+# jobs that user already has running, so one user's backlog is interleaved with everyone
+# else's instead of being served first. `status = 'PENDING'` is re-checked by the UPDATE,
+# so two workers racing for the same row never both claim it.
+CLAIM_SQL = """
+UPDATE {jobs} SET status = 'RUNNING', attempts = attempts + 1, started_at = now(), updated_at = now()
+WHERE status = 'PENDING' AND id IN (
+    SELECT ranked.id FROM (
+        SELECT pending.id, pending.created_at,
+               row_number() OVER (PARTITION BY pending.user_id ORDER BY pending.created_at)
+               + (SELECT COUNT(*) FROM {jobs} running WHERE running.user_id = pending.user_id AND running.status = 'RUNNING') AS turn
+        FROM {jobs} pending
+        WHERE pending.status = 'PENDING' AND pending.available_at <= now()
+    ) AS ranked
+    ORDER BY ranked.turn, ranked.created_at
+    LIMIT %s
+)
+RETURNING id
+"""
+
+
+class QueueFull(Exception):
+    pass
+
+
+def enqueue_job(user, lecture_text, style, summary_length) -> SummaryJob:
+    """
+    Queues a summary for `user`. A summary already in the cache completes the job
+    straight away. Raises `QueueFull` when the user has too many unfinished jobs.
+    """
+    summary, _ = get_summary(summary_cache_key(lecture_text, style, summary_length))
+    if summary is not None:
+        now = timezone.now()
+        return SummaryJob.objects.create(user=user, style=style, summary_length=summary_length, status=SummaryJob.Status.COMPLETED, summary=summary, started_at=now, finished_at=now)
+
+    unfinished = SummaryJob.objects.filter(user=user, status__in=[SummaryJob.Status.PENDING, SummaryJob.Status.RUNNING]).count()
+    if unfinished >= settings.SUMMARY_JOB_MAX_QUEUED_PER_USER:
+        raise QueueFull(f"At most {settings.SUMMARY_JOB_MAX_QUEUED_PER_USER} summary jobs may be queued at once.")
+    return SummaryJob.objects.create(user=user, lecture_text=lecture_text, style=style, summary_length=summary_length)
+
+
+def claim_jobs(limit) -> list:
+    with connection.cursor() as cursor:
+        cursor.execute(CLAIM_SQL.format(jobs=SummaryJob._meta.db_table), [limit])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def requeue_stale_jobs(stale_after) -> int:
+    """
+    Puts RUNNING jobs back in the queue when their worker stopped mid-way (e.g. after a restart).
+    """
+    stale_before = timezone.now() - timedelta(seconds=stale_after)
+    return SummaryJob.objects.filter(status=SummaryJob.Status.RUNNING, updated_at__lt=stale_before).update(status=SummaryJob.Status.PENDING, updated_at=timezone.now())
+
+
+def run_job(job_id) -> None:
+    job = SummaryJob.objects.get(pk=job_id)
+    key = summary_cache_key(job.lecture_text, job.style, job.summary_length)
+    try:
+        summary, _ = get_summary(key)
+        if summary is None:
+            summary, _ = summarize_once(key, job.style, job.summary_length, lambda: summarize_text(job.lecture_text, job.style, job.summary_length))
+    except GeminiUnavailable as error:
+        if job.attempts < settings.SUMMARY_JOB_MAX_ATTEMPTS:
+            # Gemini is shedding load; try again once the breaker may have closed.
+            retry_at = timezone.now() + timedelta(seconds=error.retry_after or 1)
+            SummaryJob.objects.filter(pk=job_id).update(status=SummaryJob.Status.PENDING, available_at=retry_at, error=str(error), updated_at=timezone.now())
+            return
+        _finish(job_id, SummaryJob.Status.FAILED, error=str(error))
+    except requests.exceptions.RequestException as error:
+        _finish(job_id, SummaryJob.Status.FAILED, error=f"Request failed: {error}")
+    except Exception as error:
+        logger.exception("Summary job %s failed", job_id)
+        _finish(job_id, SummaryJob.Status.FAILED, error=str(error))
+    else:
+        _finish(job_id, SummaryJob.Status.COMPLETED, summary=summary)
+
+
+def _finish(job_id, status, summary=None, error=None):
+    SummaryJob.objects.filter(pk=job_id).update(status=status, summary=summary, error=error, lecture_text="", finished_at=timezone.now(), updated_at=timezone.now())
+
+
+class JobWorker:
+    """
+    Runs queued jobs on a pool of `workers` threads, claiming only as many jobs as
+    there are free threads so the rest stay in the queue for fair scheduling.
+    `claim(limit)` returns the ids of jobs it marked running and `run(id)`
+    processes one; both default to summary jobs.
+    """
+
+    def __init__(self, workers, claim=None, run=None, name="summary-job"):
+        self.workers = workers
+        self.claim = claim or claim_jobs
+        self.run = run or run_job
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self.running = 0
+        self.processed = 0
+        self._lock = threading.Lock()
+
+    @property
+    def idle(self):
+        return self.running == 0
+
+    def fill(self) -> int:
+        """
+        Claims jobs one at a time until every thread is busy or the queue is empty,
+        so each claim sees the jobs the previous one started.
+        """
+        claimed = 0
+        while self.running < self.workers:
+            job_ids = self.claim(1)
+            if not job_ids:
+                break
+            with self._lock:
+                self.running += 1
+            self.executor.submit(self._run, job_ids[0])
+            claimed += 1
+        return claimed
+
+    def _run(self, job_id):
+        try:
+            self.run(job_id)
+        finally:
+            connection.close()
+            with self._lock:
+                self.running -= 1
+                self.processed += 1
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,302 @@
+# type: ignore
+import asyncio
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+from asgiref.sync import ThreadSensitiveContext, sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from rest_framework.test import APIClient
+
+from .serializers import SummarizeSerializer
+from .streaming import summary_events
+
+SUMMARIZER_PATH = "/v1/summarizer/"
+# Seconds between samples of how many requests the target is serving and queueing.
+SAMPLE_INTERVAL = 0.05
+
+
+def load_corpus(path):
+    """
+    Request bodies to replay: the `lecture_text` of each .txt or .md file in a
+    directory, or one JSON body per line of a JSON Lines file.
+    """
+    path = Path(path)
+    if path.is_dir():
+        return [{"lecture_text": file.read_text()} for file in sorted(path.iterdir()) if file.suffix in (".txt", ".md")]
+    with path.open() as lines:
+        return [json.loads(line) for line in lines if line.strip()]
+
+
+class WorkerPoolTarget:
+    """
+    Serves each request through the `summarize_lecture` view on one of `workers`
+    threads, as a threaded WSGI worker does: requests wait for a free thread, and
+    a request whose client gave up still holds its thread until the view returns.
+    """
+
+    def __init__(self, user, workers, engine):
+        self.user = user
+        self.engine = engine
+        self.capacity = workers
+        self.busy = 0
+        self.queued = 0
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="loadtest-worker")
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    async def send(self, body):
+        with self._lock:
+            self.queued += 1
+        future = asyncio.wrap_future(self.executor.submit(self._serve, body, time.perf_counter()))
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        # A timed-out client does not stop the view.
+        return await asyncio.shield(future)
+
+    def _serve(self, body, submitted):
+        with self._lock:
+            self.queued -= 1
+            self.busy += 1
+        started = time.perf_counter()
+        try:
+            if not hasattr(self._local, "client"):
+                self._local.client = APIClient()
+                self._local.client.force_authenticate(self.user)
+            response = self._local.client.post(f"{SUMMARIZER_PATH}?engine={self.engine}", body, format="json")
+            return {"status": response.status_code, "engine": response.get("X-Summary-Engine"), "queue_wait": started - submitted}
+        finally:
+            # As Django does when a request finishes; without CONN_MAX_AGE the connection closes.
+            close_old_connections()
+            with self._lock:
+                self.busy -= 1
+
+    async def drain(self):
+        await asyncio.gather(*self._pending, return_exceptions=True)
+
+    async def aclose(self):
+        await self.drain()
+        self.executor.shutdown()
+
+
+class StreamTarget:
+    """
+    Consumes `summary_events` on the driver's event loop, as the ASGI stream view
+    does, so no thread is held per request; `busy` counts open streams against
+    `SUMMARIZER_MAX_STREAMS`.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.capacity = settings.SUMMARIZER_MAX_STREAMS
+        self.busy = 0
+        self.queued = 0
+
+    async def send(self, body):
+        serializer = SummarizeSerializer(data=body)
+        if not serializer.is_valid():
+            return {"status": 400}
+        outcome = {"status": 200}
+        self.busy += 1
+        try:
+            # Each ASGI request runs its synchronous calls on a thread of its own.
+            async with ThreadSensitiveContext():
+                data = serializer.validated_data
+                async for event in summary_events(data["lecture_text"], data["style"], data["summary_length"], self.engine):
+                    outcome.setdefault("first_byte_at", time.perf_counter())
+                    name, payload = _parse_event(event)
+                    if name == "error":
+                        outcome["status"] = "error event"
+                    elif name == "done":
+                        outcome["engine"] = payload.get("engine")
+                await sync_to_async(close_old_connections)()
+        finally:
+            self.busy -= 1
+        return outcome
+
+    async def drain(self):
+        pass
+
+    async def aclose(self):
+        pass
+
+
+class HttpTarget:
+    """
+    Posts to a running server at `url`, streamed or not. Only the client side is
+    visible, so `busy` counts requests in flight and there is no capacity to
+    compare it with; a saturated server shows up as growing latency.
+    """
+
+    def __init__(self, url, token, engine, stream=False):
+        self.url = url
+        self.params = {"engine": engine, **({"stream": "1"} if stream else {})}
+        self.stream = stream
+        self.capacity = None
+        self.busy = 0
+        self.queued = 0
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        self.client = httpx.AsyncClient(headers=headers, timeout=None, limits=httpx.Limits(max_connections=None, max_keepalive_connections=None))
+
+    async def send(self, body):
+        self.busy += 1
+        try:
+            if not self.stream:
+                response = await self.client.post(self.url, params=self.params, json=body)
+                return {"status": response.status_code, "engine": response.headers.get("X-Summary-Engine")}
+            async with self.client.stream("POST", self.url, params=self.params, json=body) as response:
+                outcome = {"status": response.status_code}
+                async for line in response.aiter_lines():
+                    outcome.setdefault("first_byte_at", time.perf_counter())
+                    if line == "event: error":
+                        outcome["status"] = "error event"
+                    elif line.startswith("data: ") and response.status_code == 200:
+                        outcome["engine"] = json.loads(line.removeprefix("data: ")).get("engine", outcome.get("engine"))
+                return outcome
+        finally:
+            self.busy -= 1
+
+    async def drain(self):
+        pass
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+def _parse_event(event):
+    name, data = event.split("\n")[:2]
+    return name.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+def arrival_offsets(rate, duration, poisson=False):
+    """
+    Seconds from the start of a run at which each request is sent: evenly spaced,
+    or with exponential gaps for Poisson arrivals at the same mean rate.
+    """
+    offsets, at = [], 0.0
+    while at < duration:
+        offsets.append(at)
+        at += random.expovariate(rate) if poisson else 1 / rate
+    return offsets
+
+
+async def run_load(target, corpus, rate, duration, timeout, poisson=False, unique=True, upstream=None):
+    """
+    Replays `corpus` at `rate` requests per second for `duration` seconds and
+    returns a report of the run.
+
+    The loop is open: each request is sent on schedule whether or not earlier
+    ones have finished, and its latency counts from its scheduled time, so a
+    backlog shows up in the numbers instead of slowing the senders down. A
+    request not answered within `timeout` seconds counts as timed out. With
+    `unique`, each lecture gets a distinct last line so every request misses the
+    summary cache. `upstream`, when given, is `(in_flight, capacity)`: a callable
+    counting upstream calls in flight and how many may run at once.
+    """
+    run = uuid.uuid4().hex[:8]
+    samples = {"busy": [], "queued": [], "upstream": []}
+    stopped = asyncio.Event()
+
+    async def sample():
+        while not stopped.is_set():
+            samples["busy"].append(target.busy)
+            samples["queued"].append(target.queued)
+            if upstream is not None:
+                samples["upstream"].append(upstream[0]())
+            try:
+                await asyncio.wait_for(stopped.wait(), SAMPLE_INTERVAL)
+            except TimeoutError:
+                pass
+
+    async def request(index, scheduled):
+        body = dict(corpus[index % len(corpus)])
+        if unique:
+            body["lecture_text"] = f"{body['lecture_text']}\n\nLoad test {run}, request {index}."
+        try:
+            outcome = await asyncio.wait_for(target.send(body), timeout)
+        except TimeoutError:
+            outcome = {"status": "timeout"}
+        except Exception as error:
+            outcome = {"status": type(error).__name__}
+        outcome["latency"] = time.perf_counter() - scheduled
+        if "first_byte_at" in outcome:
+            outcome["first_byte"] = outcome.pop("first_byte_at") - scheduled
+        return outcome
+
+    sampler = asyncio.create_task(sample())
+    started = time.perf_counter()
+    requests = []
+    for index, offset in enumerate(arrival_offsets(rate, duration, poisson)):
+        delay = started + offset - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        requests.append(asyncio.create_task(request(index, started + offset)))
+    outcomes = await asyncio.gather(*requests)
+    elapsed = time.perf_counter() - started
+    await target.drain()
+    stopped.set()
+    await sampler
+    report = load_report(rate, outcomes, elapsed)
+    report["busy"] = _gauge(samples["busy"], target.capacity)
+    report["queued_max"] = max(samples["queued"], default=0)
+    if upstream is not None:
+        report["upstream_busy"] = _gauge(samples["upstream"], upstream[1])
+    return report
+
+
+def load_report(rate, outcomes, elapsed):
+    """
+    Throughput of successful requests, latency percentiles and outcome counts,
+    as plain data that can be saved and compared.
+    """
+    ok = [outcome for outcome in outcomes if outcome["status"] == 200]
+    report = {
+        "rate": rate,
+        "sent": len(outcomes),
+        "ok": len(ok),
+        "throughput": round(len(ok) / elapsed, 2),
+        "statuses": dict(Counter(str(outcome["status"]) for outcome in outcomes)),
+        "engines": dict(Counter(outcome["engine"] for outcome in ok if outcome.get("engine"))),
+        "latency_ms": _percentiles([outcome["latency"] for outcome in ok]),
+        # Little's law: the mean number of requests being served or waiting.
+        "concurrency": round(sum(outcome["latency"] for outcome in outcomes) / elapsed, 1),
+        "latency_growth": _growth([outcome["latency"] for outcome in outcomes]),
+    }
+    for name in ("first_byte", "queue_wait"):
+        values = [outcome[name] for outcome in ok if name in outcome]
+        if values:
+            report[f"{name}_ms"] = _percentiles(values)
+    return report
+
+
+def _gauge(samples, capacity=None):
+    # Mean and peak of a sampled count and, against a capacity, the share of it used and of the time it was all used.
+    samples = samples or [0]
+    gauge = {"mean": round(sum(samples) / len(samples), 1), "max": max(samples)}
+    if capacity:
+        gauge["utilization"] = round(sum(samples) / len(samples) / capacity, 3)
+        gauge["saturated"] = round(sum(count >= capacity for count in samples) / len(samples), 3)
+    return gauge
+
+
+def _growth(latencies):
+    # Median latency of the last fifth of requests over that of the first: well above 1, a backlog was building.
+    fifth = max(1, len(latencies) // 5)
+    first, last = sorted(latencies[:fifth]), sorted(latencies[-fifth:])
+    return round(last[len(last) // 2] / first[len(first) // 2], 2) if latencies else None
+
+
+def _percentiles(seconds):
+    if not seconds:
+        return None
+    seconds = sorted(seconds)
+    percentiles = {f"p{p}": round(seconds[min(len(seconds) - 1, len(seconds) * p // 100)] * 1000, 1) for p in (50, 95, 99)}
+    return {**percentiles, "max": round(seconds[-1] * 1000, 1)}
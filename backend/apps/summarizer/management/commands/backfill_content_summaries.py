@@ -0,0 +1,43 @@
+# type: ignore
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from ...content_summaries import backfill_candidates, mark_pending, run_content_summary
+
+
+def _run(content_id):
+    try:
+        return run_content_summary(content_id)
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = "Generates ahead-of-time summaries for existing lecture contents in batches, on a bounded pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=20, help="Contents queued and summarized per batch.")
+        parser.add_argument("--workers", type=int, default=settings.CONTENT_SUMMARY_WORKERS, help="Contents summarized at once.")
+        parser.add_argument("--limit", type=int, default=None, help="Stop after this many contents.")
+        parser.add_argument("--force", action="store_true", help="Regenerate every lecture, including up-to-date ones.")
+        parser.add_argument("--retry-failed", action="store_true")
+
+    def handle(self, *args, **options):
+        content_ids = list(backfill_candidates(options["force"], options["retry_failed"]).order_by("created_at").values_list("id", flat=True)[: options["limit"]])
+        self.stdout.write(f"{len(content_ids)} lectures to summarize.")
+
+        totals = Counter()
+        batch_size = options["batch_size"]
+        with ThreadPoolExecutor(max_workers=options["workers"], thread_name_prefix="content-backfill") as executor:
+            for start in range(0, len(content_ids), batch_size):
+                end = start + batch_size
+                batch = content_ids[start:end]
+                mark_pending(batch)
+                statuses = Counter(str(status) if status else "ALREADY_RUNNING" for status in executor.map(_run, batch))
+                totals.update(statuses)
+                self.stdout.write(f"{min(end, len(content_ids))}/{len(content_ids)}: {dict(statuses)}")
+        self.stdout.write(f"Done: {dict(totals)}")
@@ -0,0 +1,31 @@
+# type: ignore
+import os
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...extractive import extract_summary, split_sentences
+from ...stub import synthetic_lecture
+
+
+class Command(BaseCommand):
+    help = "Times the in-process extractive summarizer on synthetic lectures of several sizes, pinned to one CPU core."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--words", default="1000,10000,60000", help="Comma-separated lecture sizes in words.")
+        parser.add_argument("--summary-length", type=int, default=200)
+        parser.add_argument("--runs", type=int, default=20)
+
+    def handle(self, *args, **options):
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, {min(os.sched_getaffinity(0))})
+        self.stdout.write(f"{'words':>8} {'sentences':>10} {'summary words':>14} {'p50 (ms)':>9} {'max (ms)':>9}")
+        for word_count in (int(value) for value in options["words"].split(",")):
+            text = synthetic_lecture(word_count)
+            timings = []
+            for _ in range(options["runs"]):
+                started = time.perf_counter()
+                summary = extract_summary(text, options["summary_length"])
+                timings.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(f"{word_count:>8} {len(split_sentences(text)):>10} {len(summary.split()):>14} {statistics.median(timings):>9.1f} {max(timings):>9.1f}")
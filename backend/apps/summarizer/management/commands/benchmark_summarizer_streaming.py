@@ -0,0 +1,68 @@
+# type: ignore
+import asyncio
+import statistics
+import threading
+import time
+import uuid
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from ...extractive import LLM
+from ...prompts import build_prompt
+from ...providers import generate
+from ...streaming import summary_events
+from ...stub import GeminiStub, synthetic_lecture
+
+
+def app_threads():
+    # The stub serves each connection on its own thread; those are not the app's.
+    return sum(1 for thread in threading.enumerate() if "process_request_thread" not in thread.name)
+
+
+class Command(BaseCommand):
+    help = "Compares time to first text for blocking and streamed summaries on a local Gemini stub, and runs many concurrent streams on one event loop."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--words", type=int, default=1500, help="Lecture size in words; the default fits one chunk.")
+        parser.add_argument("--reply-words", type=int, default=200)
+        parser.add_argument("--latency", type=float, default=0.3, help="Stub seconds before the first word.")
+        parser.add_argument("--word-interval", type=float, default=0.01, help="Stub seconds per generated word.")
+        parser.add_argument("--streams", default="1,50,200", help="Comma-separated numbers of concurrent streams.")
+
+    def handle(self, *args, **options):
+        stub = GeminiStub(latency=options["latency"], reply_words=options["reply_words"], word_interval=options["word_interval"])
+        with stub, override_settings(GEMINI_URL=stub.url, SUMMARIZER_REQUEST_TIMEOUT=60):
+            text = synthetic_lecture(options["words"])
+            started = time.perf_counter()
+            generate(build_prompt(text, "formal", 200))
+            self.stdout.write(f"blocking: full summary after {time.perf_counter() - started:.2f}s\n")
+
+            self.stdout.write(f"{'streams':>8} {'first p50 (s)':>14} {'first p95 (s)':>14} {'total p50 (s)':>14} {'threads':>8}")
+            for count in (int(value) for value in options["streams"].split(",")):
+                self.measure(text, count)
+
+    def measure(self, text, count):
+        baseline = app_threads()
+        peak = [baseline]
+
+        async def one_stream(index):
+            # A unique suffix keeps every stream a cache miss.
+            lecture = f"{text}\n\nRun {uuid.uuid4()} stream {index}."
+            started = time.perf_counter()
+            first = None
+            async for event in summary_events(lecture, "formal", 200, LLM):
+                if first is None and event.startswith("event: delta"):
+                    first = time.perf_counter() - started
+                peak[0] = max(peak[0], app_threads())
+            return first, time.perf_counter() - started
+
+        async def run():
+            return await asyncio.gather(*(one_stream(index) for index in range(count)))
+
+        results = async_to_sync(run)()
+        firsts = sorted(first for first, _ in results)
+        totals = sorted(total for _, total in results)
+        p95 = firsts[min(len(firsts) - 1, len(firsts) * 95 // 100)]
+        self.stdout.write(f"{count:>8} {statistics.median(firsts):>14.2f} {p95:>14.2f} {statistics.median(totals):>14.2f} {peak[0] - baseline:>+8}")
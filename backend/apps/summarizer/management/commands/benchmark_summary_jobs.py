@@ -0,0 +1,56 @@
+# type: ignore
+import statistics
+import time
+import uuid
+
+from apps.users.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from ...jobs import JobWorker
+from ...models import SummaryJob
+from ...stub import GeminiStub
+
+
+class Command(BaseCommand):
+    help = "Queues a large backlog from one user and a few jobs from others, runs them on the job worker against a local Gemini stub, and reports how long each user waited."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--heavy-jobs", type=int, default=40, help="Jobs queued first by the heavy user.")
+        parser.add_argument("--light-users", type=int, default=4)
+        parser.add_argument("--light-jobs", type=int, default=2, help="Jobs per light user, queued after the backlog.")
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--latency", type=float, default=0.3)
+
+    def handle(self, *args, **options):
+        users = list(User.objects.filter(is_active=True).order_by("id")[: options["light_users"] + 1])
+        if len(users) < options["light_users"] + 1:
+            raise CommandError("Not enough active users.")
+        heavy, light = users[0], users[1:]
+        run = uuid.uuid4()
+
+        jobs = [SummaryJob(user=heavy, lecture_text=f"Benchmark {run} heavy {index}.", style="formal", summary_length=100) for index in range(options["heavy_jobs"])]
+        jobs += [SummaryJob(user=user, lecture_text=f"Benchmark {run} {user.id} {index}.", style="formal", summary_length=100) for user in light for index in range(options["light_jobs"])]
+        SummaryJob.objects.bulk_create(jobs)
+        ids = [job.id for job in jobs]
+
+        with GeminiStub(latency=options["latency"]) as stub, override_settings(GEMINI_URL=stub.url):
+            worker = JobWorker(options["workers"])
+            started = time.perf_counter()
+            while worker.fill() or not worker.idle:
+                time.sleep(0.01)
+            elapsed = time.perf_counter() - started
+            worker.shutdown()
+
+        finished = SummaryJob.objects.filter(id__in=ids)
+        waits = {"heavy": [], "light": []}
+        for job in finished:
+            waits["heavy" if job.user_id == heavy.id else "light"].append((job.finished_at - job.created_at).total_seconds())
+        rounds = len(ids) / options["workers"]
+        self.stdout.write(f'{len(ids)} jobs on {options["workers"]} workers in {elapsed:.2f}s ({rounds:.0f} rounds of {options["latency"]}s), {stub.calls} upstream calls')
+        self.stdout.write(f"{'':>6} {'jobs':>5} {'wait p50 (s)':>13} {'wait max (s)':>13}")
+        for label, values in waits.items():
+            self.stdout.write(f"{label:>6} {len(values):>5} {statistics.median(values):>13.2f} {max(values):>13.2f}")
+        fifo = (options["heavy_jobs"] / options["workers"] + 1) * options["latency"]
+        self.stdout.write(f"First-come-first-served would make light users wait at least {fifo:.2f}s.")
+        finished.delete()
@@ -0,0 +1,15 @@
+# type: ignore
+from django.core.management.base import BaseCommand
+
+from ...cache import clear_cache
+
+
+class Command(BaseCommand):
+    help = "Deletes cached lecture summaries, e.g. after the summary prompt changes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--stale", action="store_true", help="Only delete summaries generated with an older prompt version.")
+
+    def handle(self, *args, **options):
+        deleted = clear_cache(stale_only=options["stale"])
+        self.stdout.write(f"Deleted {deleted} cached summaries.")
@@ -0,0 +1,173 @@
+# type: ignore
+import contextlib
+import json
+
+from apps.users.models import User
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from ...extractive import ENGINES, LLM
+from ...loadtest import (
+    HttpTarget,
+    StreamTarget,
+    WorkerPoolTarget,
+    load_corpus,
+    run_load,
+)
+from ...providers import gateway
+from ...stub import GeminiStub, synthetic_lecture
+
+# A rate is sustained when this share of requests succeeds in time and latency does not
+# grow more than this factor from the first fifth of the run to the last.
+SUSTAINED_SUCCESS = 0.99
+SUSTAINED_GROWTH = 1.5
+
+
+class Command(BaseCommand):
+    help = (
+        "Replays a corpus of lectures against the summarizer at increasing request rates, on an open loop, and reports "
+        "throughput, latency percentiles and worker saturation for each rate. Runs in-process against a local Gemini stub "
+        "unless --url points at a running server."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rates", default="2,4,8,16", help="Comma-separated request rates per second, run in turn.")
+        parser.add_argument("--duration", type=float, default=15, help="Seconds of load at each rate.")
+        parser.add_argument("--workers", type=int, default=8, help="Worker threads serving blocking requests in-process.")
+        parser.add_argument("--timeout", type=float, default=10, help="Seconds a client waits before counting a request as timed out.")
+        parser.add_argument("--stream", action="store_true", help="Request streamed summaries.")
+        parser.add_argument("--engine", choices=ENGINES, default=LLM)
+        parser.add_argument("--poisson", action="store_true", help="Send with exponential gaps instead of evenly spaced.")
+        parser.add_argument("--corpus", help="Directory of .txt/.md lectures or a JSON Lines file of request bodies. Default: synthetic lectures.")
+        parser.add_argument("--words", default="300,1500,6000", help="Comma-separated sizes in words of the synthetic lectures.")
+        parser.add_argument("--repeat", action="store_true", help="Replay lectures verbatim, so repeats can hit the summary cache.")
+        parser.add_argument("--url", help="Load a running server instead, e.g. http://localhost:8000/v1/summarizer/. No stub is started.")
+        parser.add_argument("--token", help="Access token sent to --url.")
+        parser.add_argument("--latency", type=float, default=0.5, help="Stub median seconds before the first word.")
+        parser.add_argument("--latency-sigma", type=float, default=0.3, help="Stub log-normal spread of that latency.")
+        parser.add_argument("--latency-per-kchar", type=float, default=0.02, help="Stub extra seconds per 1000 prompt characters.")
+        parser.add_argument("--reply-words", type=int, default=120)
+        parser.add_argument("--word-interval", type=float, default=0.005, help="Stub seconds per generated word.")
+        parser.add_argument("--error-rate", type=float, default=0.0, help="Share of stub replies answered with 503.")
+        parser.add_argument("--save", help="Write the reports as JSON to this file.")
+        parser.add_argument("--baseline", help="Compare with reports saved earlier by --save.")
+
+    def handle(self, *args, **options):
+        corpus = load_corpus(options["corpus"]) if options["corpus"] else [{"lecture_text": synthetic_lecture(int(words), seed=index)} for index, words in enumerate(options["words"].split(","))]
+        if not corpus:
+            raise CommandError("The corpus is empty.")
+        rates = [float(rate) for rate in options["rates"].split(",")]
+
+        stub = None
+        if options["url"]:
+            target = HttpTarget(options["url"], options["token"], options["engine"], options["stream"])
+        elif options["stream"]:
+            target = StreamTarget(options["engine"])
+        else:
+            user = User.objects.filter(is_active=True).first()
+            if user is None:
+                raise CommandError("Needs at least one active user.")
+            target = WorkerPoolTarget(user, options["workers"], options["engine"])
+        if not options["url"]:
+            stub = GeminiStub(
+                latency=options["latency"],
+                latency_sigma=options["latency_sigma"],
+                latency_per_kchar=options["latency_per_kchar"],
+                reply_words=options["reply_words"],
+                word_interval=options["word_interval"],
+                error_rate=options["error_rate"],
+            )
+
+        with stub or contextlib.nullcontext(), override_settings(GEMINI_URL=stub.url) if stub else contextlib.nullcontext():
+            self.stdout.write(self.describe(target, corpus, options))
+            self.stdout.write(
+                f"{'rate':>6} {'sent':>5} {'ok':>5} {'req/s':>6} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'first p50':>10} {'queue p95':>10} "
+                f"{'busy':>9} {'saturated':>10} {'upstream':>9} {'calls':>6} {'growth':>7} failures"
+            )
+            reports = async_to_sync(self.sweep)(target, corpus, rates, options, stub)
+
+        sustained = [report["rate"] for report in reports if self.sustains(report)]
+        self.stdout.write(f"Highest rate sustained: {f'{max(sustained):g} req/s' if sustained else 'none of the rates tried'}")
+        if options["baseline"]:
+            self.compare(reports, options["baseline"])
+        if options["save"]:
+            with open(options["save"], "w") as file:
+                json.dump({"options": {name: options[name] for name in ("rates", "duration", "workers", "timeout", "stream", "engine", "url")}, "reports": reports}, file, indent=2)
+            self.stdout.write(f"Saved to {options['save']}")
+
+    def describe(self, target, corpus, options):
+        words = sorted(len(body["lecture_text"].split()) for body in corpus)
+        lectures = f"{len(corpus)} lecture(s) of {words[0]}-{words[-1]} words"
+        if options["url"]:
+            return f"{lectures} against {options['url']}"
+        served = "streams on one event loop" if options["stream"] else f"{options['workers']} worker threads"
+        return (
+            f"{lectures}, {served}, {_upstream_slots()} upstream slots; stub median {options['latency']}s (sigma {options['latency_sigma']}) "
+            f"+{options['latency_per_kchar']}s/kchar, {options['error_rate']:.0%} errors"
+        )
+
+    async def sweep(self, target, corpus, rates, options, stub):
+        reports = []
+        try:
+            for rate in rates:
+                if stub is None:
+                    report = await run_load(target, corpus, rate, options["duration"], options["timeout"], options["poisson"], not options["repeat"])
+                else:
+                    stub.reset()
+                    before = _upstream_counts()
+                    report = await run_load(target, corpus, rate, options["duration"], options["timeout"], options["poisson"], not options["repeat"], (_upstream_in_flight, _upstream_slots()))
+                    after = _upstream_counts()
+                    report["upstream"] = {"calls": stub.calls, **{name: after[name] - before[name] for name in after}}
+                self.stdout.write(self.row(report))
+                reports.append(report)
+        finally:
+            await target.aclose()
+        return reports
+
+    def row(self, report):
+        latency = report["latency_ms"] or {}
+        first = (report.get("first_byte_ms") or {}).get("p50", "-")
+        queue = (report.get("queue_wait_ms") or {}).get("p95", "-")
+        busy = f"{report['busy']['mean']}/{report['busy']['max']}"
+        saturated = f"{report['busy']['saturated']:.0%}" if "saturated" in report["busy"] else "-"
+        upstream = f"{report['upstream_busy']['mean']}/{report['upstream_busy']['max']}" if "upstream_busy" in report else "-"
+        calls = report.get("upstream", {}).get("calls", "-")
+        failures = [f"{status}: {count}" for status, count in report["statuses"].items() if status != "200"]
+        if report.get("upstream", {}).get("rejected_busy"):
+            failures.append(f"upstream slot waits timed out: {report['upstream']['rejected_busy']}")
+        return (
+            f"{report['rate']:>6g} {report['sent']:>5} {report['ok']:>5} {report['throughput']:>6.1f} {latency.get('p50', '-'):>9} {latency.get('p95', '-'):>9} {latency.get('p99', '-'):>9} "
+            f"{first:>10} {queue:>10} {busy:>9} {saturated:>10} {upstream:>9} {calls:>6} {report['latency_growth']:>7} {', '.join(failures) or '-'}"
+        )
+
+    def sustains(self, report):
+        return report["ok"] >= SUSTAINED_SUCCESS * report["sent"] and report["latency_growth"] <= SUSTAINED_GROWTH
+
+    def compare(self, reports, path):
+        with open(path) as file:
+            baseline = {report["rate"]: report for report in json.load(file)["reports"]}
+        self.stdout.write(f"Against {path}:")
+        self.stdout.write(f"{'rate':>6} {'req/s':>14} {'p50 (ms)':>18} {'p95 (ms)':>18} {'p99 (ms)':>18}")
+        for report in reports:
+            before = baseline.get(report["rate"])
+            if before is None:
+                continue
+            cells = [f"{before['throughput']:g} -> {report['throughput']:g}"]
+            for name in ("p50", "p95", "p99"):
+                old, new = ((item["latency_ms"] or {}).get(name) for item in (before, report))
+                cells.append(f"{old} -> {new}" if old is None or new is None else f"{old:g} -> {new:g} ({(new - old) / old:+.0%})")
+            self.stdout.write(f"{report['rate']:>6g} {cells[0]:>14} {cells[1]:>18} {cells[2]:>18} {cells[3]:>18}")
+
+
+def _upstream_slots():
+    return sum(provider.client.max_concurrency for provider in gateway.providers if hasattr(provider, "client"))
+
+
+def _upstream_in_flight():
+    return sum(provider.client.in_flight for provider in gateway.providers if hasattr(provider, "client"))
+
+
+def _upstream_counts():
+    calls = [provider.metrics().get("calls", {}) for provider in gateway.providers]
+    return {name: sum(provider.get(name, 0) for provider in calls) for name in ("rejected_busy", "rejected_open", "retries")}
@@ -0,0 +1,46 @@
+# type: ignore
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...content_summaries import (
+    claim_content_summaries,
+    process_content_summary,
+    requeue_stale_content_summaries,
+)
+from ...jobs import JobWorker
+
+
+class Command(BaseCommand):
+    help = "Generates queued ahead-of-time lecture summaries on a bounded thread pool. Runs until SIGTERM/SIGINT unless --once is given."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Process every pending summary, then exit.")
+        parser.add_argument("--workers", type=int, default=settings.CONTENT_SUMMARY_WORKERS, help="Lectures summarized at once.")
+        parser.add_argument("--poll", type=float, default=settings.SUMMARY_JOB_POLL_INTERVAL)
+        parser.add_argument("--stale-after", type=int, default=settings.SUMMARY_JOB_STALE_AFTER, help="Seconds without progress before a RUNNING summary is requeued.")
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale_content_summaries(options["stale_after"])
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale summaries.")
+
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        worker = JobWorker(options["workers"], claim_content_summaries, process_content_summary, "content-summary")
+        while not self.stopping:
+            claimed = worker.fill()
+            if options["once"] and not claimed and worker.idle:
+                break
+            time.sleep(options["poll"])
+
+        # Graceful shutdown: summaries already claimed are finished, the rest stay queued.
+        worker.shutdown()
+        self.stdout.write(f"Stopped after {worker.processed} summaries.")
+
+    def stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,41 @@
+# type: ignore
+from django.core.management.base import BaseCommand
+
+from ...stub import GeminiStub
+
+
+class Command(BaseCommand):
+    help = "Serves local fake Gemini generateContent and streamGenerateContent endpoints. Point GEMINI_URL at the printed URL."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8790)
+        parser.add_argument("--latency", type=float, default=0.2, help="Base seconds per reply.")
+        parser.add_argument("--latency-sigma", type=float, default=0.0, help="Log-normal spread of the base latency around its median.")
+        parser.add_argument("--tail-rate", type=float, default=0.0, help="Share of replies that take --tail-latency seconds instead.")
+        parser.add_argument("--tail-latency", type=float, default=0.0)
+        parser.add_argument("--latency-per-kchar", type=float, default=0.0, help="Extra seconds per 1000 prompt characters.")
+        parser.add_argument("--word-interval", type=float, default=0.0, help="Seconds to generate each reply word.")
+        parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with --error-status.")
+        parser.add_argument("--error-status", type=int, default=503)
+
+    def handle(self, *args, **options):
+        stub = GeminiStub(
+            options["host"],
+            options["port"],
+            latency=options["latency"],
+            latency_per_kchar=options["latency_per_kchar"],
+            word_interval=options["word_interval"],
+            error_rate=options["error_rate"],
+            error_status=options["error_status"],
+            latency_sigma=options["latency_sigma"],
+            tail_rate=options["tail_rate"],
+            tail_latency=options["tail_latency"],
+        )
+        self.stdout.write(f"Gemini stub listening on {stub.url}")
+        try:
+            stub.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stub.server.server_close()
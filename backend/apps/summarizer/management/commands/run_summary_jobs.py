@@ -0,0 +1,41 @@
+# type: ignore
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...jobs import JobWorker, requeue_stale_jobs
+
+
+class Command(BaseCommand):
+    help = "Processes queued summary jobs on a bounded thread pool, interleaving users fairly. Runs until SIGTERM/SIGINT unless --once is given."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Process every runnable job, then exit.")
+        parser.add_argument("--workers", type=int, default=settings.SUMMARY_JOB_WORKERS, help="Jobs processed at once.")
+        parser.add_argument("--poll", type=float, default=settings.SUMMARY_JOB_POLL_INTERVAL)
+        parser.add_argument("--stale-after", type=int, default=settings.SUMMARY_JOB_STALE_AFTER, help="Seconds without progress before a RUNNING job is requeued.")
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale_jobs(options["stale_after"])
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale jobs.")
+
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        worker = JobWorker(options["workers"])
+        while not self.stopping:
+            claimed = worker.fill()
+            if options["once"] and not claimed and worker.idle:
+                break
+            time.sleep(options["poll"])
+
+        # Graceful shutdown: jobs already claimed are finished, the rest stay queued.
+        worker.shutdown()
+        self.stdout.write(f"Stopped after {worker.processed} jobs.")
+
+    def stop(self, signum, frame):
+        self.stopping = True
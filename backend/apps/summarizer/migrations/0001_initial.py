@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="CachedSummary",
+            fields=[
+                (
+                    "key",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("style", models.CharField(max_length=20)),
+                ("summary_length", models.PositiveIntegerField()),
+                ("prompt_version", models.PositiveIntegerField()),
+                ("summary", models.TextField()),
+                ("hits", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("last_used_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Cached Summary",
+                "verbose_name_plural": "Cached Summaries",
+                "db_table": "summary_cache",
+                "indexes": [
+                    models.Index(fields=["last_used_at"], name="summary_cac_last_us_071cb4_idx"),
+                    models.Index(fields=["prompt_version"], name="summary_cac_prompt__280b04_idx"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contents", "0008_partition_download_logs"),
+        ("summarizer", "0002_summary_jobs"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContentSummary",
+            fields=[
+                (
+                    "content",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="summary",
+                        serialize=False,
+                        to="contents.content",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "Pending"),
+                            ("RUNNING", "Running"),
+                            ("COMPLETED", "Completed"),
+                            ("FAILED", "Failed"),
+                            ("SKIPPED", "Skipped"),
+                        ],
+                        default="PENDING",
+                        max_length=20,
+                    ),
+                ),
+                ("summaries", models.JSONField(blank=True, default=dict)),
+                ("prompt_version", models.PositiveIntegerField(blank=True, null=True)),
+                ("text_chars", models.PositiveIntegerField(blank=True, null=True)),
+                ("error", models.TextField(blank=True, null=True)),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Content Summary",
+                "verbose_name_plural": "Content Summaries",
+                "db_table": "content_summaries",
+                "indexes": [models.Index(fields=["status"], name="content_sum_status_a7d63f_idx")],
+            },
+        ),
+    ]
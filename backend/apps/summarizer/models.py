@@ -0,0 +1,119 @@
+import uuid
+
+from apps.contents.models import Content
+from apps.users.models import User
+from django.db import models
+from django.utils import timezone
+
+
+class CachedSummary(models.Model):
+    """
+    A generated summary, keyed by a hash of the normalized lecture text, style,
+    length and prompt version. The lecture text itself is not stored.
+    """
+
+    key = models.CharField(max_length=64, primary_key=True)
+    style = models.CharField(max_length=20)
+    summary_length = models.PositiveIntegerField()
+    prompt_version = models.PositiveIntegerField()
+    summary = models.TextField()
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "summary_cache"
+        verbose_name = "Cached Summary"
+        verbose_name_plural = "Cached Summaries"
+        indexes = [
+            models.Index(fields=["last_used_at"]),
+            models.Index(fields=["prompt_version"]),
+        ]
+
+    def __str__(self):
+        return f"{self.key[:12]} ({self.style}, {self.summary_length} words)"
+
+    def __repr__(self):
+        return f"<CachedSummary {self.key[:12]} | v{self.prompt_version} | {self.hits} hits>"
+
+
+class SummaryJob(models.Model):
+    """
+    A summary requested through the job API and produced by `run_summary_jobs`.
+    The lecture text is kept only until the job finishes.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        RUNNING = "RUNNING", "Running"
+        COMPLETED = "COMPLETED", "Completed"
+        FAILED = "FAILED", "Failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="summary_jobs")
+    lecture_text = models.TextField(blank=True)
+    style = models.CharField(max_length=20)
+    summary_length = models.PositiveIntegerField()
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    summary = models.TextField(null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "summary_jobs"
+        verbose_name = "Summary Job"
+        verbose_name_plural = "Summary Jobs"
+        indexes = [
+            models.Index(fields=["status", "available_at"]),
+            models.Index(fields=["user", "status"]),
+        ]
+
+    def __str__(self):
+        return f"{self.id} ({self.status})"
+
+    def __repr__(self):
+        return f"<SummaryJob {self.id} | {self.status} | {self.attempts} attempts>"
+
+
+class ContentSummary(models.Model):
+    """
+    Summaries generated ahead of time for a lecture `Content`, one row per content.
+    `summaries` maps style to length to text, e.g. `{"formal": {"100": "..."}}`.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        RUNNING = "RUNNING", "Running"
+        COMPLETED = "COMPLETED", "Completed"
+        FAILED = "FAILED", "Failed"
+        SKIPPED = "SKIPPED", "Skipped"
+
+    content = models.OneToOneField(Content, on_delete=models.CASCADE, primary_key=True, related_name="summary")
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    summaries = models.JSONField(default=dict, blank=True)  # type: ignore
+    prompt_version = models.PositiveIntegerField(null=True, blank=True)
+    text_chars = models.PositiveIntegerField(null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "content_summaries"
+        verbose_name = "Content Summary"
+        verbose_name_plural = "Content Summaries"
+        indexes = [
+            models.Index(fields=["status"]),
+        ]
+
+    def __str__(self):
+        return f"{self.content_id} ({self.status})"
+
+    def __repr__(self):
+        return f"<ContentSummary {self.content_id} | {self.status} | v{self.prompt_version}>"
@@ -0,0 +1,8 @@
+# type: ignore
+from apps.users.models import User
+from rest_framework.permissions import BasePermission
+
+
+class IsAdmin(BasePermission):
+    def has_permission(self, request, view):
+        return request.user.role == User.Role.ADMIN
@@ -0,0 +1,71 @@
+# type: ignore
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from .chunking import estimate_tokens, split_text
+from .prompts import build_chunk_prompt, build_prompt, build_reduce_prompt
+from .providers import generate
+
+# Fewest words asked of each chunk summary, so short chunks still keep their key points.
+MIN_CHUNK_SUMMARY_WORDS = 60
+
+_executor = ThreadPoolExecutor(max_workers=settings.SUMMARIZER_MAP_WORKERS, thread_name_prefix="summarizer-map")
+
+
+def _map(prompts):
+    return list(_executor.map(generate, prompts))
+
+
+def _partials(chunks, style, summary_length):
+    """
+    Summarizes each chunk concurrently, merging the partial summaries in further
+    rounds while together they are still too long for one prompt.
+    """
+    budget = settings.SUMMARIZER_CHUNK_TOKENS
+    chunk_words = max(MIN_CHUNK_SUMMARY_WORDS, 2 * summary_length // len(chunks))
+    partials = _map(build_chunk_prompt(chunk, style, chunk_words, index, len(chunks)) for index, chunk in enumerate(chunks, start=1))
+
+    while estimate_tokens("\n\n".join(partials)) > budget:
+        groups = split_text("\n\n".join(partials), budget)
+        if len(groups) >= len(partials):
+            break
+        partials = _map(build_reduce_prompt(group.split("\n\n"), style, chunk_words) for group in groups)
+    return partials
+
+
+def prepare_prompt(lecture_text, style, summary_length):
+    """
+    Returns the prompt whose answer is the summary of `lecture_text`.
+
+    Text that fits `SUMMARIZER_CHUNK_TOKENS` is summarized by a single prompt. Longer
+    text is split on section and paragraph boundaries, the chunks are summarized
+    concurrently, and the returned reduce prompt merges the partial summaries into
+    one of `summary_length` words.
+    """
+    chunks = split_text(lecture_text, settings.SUMMARIZER_CHUNK_TOKENS)
+    if len(chunks) <= 1:
+        return build_prompt(lecture_text, style, summary_length)
+    return build_reduce_prompt(_partials(chunks, style, summary_length), style, summary_length)
+
+
+def summarize_text(lecture_text, style, summary_length):
+    """
+    Summarizes lecture text of any length; see `prepare_prompt`.
+    """
+    return generate(prepare_prompt(lecture_text, style, summary_length))
+
+
+def summarize_variants(lecture_text, variants):
+    """
+    Summarizes one lecture in several `(style, summary_length)` variants and returns
+    them keyed by variant. A long lecture is mapped once, formally and for the longest
+    length, and every variant is reduced from the same partial summaries.
+    """
+    chunks = split_text(lecture_text, settings.SUMMARIZER_CHUNK_TOKENS)
+    if len(chunks) <= 1:
+        prompts = [build_prompt(lecture_text, style, summary_length) for style, summary_length in variants]
+    else:
+        partials = _partials(chunks, "formal", max(summary_length for _, summary_length in variants))
+        prompts = [build_reduce_prompt(partials, style, summary_length) for style, summary_length in variants]
+    return dict(zip(variants, _map(prompts)))
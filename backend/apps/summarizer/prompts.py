@@ -0,0 +1,71 @@
+# type: ignore
+
+# Bump whenever the prompt below changes so cached summaries from the old prompt are no longer served.
+PROMPT_VERSION = 2
+
+FORMATTING_INSTRUCTIONS = {
+    "formal": ("Write in a formal, objective, and informative tone.\n" "Use plain text only.\n" "Separate paragraphs with real line breaks.\n" "Keep sentences clear, concise, and precise.\n"),
+    "creative": (
+        "Write in a creative, engaging, and vivid tone.\n" "Use plain text only.\n" "Separate paragraphs with real line breaks.\n" "Make the text natural, storytelling-like, and expressive.\n"
+    ),
+}
+
+
+def build_prompt(lecture_text, style, summary_length):
+    return f"""
+You are an expert educator and summarizer.
+Read the lecture text carefully and produce a high-quality summary in a {style} style.
+
+Your summary must:
+1. Capture main topics, subtopics, and key points
+2. Highlight important concepts and examples
+3. Be clear, accurate, and structured
+4. Use plain text only — no bold, no bullets, no Markdown
+5. Separate paragraphs with real line breaks (Enter key)
+6. Be under {summary_length} words
+6. Use {FORMATTING_INSTRUCTIONS[style]}
+
+Do not add phrases like "Here's a summary" or "In conclusion".
+Return only the summary text.
+
+Lecture text:
+{lecture_text}
+"""
+
+
+def build_chunk_prompt(chunk, style, summary_length, part, parts):
+    return f"""
+You are an expert educator and summarizer.
+The text below is part {part} of {parts} of a longer lecture.
+Summarize this part in a {style} style, in under {summary_length} words.
+Keep every main topic, key concept, definition and example it contains, in order.
+Use plain text only — no bold, no bullets, no Markdown.
+Return only the summary text.
+
+Lecture text (part {part} of {parts}):
+{chunk}
+"""
+
+
+def build_reduce_prompt(partials, style, summary_length):
+    sections = "\n\n".join(partials)
+    return f"""
+You are an expert educator and summarizer.
+The notes below summarize consecutive parts of one lecture, in order.
+Merge them into a single high-quality summary of the whole lecture in a {style} style.
+
+Your summary must:
+1. Capture main topics, subtopics, and key points across all parts
+2. Highlight important concepts and examples
+3. Be clear, accurate, and structured, without repeating points
+4. Use plain text only — no bold, no bullets, no Markdown
+5. Separate paragraphs with real line breaks (Enter key)
+6. Be under {summary_length} words
+7. Use {FORMATTING_INSTRUCTIONS[style]}
+
+Do not add phrases like "Here's a summary" or "In conclusion".
+Return only the summary text.
+
+Notes:
+{sections}
+"""
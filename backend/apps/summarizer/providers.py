@@ -0,0 +1,300 @@
+# type: ignore
+import math
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .gemini import RETRYABLE_STATUSES, CallCancelled, Cancellation, GeminiClient
+
+# Upper bounds in seconds of the latency buckets, 15% apart from 10 ms to about 44 s.
+LATENCY_BUCKETS = tuple(round(0.01 * 1.15**index, 4) for index in range(61))
+# Most hedges banked for a burst; each call adds `SUMMARIZER_HEDGE_BUDGET` of one.
+HEDGE_BURST = 10
+
+
+class LatencyHistogram:
+    """
+    Latencies of a provider's last `window` calls made within `max_age` seconds,
+    counted in fixed log-spaced buckets so a percentile is one pass over the
+    buckets. Percentiles report the upper bound of their bucket, erring towards
+    waiting longer before hedging.
+    """
+
+    def __init__(self, window, max_age):
+        self.window = window
+        self.max_age = max_age
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self._samples = deque()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            self._expire()
+            return len(self._samples)
+
+    def record(self, seconds):
+        bucket = bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            self._samples.append((time.monotonic(), bucket))
+            self.counts[bucket] += 1
+            if len(self._samples) > self.window:
+                self.counts[self._samples.popleft()[1]] -= 1
+
+    def _expire(self):
+        oldest = time.monotonic() - self.max_age
+        while self._samples and self._samples[0][0] < oldest:
+            self.counts[self._samples.popleft()[1]] -= 1
+
+    def percentile(self, p):
+        with self._lock:
+            self._expire()
+            total = len(self._samples)
+            counts = list(self.counts)
+        if not total:
+            return None
+        rank = math.ceil(total * p / 100)
+        seen = 0
+        for bucket, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                return LATENCY_BUCKETS[bucket] if bucket < len(LATENCY_BUCKETS) else math.inf
+
+    def snapshot(self):
+        with self._lock:
+            self._expire()
+            counts = list(self.counts)
+        percentiles = {f"p{p}": _ms(self.percentile(p)) for p in (50, 95, 99)}
+        buckets = {("+Inf" if bucket == len(LATENCY_BUCKETS) else f"{LATENCY_BUCKETS[bucket] * 1000:g}"): count for bucket, count in enumerate(counts) if count}
+        return {"samples": len(self), **percentiles, "buckets_ms": buckets}
+
+
+def _ms(seconds):
+    if seconds is None:
+        return None
+    return "+Inf" if seconds == math.inf else round(seconds * 1000, 1)
+
+
+class Provider:
+    """
+    A summarizer backend. Subclasses implement `generate` and expose a circuit
+    `breaker`; the gateway keeps each provider's latency histogram and decides
+    which provider answers a prompt.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.latency = LatencyHistogram(settings.SUMMARIZER_LATENCY_WINDOW, settings.SUMMARIZER_LATENCY_MAX_AGE)
+
+    def generate(self, prompt, timeout=None, cancellation=None):
+        raise NotImplementedError
+
+    def stream_url(self):
+        """
+        URL of a Gemini-compatible `streamGenerateContent` endpoint, or None when the backend cannot stream.
+        """
+        return None
+
+    @property
+    def available(self):
+        return self.breaker.available()
+
+    def rolling_p95(self):
+        """
+        The p95 of recent calls, or None until `SUMMARIZER_LATENCY_MIN_SAMPLES` calls were made.
+        """
+        if len(self.latency) < settings.SUMMARIZER_LATENCY_MIN_SAMPLES:
+            return None
+        return self.latency.percentile(95)
+
+    def metrics(self):
+        return {"name": self.name, "available": self.available, "latency": self.latency.snapshot()}
+
+
+class GeminiProvider(Provider):
+    """
+    A Gemini-compatible `generateContent` endpoint called through a pooled `GeminiClient`.
+    Without a `url` or `api_key`, `GEMINI_URL` and `GEMINI_API_KEY` are used.
+    """
+
+    def __init__(self, name, url=None, api_key=None, **options):
+        super().__init__(name)
+        self.client = GeminiClient(url, api_key, **options)
+
+    @property
+    def breaker(self):
+        return self.client.breaker
+
+    @property
+    def api_key(self):
+        return self.client.api_key or settings.GEMINI_API_KEY
+
+    def generate(self, prompt, timeout=None, cancellation=None):
+        return self.client.generate(prompt, timeout, cancellation)
+
+    def stream_url(self):
+        return (self.client.url or settings.GEMINI_URL).replace(":generateContent", ":streamGenerateContent")
+
+    def metrics(self):
+        return {**super().metrics(), **self.client.metrics()}
+
+
+class Gateway:
+    """
+    Sends each prompt to the available provider with the lowest rolling p95 latency.
+
+    When the call outlasts that p95 (`SUMMARIZER_HEDGE_DELAY` until enough calls
+    were seen), the same prompt goes to the next provider as well; the first
+    answer wins and the other call is cancelled. Hedges are rationed to
+    `SUMMARIZER_HEDGE_BUDGET` per call, so a provider slowing down across the
+    board is not sent twice the load. A call that fails with an upstream error
+    fails over to the next provider straight away.
+
+    A `SUMMARIZER_EXPLORE_RATE` share of calls goes to another provider first,
+    still hedged by the best one, so every histogram stays current and a
+    provider that recovers wins its traffic back.
+    """
+
+    def __init__(self, providers, hedge_budget=None, explore_rate=None):
+        self.providers = providers
+        self.hedge_budget = settings.SUMMARIZER_HEDGE_BUDGET if hedge_budget is None else hedge_budget
+        self.explore_rate = settings.SUMMARIZER_EXPLORE_RATE if explore_rate is None else explore_rate
+        self.executor = ThreadPoolExecutor(max_workers=2 * settings.SUMMARIZER_MAX_CONCURRENCY * len(providers), thread_name_prefix="summarizer-gateway")
+        self._hedge_tokens = float(HEDGE_BURST)
+        self._lock = threading.Lock()
+        self._stats = Counter()
+
+    @classmethod
+    def from_settings(cls):
+        providers = []
+        for config in settings.SUMMARIZER_PROVIDERS:
+            options = dict(config)
+            backend = import_string(options.pop("backend"))
+            providers.append(backend(**options))
+        return cls(providers)
+
+    def ranked(self):
+        """
+        Available providers, those with the lowest rolling p95 first; providers
+        without enough samples keep their configured order after them.
+        """
+
+        def key(provider):
+            p95 = provider.rolling_p95()
+            return (p95 is None, p95 or 0)
+
+        return sorted((provider for provider in self.providers if provider.available), key=key)
+
+    def hedge_delay(self, provider):
+        p95 = provider.rolling_p95()
+        return settings.SUMMARIZER_HEDGE_DELAY if p95 is None else min(p95, settings.SUMMARIZER_REQUEST_TIMEOUT)
+
+    def generate(self, prompt, timeout=None):
+        """
+        Returns the first answer to `prompt`. With every provider failing, raises
+        the error of the first one tried; with none available, lets the first
+        configured provider reject the call.
+        """
+        self._count("calls")
+        self._earn_hedge()
+        ranked = self.ranked() or self.providers[:1]
+        if len(ranked) == 1:
+            return self._call(ranked[0], prompt, timeout)
+
+        hedge_after = self.hedge_delay(ranked[0])
+        if random.random() < self.explore_rate:
+            ranked.insert(0, ranked.pop(random.randrange(1, len(ranked))))
+            self._count("explored")
+        fallbacks = deque(ranked)
+        attempts = {}
+
+        def start(provider):
+            cancellation = Cancellation()
+            attempts[self.executor.submit(self._call, provider, prompt, timeout, cancellation)] = (provider, cancellation)
+
+        primary = fallbacks.popleft()
+        start(primary)
+        done, _ = wait(attempts, timeout=hedge_after)
+        if not done and self._spend_hedge():
+            self._count("hedged")
+            start(fallbacks.popleft())
+
+        errors = []
+        while attempts:
+            done, _ = wait(attempts, return_when=FIRST_COMPLETED)
+            for future in done:
+                provider, _ = attempts.pop(future)
+                try:
+                    text = future.result()
+                except requests.exceptions.RequestException as error:
+                    errors.append(error)
+                    continue
+                for loser, (_, cancellation) in attempts.items():
+                    cancellation.cancel()
+                    loser.cancel()
+                if provider is not primary:
+                    self._count("won_by_hedge" if not errors else "failed_over")
+                return text
+            if not attempts and fallbacks and _fails_over(errors[-1]):
+                start(fallbacks.popleft())
+        raise errors[0]
+
+    def _call(self, provider, prompt, timeout=None, cancellation=None):
+        started = time.perf_counter()
+        try:
+            text = provider.generate(prompt, timeout, cancellation)
+        except CallCancelled:
+            # A cancelled call would have taken at least this long. Past the provider's p95
+            # that is the slowness hedging hides, so it counts; a hedge cancelled early says nothing.
+            elapsed = time.perf_counter() - started
+            p95 = provider.rolling_p95()
+            if p95 is not None and elapsed >= p95:
+                provider.latency.record(elapsed)
+            raise
+        provider.latency.record(time.perf_counter() - started)
+        return text
+
+    def _earn_hedge(self):
+        with self._lock:
+            self._hedge_tokens = min(HEDGE_BURST, self._hedge_tokens + self.hedge_budget)
+
+    def _spend_hedge(self):
+        with self._lock:
+            if self._hedge_tokens < 1:
+                self._stats["hedges_over_budget"] += 1
+                return False
+            self._hedge_tokens -= 1
+            return True
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def metrics(self):
+        """
+        Routing and hedging counters, plus each provider's health and latency histogram.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        return {
+            "routing": {name: stats.get(name, 0) for name in ("calls", "explored", "hedged", "won_by_hedge", "failed_over", "hedges_over_budget")},
+            "providers": [dict(provider.metrics(), hedge_after_ms=_ms(self.hedge_delay(provider))) for provider in self.providers],
+        }
+
+
+def _fails_over(error):
+    # A request the provider refused as malformed would be refused by the others too.
+    return not isinstance(error, requests.exceptions.HTTPError) or error.response.status_code in RETRYABLE_STATUSES
+
+
+gateway = Gateway.from_settings()
+
+
+def generate(prompt, timeout=None):
+    return gateway.generate(prompt, timeout)
@@ -1,13 +1,35 @@
 # type: ignore
+from django.conf import settings
 from rest_framework import serializers
 
+from .models import SummaryJob
+
+
 class SummarizeSerializer(serializers.Serializer):
-    lecture_text = serializers.CharField()
+    lecture_text = serializers.CharField(max_length=settings.SUMMARIZER_MAX_INPUT_CHARS)
     style = serializers.ChoiceField(
         choices=[
-            ('formal', 'Formal'),
-            ('creative', 'Creative'),
+            ("formal", "Formal"),
+            ("creative", "Creative"),
         ],
-        default='formal'
+        default="formal",
     )
-    summary_length = serializers.IntegerField(default=200)
+    summary_length = serializers.IntegerField(default=200, min_value=20, max_value=2000)
+
+
+class SummaryJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SummaryJob
+        fields = [
+            "id",
+            "status",
+            "style",
+            "summary_length",
+            "summary",
+            "error",
+            "attempts",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
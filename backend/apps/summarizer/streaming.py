@@ -0,0 +1,187 @@
+# type: ignore
+import asyncio
+import json
+import logging
+import weakref
+
+import httpx
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .cache import (
+    COALESCED,
+    MISS,
+    finish_flight,
+    get_summary,
+    join_flight,
+    store_summary,
+    summary_cache_key,
+)
+from .extractive import (
+    AUTO,
+    LLM,
+    LOCAL,
+    LOCAL_FALLBACK,
+    extract_summary,
+    falls_back,
+    prefers_local,
+)
+from .gemini import CONNECT_TIMEOUT, RETRYABLE_STATUSES, GeminiUnavailable
+from .pipeline import prepare_prompt
+from .providers import gateway
+
+logger = logging.getLogger(__name__)
+
+# httpx clients are bound to the event loop that created them, so each loop gets its own pool.
+_clients = weakref.WeakKeyDictionary()
+
+
+def _async_client():
+    loop = asyncio.get_running_loop()
+    async_client = _clients.get(loop)
+    if async_client is None:
+        async_client = _clients[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=settings.SUMMARIZER_MAX_STREAMS),
+            timeout=httpx.Timeout(settings.SUMMARIZER_REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT, pool=settings.SUMMARIZER_QUEUE_TIMEOUT),
+        )
+    return async_client
+
+
+def streaming_provider():
+    """
+    The gateway's first-ranked provider that can stream, falling back to the first configured one.
+    """
+    streaming = [provider for provider in gateway.ranked() if provider.stream_url()]
+    return streaming[0] if streaming else gateway.providers[0]
+
+
+async def stream_generate(prompt):
+    """
+    Yields the text of an answer piece by piece as it is generated, using the
+    `streamGenerateContent` SSE endpoint of the gateway's best-ranked provider
+    on the event loop. Shares that provider's circuit breaker; streamed calls
+    are neither retried nor hedged. A stream that ends without a verdict, such as
+    one that found no free connection or whose client went away, hands the
+    half-open probe on to the next call.
+    """
+    provider = streaming_provider()
+    breaker = provider.breaker
+    if not breaker.allow():
+        raise GeminiUnavailable("Gemini circuit breaker is open", retry_after=breaker.retry_after())
+    params = {"alt": "sse", "key": provider.api_key}
+    body = {"contents": [{"parts": [{"text": prompt}]}]}
+    verdict = False
+    try:
+        async with _async_client().stream("POST", provider.stream_url(), params=params, json=body) as response:
+            if response.is_error:
+                await response.aread()
+                response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                try:
+                    chunk = json.loads(line.removeprefix("data:"))
+                except ValueError as error:
+                    raise httpx.DecodingError(f"Gemini sent a malformed stream chunk: {error}", request=response.request) from error
+                for candidate in chunk.get("candidates", [])[:1]:
+                    for part in candidate.get("content", {}).get("parts", []):
+                        if part.get("text"):
+                            yield part["text"]
+    except httpx.PoolTimeout as error:
+        raise GeminiUnavailable("All Gemini connections are busy", retry_after=1) from error
+    except httpx.HTTPError as error:
+        if not isinstance(error, httpx.HTTPStatusError) or error.response.status_code in RETRYABLE_STATUSES:
+            breaker.record_failure()
+            verdict = True
+        raise
+    else:
+        breaker.record_success()
+        verdict = True
+    finally:
+        if not verdict:
+            breaker.release_probe()
+
+
+def format_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _local_events(lecture_text, summary_length, engine=LOCAL):
+    summary = await sync_to_async(extract_summary, thread_sensitive=False)(lecture_text, summary_length)
+    yield format_event("delta", {"text": summary})
+    yield format_event("done", {"engine": engine})
+
+
+async def summary_events(lecture_text, style, summary_length, engine=AUTO):
+    """
+    Server-sent events for one summary: `delta` events carrying text as it is
+    generated, then `done` once the full summary is cached, or `error`.
+    A cached summary, one produced by an identical request already in flight
+    in this process, or a local extractive summary is sent as a single `delta`.
+    With the `auto` engine, an upstream failure before any text was sent is
+    answered with a local summary.
+    """
+    if prefers_local(engine, lecture_text):
+        async for event in _local_events(lecture_text, summary_length):
+            yield event
+        return
+
+    cache_key = summary_cache_key(lecture_text, style, summary_length)
+    summary, tier = await sync_to_async(get_summary)(cache_key)
+    if summary is None:
+        flight, leader = join_flight(cache_key)
+        if not leader:
+            try:
+                summary, tier = await asyncio.wrap_future(flight), COALESCED
+            except requests.exceptions.RequestException as error:
+                async for event in _failure_events(error, lecture_text, summary_length, engine):
+                    yield event
+                return
+    if summary is not None:
+        yield format_event("delta", {"text": summary})
+        yield format_event("done", {"cache": tier, "engine": LLM})
+        return
+
+    pieces = []
+    try:
+        # Long lectures run their map phase on the summarizer pool; only the final prompt is streamed.
+        prompt = await sync_to_async(prepare_prompt, thread_sensitive=False)(lecture_text, style, summary_length)
+        async for text in stream_generate(prompt):
+            pieces.append(text)
+            yield format_event("delta", {"text": text})
+    except (httpx.HTTPError, requests.exceptions.RequestException) as error:
+        # Requests waiting on this stream expect the pooled client's exception types.
+        finish_flight(cache_key, flight, error=error if isinstance(error, requests.exceptions.RequestException) else requests.exceptions.RequestException(str(error)))
+        if pieces:
+            yield _error_event(error)
+            return
+        async for event in _failure_events(error, lecture_text, summary_length, engine):
+            yield event
+        return
+    except BaseException:
+        # The client went away mid-stream; don't leave waiting requests hanging.
+        finish_flight(cache_key, flight, error=requests.exceptions.RequestException("The summary stream was interrupted"))
+        raise
+
+    summary = "".join(pieces)
+    finish_flight(cache_key, flight, summary)
+    if summary:
+        await sync_to_async(store_summary)(cache_key, style, summary_length, summary)
+    yield format_event("done", {"cache": MISS, "engine": LLM})
+
+
+async def _failure_events(error, lecture_text, summary_length, engine):
+    if not falls_back(engine):
+        yield _error_event(error)
+        return
+    logger.warning("Upstream summary failed, answering with a local summary: %s", error)
+    async for event in _local_events(lecture_text, summary_length, LOCAL_FALLBACK):
+        yield event
+
+
+def _error_event(error):
+    if isinstance(error, GeminiUnavailable):
+        return format_event("error", {"error": f"Summarizer is temporarily unavailable: {error}", "retry_after": error.retry_after})
+    logger.warning("Streaming summary failed: %s", error)
+    return format_event("error", {"error": f"Request failed: {error}"})
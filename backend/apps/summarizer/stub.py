@@ -0,0 +1,224 @@
+# type: ignore
+import json
+import random
+import socket
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Words per chunk of a streamed reply.
+STREAM_CHUNK_WORDS = 4
+
+WORDS = "data index query table schema lecture model network protocol memory process thread cache latency algorithm graph tree".split()
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Benchmarks open hundreds of connections at once.
+    request_queue_size = 512
+
+
+def synthetic_lecture(word_count, seed=42):
+    """
+    Paragraphs of random sentences totalling at least `word_count` words, the same for the same `seed`.
+    """
+    rng = random.Random(seed)
+    paragraphs, words = [], 0
+    while words < word_count:
+        sentences = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))).capitalize() + "." for _ in range(rng.randint(3, 7))]
+        paragraphs.append(" ".join(sentences))
+        words += sum(len(sentence.split()) for sentence in sentences)
+    return "\n\n".join(paragraphs)
+
+
+class GeminiStub:
+    """
+    A local stand-in for Gemini's generateContent and streamGenerateContent
+    endpoints, used by the summarizer tests and benchmarks and for manual runs without
+    an API key.
+
+    Each reply starts after `latency` seconds plus `latency_per_kchar` seconds per
+    1000 prompt characters, then takes `word_interval` seconds per generated word.
+    It echoes the last `reply_words` words of the prompt. Streamed replies send
+    every few words as they are generated, as `alt=sse` does.
+
+    `latency_sigma` spreads the base latency log-normally around its median, and a
+    `tail_rate` share of replies waits `tail_latency` seconds instead, giving the
+    long tail that hedged requests are meant to cut.
+
+    Faults are injected with `error_rate` (a share of replies answered with
+    `error_status`) or queued with `fail_next`. `connections` counts the TCP
+    connections accepted, which shows whether clients reuse them.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        latency=0.2,
+        latency_per_kchar=0.0,
+        reply_words=40,
+        word_interval=0.0,
+        error_rate=0.0,
+        error_status=503,
+        latency_sigma=0.0,
+        tail_rate=0.0,
+        tail_latency=0.0,
+    ):
+        self.latency = latency
+        self.latency_sigma = latency_sigma
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.latency_per_kchar = latency_per_kchar
+        self.reply_words = reply_words
+        self.word_interval = word_interval
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.calls = 0
+        self.connections = 0
+        self._faults = deque()
+        self._lock = threading.Lock()
+        self.server = _Server((host, port), _handler_for(self))
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1beta/models/stub:generateContent"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="gemini-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def fail_next(self, count, status=503, delay=0.0):
+        """
+        Answers the next `count` requests with `status` after `delay` seconds.
+        A delay longer than the client's timeout simulates a hung upstream.
+        """
+        with self._lock:
+            self._faults.extend([(status, delay)] * count)
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.connections = 0
+            self._faults.clear()
+
+    def reply(self, body):
+        """
+        Returns `(status, payload)` for one generateContent request body.
+        """
+        fault = self._next_fault()
+        if fault is not None:
+            return fault
+        words = self._answer(body)
+        time.sleep(self.word_interval * len(words))
+        return 200, _payload(" ".join(words))
+
+    def stream_reply(self, body):
+        """
+        Returns `(status, payloads)` for one streamGenerateContent request body,
+        where `payloads` yields each chunk when it has been generated.
+        """
+        fault = self._next_fault()
+        if fault is not None:
+            return fault[0], iter([fault[1]])
+        words = self._answer(body)
+
+        def chunks():
+            for start in range(0, len(words), STREAM_CHUNK_WORDS):
+                end = start + STREAM_CHUNK_WORDS
+                time.sleep(self.word_interval * len(words[start:end]))
+                yield _payload(" ".join(words[start:end]) + (" " if end < len(words) else ""))
+
+        return 200, chunks()
+
+    def _next_fault(self):
+        with self._lock:
+            self.calls += 1
+            fault = self._faults.popleft() if self._faults else None
+        if fault is None and self.error_rate and random.random() < self.error_rate:
+            fault = (self.error_status, self.latency)
+        if fault is None:
+            return None
+        status, delay = fault
+        time.sleep(delay)
+        return status, {"error": {"code": status, "message": "Injected fault", "status": "UNAVAILABLE"}}
+
+    def first_token_delay(self):
+        if self.tail_rate and random.random() < self.tail_rate:
+            return self.tail_latency
+        if self.latency_sigma:
+            return random.lognormvariate(0, self.latency_sigma) * self.latency
+        return self.latency
+
+    def _answer(self, body):
+        # Waits out the time to first token and returns the words of the answer.
+        prompt = body["contents"][0]["parts"][0]["text"]
+        time.sleep(self.first_token_delay() + self.latency_per_kchar * len(prompt) / 1000)
+        count = self.reply_words
+        return prompt.split()[-count:]
+
+
+def _payload(text):
+    return {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "finishReason": "STOP"}]}
+
+
+def _handler_for(stub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            # Headers and body go out in separate writes; don't let Nagle hold the body back.
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with stub._lock:
+                stub.connections += 1
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if ":streamGenerateContent" in self.path:
+                return self.stream(body)
+            status, payload = stub.reply(body)
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            try:
+                self.wfile.write(data)
+            except (BrokenPipeError, ConnectionResetError):
+                # The client gave up waiting, e.g. on an injected hang.
+                self.close_connection = True
+
+        def stream(self, body):
+            status, payloads = stub.stream_reply(body)
+            self.send_response(status)
+            self.send_header("Content-Type", "text/event-stream" if status == 200 else "application/json")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                for payload in payloads:
+                    data = (f"data: {json.dumps(payload)}\r\n\r\n" if status == 200 else json.dumps(payload)).encode()
+                    self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
@@ -0,0 +1,20 @@
+# type: ignore
+import pytest
+from apps.users.models import User
+
+from ..stub import GeminiStub
+
+
+@pytest.fixture
+def stub(settings):
+    """
+    A local Gemini stub that the default provider calls, started for one test.
+    """
+    with GeminiStub(latency=0.05) as gemini:
+        settings.GEMINI_URL = gemini.url
+        yield gemini
+
+
+@pytest.fixture
+def user(transactional_db):
+    return User.objects.create_user(email="summarizer@example.com", password="secret", first_name="Summary", last_name="Test")
@@ -0,0 +1,44 @@
+# type: ignore
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .. import cache
+from ..models import CachedSummary
+
+
+def test_memory_hits_keep_the_row_from_eviction(db):
+    cache.clear_cache()
+    keys = [cache.summary_cache_key(f"Lecture {index}", "concise", 100) for index in range(3)]
+    for key in keys:
+        cache.store_summary(key, "concise", 100, f"Summary of {key}")
+    long_ago = timezone.now() - timedelta(hours=1)
+    CachedSummary.objects.update(last_used_at=long_ago)
+
+    # The rows were stored within the touch interval, so only the first memory hit after it refreshes them.
+    cache._touched.clear()
+    assert cache.get_summary(keys[0]) == (f"Summary of {keys[0]}", cache.MEMORY)
+    CachedSummary.objects.filter(key=keys[0]).update(last_used_at=long_ago + timedelta(minutes=1))
+    assert cache.get_summary(keys[0])[1] == cache.MEMORY
+    assert CachedSummary.objects.get(key=keys[0]).last_used_at == long_ago + timedelta(minutes=1)
+
+    CachedSummary.objects.filter(key=keys[1]).update(last_used_at=long_ago - timedelta(minutes=1))
+    assert cache.evict(2) == 1
+    assert set(CachedSummary.objects.values_list("key", flat=True)) == {keys[0], keys[2]}
+    cache.clear_cache()
+
+
+def test_rows_are_only_evicted_once_the_table_is_over_its_limit(db, settings, monkeypatch):
+    cache.clear_cache()
+    evicted = []
+    monkeypatch.setattr(cache, "evict", evicted.append)
+    settings.SUMMARY_CACHE_MAX_ENTRIES = 2
+    keys = [cache.summary_cache_key(f"Lecture {index}", "concise", 100) for index in range(3)]
+
+    cache.store_summary(keys[0], "concise", 100, "First")
+    cache.store_summary(keys[1], "concise", 100, "Second")
+    cache.store_summary(keys[1], "concise", 100, "Second, again")
+    assert evicted == []
+    cache.store_summary(keys[2], "concise", 100, "Third")
+    assert evicted == [2]
+    cache.clear_cache()
@@ -0,0 +1,34 @@
+# type: ignore
+import time
+
+from ..chunking import split_text
+from ..pipeline import summarize_text
+from ..prompts import build_prompt
+from ..providers import generate
+from ..stub import synthetic_lecture
+
+
+def test_short_lecture_is_one_prompt(stub):
+    summarize_text(synthetic_lecture(500), "formal", 200)
+    assert stub.calls == 1
+
+
+def test_long_lecture_is_mapped_concurrently_then_reduced(stub, settings):
+    settings.SUMMARIZER_REQUEST_TIMEOUT = 60
+    # Upstream latency grows with the prompt, as it does for a real model.
+    stub.latency, stub.latency_per_kchar = 0.3, 0.02
+    text = synthetic_lecture(12000)
+    chunks = len(split_text(text, settings.SUMMARIZER_CHUNK_TOKENS))
+    assert 1 < chunks <= settings.SUMMARIZER_MAP_WORKERS
+
+    started = time.perf_counter()
+    generate(build_prompt(text, "formal", 200))
+    single = time.perf_counter() - started
+
+    stub.reset()
+    started = time.perf_counter()
+    summarize_text(text, "formal", 200)
+    chunked = time.perf_counter() - started
+
+    assert stub.calls == chunks + 1
+    assert chunked < single
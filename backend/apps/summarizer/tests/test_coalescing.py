@@ -0,0 +1,87 @@
+# type: ignore
+import asyncio
+import multiprocessing
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import async_to_sync
+from django.db import connection, connections
+from rest_framework.test import APIClient
+
+from ..extractive import LLM
+from ..streaming import summary_events
+
+REQUESTS = 40
+PROCESSES = 4
+
+
+def post_summaries(user, text, count, barrier=None):
+    """
+    Sends `count` identical summary requests at once from a thread pool and
+    returns the status and `X-Summary-Cache` header of each response.
+    """
+
+    def post(_):
+        client = APIClient()
+        client.force_authenticate(user)
+        if barrier is not None:
+            barrier.wait()
+        try:
+            response = client.post("/v1/summarizer/?engine=llm", {"lecture_text": text}, format="json")
+            return response.status_code, response["X-Summary-Cache"]
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        return list(executor.map(post, range(count)))
+
+
+def _worker(user, text, threads, barrier, results):
+    connections.close_all()
+    results.extend(post_summaries(user, text, threads, barrier))
+
+
+def lecture():
+    return f"Coalescing check {uuid.uuid4()}. Indexes speed up lookups on large tables."
+
+
+def test_threads_in_one_process_make_one_upstream_call(stub, user):
+    stub.latency = 0.5
+    results = post_summaries(user, lecture(), REQUESTS)
+    assert all(status == 200 for status, _ in results)
+    assert stub.calls == 1
+
+
+def test_worker_processes_make_one_upstream_call(stub, user):
+    stub.latency = 0.5
+    text = lecture()
+    threads = REQUESTS // PROCESSES
+    context = multiprocessing.get_context("fork")
+    barrier = context.Barrier(PROCESSES * threads)
+    connections.close_all()
+    with context.Manager() as manager:
+        results = manager.list()
+        workers = [context.Process(target=_worker, args=(user, text, threads, barrier, results)) for _ in range(PROCESSES)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        results = list(results)
+    assert len(results) == REQUESTS
+    assert all(status == 200 for status, _ in results)
+    assert stub.calls == 1
+
+
+def test_streams_on_one_event_loop_make_one_upstream_call(stub, transactional_db):
+    stub.latency = 0.5
+    text = lecture()
+
+    async def one_stream():
+        events = [event async for event in summary_events(text, "formal", 200, LLM)]
+        return events[-1]
+
+    async def run():
+        return await asyncio.gather(*(one_stream() for _ in range(REQUESTS)))
+
+    assert all(event.startswith("event: done") for event in async_to_sync(run)())
+    assert stub.calls == 1
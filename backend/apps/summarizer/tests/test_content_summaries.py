@@ -0,0 +1,29 @@
+# type: ignore
+import pytest
+from apps.contents.models import Content
+from apps.courses.models import Course
+from pypdf.errors import DependencyError
+
+from .. import content_summaries
+from ..models import ContentSummary
+
+
+@pytest.fixture
+def lecture(db):
+    course = Course.objects.create(code="EXT101", name="Extraction", abbreviation="EXT", status=Course.Status.COMPULSORY)
+    content = Content.objects.create(course=course, title="Lecture", type=Content.ContentType.LECTURE, path="https://res.cloudinary.com/notes.pdf", file={})
+    content_summaries.submit_content_summary(content)
+    return content
+
+
+@pytest.mark.parametrize("error", [DependencyError("AES encryption needs cryptography"), ValueError("bad zip member")])
+def test_unexpected_extraction_error_fails_the_summary(lecture, monkeypatch, error):
+    def extract_text(content):
+        raise error
+
+    monkeypatch.setattr(content_summaries, "extract_text", extract_text)
+    assert content_summaries.run_content_summary(lecture.pk) == ContentSummary.Status.FAILED
+    summary = ContentSummary.objects.get(pk=lecture.pk)
+    assert summary.status == ContentSummary.Status.FAILED
+    assert summary.error == f"Text extraction failed: {error}"
+    assert summary.finished_at is not None
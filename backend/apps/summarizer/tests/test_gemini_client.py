@@ -0,0 +1,118 @@
+# type: ignore
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from ..gemini import GeminiClient, GeminiUnavailable
+
+
+@pytest.fixture
+def client(stub):
+    def make(**options):
+        defaults = {"url": stub.url, "api_key": "stub", "max_concurrency": 8, "retries": 2, "backoff": 0.05, "breaker_threshold": 3, "breaker_cooldown": 1}
+        return GeminiClient(**{**defaults, **options})
+
+    return make
+
+
+def test_sequential_calls_reuse_one_connection(stub, client):
+    gemini = client()
+    for _ in range(20):
+        gemini.generate("ping")
+    assert stub.connections == 1
+
+
+def test_transient_errors_are_retried(stub, client):
+    gemini = client()
+    stub.fail_next(1, 503)
+    stub.fail_next(1, 429)
+    assert gemini.generate("retried prompt") == "retried prompt"
+    metrics = gemini.metrics()
+    assert metrics["calls"]["retries"] == 2
+    assert metrics["statuses"] == {"503": 1, "429": 1, "200": 1}
+    assert metrics["breaker"]["state"] == "closed"
+
+
+def test_client_errors_are_not_retried_and_keep_the_breaker_closed(stub, client):
+    gemini = client()
+    stub.fail_next(5, 400)
+    for _ in range(5):
+        with pytest.raises(requests.exceptions.HTTPError):
+            gemini.generate("bad request")
+    assert stub.calls == 5
+    assert gemini.breaker.state == "closed"
+
+
+def test_hung_upstream_times_out_per_attempt(stub, client):
+    gemini = client(retries=1)
+    stub.fail_next(2, 200, delay=1.0)
+    started = time.perf_counter()
+    with pytest.raises(requests.exceptions.Timeout):
+        gemini.generate("hung", timeout=0.2)
+    assert time.perf_counter() - started < 1.0
+
+
+def test_retries_stop_at_the_call_deadline(stub, client):
+    gemini = client(retries=5, backoff=0.01, deadline=0.5)
+    stub.fail_next(6, 200, delay=1.0)
+    started = time.perf_counter()
+    with pytest.raises(requests.exceptions.Timeout):
+        gemini.generate("hung", timeout=0.3)
+    assert time.perf_counter() - started < 0.7
+
+
+def test_breaker_opens_fails_fast_and_probes(stub, client):
+    gemini = client(retries=0)
+    stub.fail_next(3, 503)
+    for _ in range(3):
+        with pytest.raises(requests.exceptions.HTTPError):
+            gemini.generate("outage")
+    calls = stub.calls
+    started = time.perf_counter()
+    with pytest.raises(GeminiUnavailable):
+        gemini.generate("outage")
+    assert stub.calls == calls
+    assert time.perf_counter() - started < 0.01
+
+    time.sleep(gemini.breaker.cooldown)
+    stub.fail_next(1, 503)
+    with pytest.raises(requests.exceptions.HTTPError):
+        gemini.generate("probe")
+    assert gemini.breaker.state == "open"
+
+    time.sleep(gemini.breaker.cooldown)
+    gemini.generate("probe")
+    assert gemini.breaker.state == "closed"
+
+
+def test_call_without_a_free_slot_leaves_the_probe_unclaimed(stub, client, settings):
+    settings.SUMMARIZER_QUEUE_TIMEOUT = 0.05
+    gemini = client(max_concurrency=1, retries=0)
+    gemini.breaker.state, gemini.breaker.opened_at = "open", time.monotonic() - gemini.breaker.cooldown
+    gemini._slots.acquire()
+    with pytest.raises(GeminiUnavailable):
+        gemini.generate("busy")
+    gemini._slots.release()
+    assert gemini.breaker.state == "open"
+
+    gemini.generate("probe")
+    assert gemini.breaker.state == "closed"
+
+
+def test_lost_probe_is_given_up_after_the_probe_timeout(stub, client):
+    gemini = client(retries=0)
+    gemini.breaker.state, gemini.breaker.probe_started_at = "half_open", time.monotonic() - gemini.breaker.probe_timeout
+    gemini.generate("probe")
+    assert gemini.breaker.state == "closed"
+
+
+def test_concurrency_is_bounded(stub, client):
+    gemini = client(max_concurrency=4)
+    stub.latency = 0.1
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        replies = list(executor.map(gemini.generate, [f"prompt {index}" for index in range(32)]))
+    assert len(replies) == 32
+    assert gemini.metrics()["calls"]["successes"] == 32
+    assert stub.connections <= 4
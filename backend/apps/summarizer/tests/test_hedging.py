@@ -0,0 +1,62 @@
+# type: ignore
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ..providers import Gateway, GeminiProvider
+from ..stub import GeminiStub
+
+REQUESTS = 200
+CONCURRENCY = 16
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, len(values) * p // 100)]
+
+
+@pytest.fixture
+def stubs():
+    # A fast primary with a long tail, and a slower but steady secondary.
+    primary = GeminiStub(latency=0.1, latency_sigma=0.2, tail_rate=0.05, tail_latency=1.5)
+    secondary = GeminiStub(latency=0.15, latency_sigma=0.2)
+    with primary, secondary:
+        yield primary, secondary
+
+
+def run(stubs, requests=REQUESTS):
+    gateway = Gateway([GeminiProvider(name, url=stub.url, api_key="stub") for name, stub in zip(("primary", "secondary"), stubs)])
+
+    def call(index):
+        started = time.perf_counter()
+        gateway.generate(f"Hedging test prompt {index}.")
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as executor:
+        latencies = list(executor.map(call, range(requests)))
+    # Let cancelled losers return before reading their counters.
+    gateway.executor.shutdown(wait=True)
+    return gateway, latencies
+
+
+def test_hedging_cuts_the_tail(stubs, settings):
+    # Hedge from the first call, before the primary has a rolling p95.
+    settings.SUMMARIZER_HEDGE_DELAY = 0.3
+    _, unhedged = run(stubs[:1])
+    gateway, hedged = run(stubs)
+    routing = gateway.metrics()["routing"]
+    assert routing["hedged"] > 0
+    assert routing["won_by_hedge"] > 0
+    assert percentile(hedged, 99) < percentile(unhedged, 99) / 2
+    # Hedges are rationed, so the secondary sees a fraction of the traffic.
+    assert stubs[1].calls < REQUESTS / 2
+
+
+def test_degraded_primary_loses_its_traffic(stubs, settings):
+    # Enough exploration to give the secondary a rolling p95 within one run.
+    settings.SUMMARIZER_EXPLORE_RATE = 0.25
+    primary, _ = stubs
+    primary.latency, primary.tail_rate = 0.4, 0.0
+    gateway, _ = run(stubs)
+    assert gateway.ranked()[0].name == "secondary"
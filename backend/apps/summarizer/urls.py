@@ -1,6 +1,11 @@
-from django.urls import path, URLPattern
-from .views import summarize_lecture
+from django.urls import URLPattern, path
+
+from .views import gemini_metrics, summarizer, summary_cache, summary_job, summary_jobs
 
 urlpatterns: list[URLPattern] = [
-    path('summarizer/', summarize_lecture, name="summarizer"),
+    path("summarizer/", summarizer, name="summarizer"),
+    path("summarizer/cache/", summary_cache, name="summarizer-cache"),
+    path("summarizer/metrics/", gemini_metrics, name="summarizer-metrics"),
+    path("summarizer/jobs/", summary_jobs, name="summarizer-jobs"),
+    path("summarizer/jobs/<uuid:job_id>/", summary_job, name="summarizer-job"),
 ]
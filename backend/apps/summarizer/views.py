@@ -1,78 +1,183 @@
 # type: ignore
+import json
+import logging
+import math
+
 import requests
-from rest_framework.decorators import api_view
-from rest_framework.response import Response
+from apps.users.authentication import CachedUserAuthentication
+from apps.users.models import User
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework import status
-from django.conf import settings
-from .serializers import SummarizeSerializer
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import APIException, NotAuthenticated, ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from .cache import (
+    cache_stats,
+    clear_cache,
+    get_summary,
+    summarize_once,
+    summary_cache_key,
+)
+from .extractive import (
+    AUTO,
+    ENGINES,
+    LLM,
+    LOCAL,
+    LOCAL_FALLBACK,
+    extract_summary,
+    falls_back,
+    prefers_local,
+)
+from .gemini import GeminiUnavailable
+from .jobs import QueueFull, enqueue_job
+from .models import SummaryJob
+from .permissions import IsAdmin
+from .pipeline import summarize_text
+from .providers import gateway
+from .serializers import SummarizeSerializer, SummaryJobSerializer
+from .streaming import summary_events
+
+logger = logging.getLogger(__name__)
 
-GEMINI_URL = settings.GEMINI_URL
 
-@api_view(['POST'])
+def _engine(request):
+    engine = request.GET.get("engine", AUTO)
+    if engine not in ENGINES:
+        raise ValidationError({"engine": [f'"{engine}" is not a valid choice.']})
+    return engine
+
+
+@api_view(["POST"])
 def summarize_lecture(request):
+    engine = _engine(request)
     serializer = SummarizeSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
 
-    lecture_text = serializer.validated_data['lecture_text']
-    style = serializer.validated_data['style']
-    summary_length = serializer.validated_data['summary_length']
+    lecture_text = serializer.validated_data["lecture_text"]
+    style = serializer.validated_data["style"]
+    summary_length = serializer.validated_data["summary_length"]
 
-    if style == 'formal':
-        formatting_instructions = (
-            "Write in a formal, objective, and informative tone.\n"
-            "Use plain text only.\n"
-            "Separate paragraphs with real line breaks.\n"
-            "Keep sentences clear, concise, and precise.\n"
-        )
-    elif style == 'creative':
-        formatting_instructions = (
-            "Write in a creative, engaging, and vivid tone.\n"
-            "Use plain text only.\n"
-            "Separate paragraphs with real line breaks.\n"
-            "Make the text natural, storytelling-like, and expressive.\n"
+    if prefers_local(engine, lecture_text):
+        return Response({"summary": extract_summary(lecture_text, summary_length)}, headers={"X-Summary-Engine": LOCAL})
+
+    cache_key = summary_cache_key(lecture_text, style, summary_length)
+    summary, tier = get_summary(cache_key)
+    if summary is not None:
+        return Response({"summary": summary}, headers={"X-Summary-Cache": tier, "X-Summary-Engine": LLM})
+
+    try:
+        summary, tier = summarize_once(cache_key, style, summary_length, lambda: summarize_text(lecture_text, style, summary_length))
+        return Response({"summary": summary}, headers={"X-Summary-Cache": tier, "X-Summary-Engine": LLM})
+
+    except GeminiUnavailable as e:
+        if falls_back(engine):
+            return _local_fallback(lecture_text, summary_length, e)
+        return Response(
+            {"error": f"Summarizer is temporarily unavailable: {str(e)}"},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(math.ceil(e.retry_after or 1))},
         )
 
-    CUSTOM_PROMPT = f"""
-You are an expert educator and summarizer.
-Read the lecture text carefully and produce a high-quality summary in a {style} style.
+    except requests.exceptions.RequestException as e:
+        if falls_back(engine):
+            return _local_fallback(lecture_text, summary_length, e)
+        return Response({"error": f"Request failed: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-Your summary must:
-1. Capture main topics, subtopics, and key points
-2. Highlight important concepts and examples
-3. Be clear, accurate, and structured
-4. Use plain text only — no bold, no bullets, no Markdown
-5. Separate paragraphs with real line breaks (Enter key)
-6. Be under {summary_length} words
-6. Use {formatting_instructions}
 
-Do not add phrases like "Here's a summary" or "In conclusion".
-Return only the summary text.
+def _local_fallback(lecture_text, summary_length, error):
+    logger.warning("Upstream summary failed, answering with a local summary: %s", error)
+    return Response({"summary": extract_summary(lecture_text, summary_length)}, headers={"X-Summary-Engine": LOCAL_FALLBACK})
 
-Lecture text:
-{lecture_text}
-"""
 
-    payload = {"contents": [{"parts": [{"text": CUSTOM_PROMPT}]}]}
+def _authenticate(request):
+    result = CachedUserAuthentication().authenticate(request)
+    if result is None:
+        raise NotAuthenticated()
+    return result[0]
 
+
+async def summarize_lecture_stream(request):
+    """
+    Streams the summary as server-sent events while Gemini generates it,
+    without holding a worker thread for the length of the stream.
+    """
+    if request.method != "POST":
+        return JsonResponse({"detail": f'Method "{request.method}" not allowed.'}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
     try:
-        response = requests.post(
-            f"{GEMINI_URL}?key={settings.GEMINI_API_KEY}",
-            headers={"Content-Type": "application/json"},
-            json=payload,
-            timeout=10
-        )
-        response.raise_for_status()
-        data = response.json()
-        summary = (
-            data.get("candidates", [])[0]
-            .get("content", {})
-            .get("parts", [])[0]
-            .get("text", "")
-        )
-        return Response({"summary": summary})
+        await sync_to_async(_authenticate)(request)
+        engine = _engine(request)
+    except APIException as error:
+        detail = error.detail if isinstance(error.detail, dict) else {"detail": error.detail}
+        return JsonResponse(detail, status=error.status_code)
 
-    except requests.exceptions.RequestException as e:
-        return Response(
-            {"error": f"Request failed: {str(e)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        return JsonResponse({"detail": "JSON parse error."}, status=status.HTTP_400_BAD_REQUEST)
+    serializer = SummarizeSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    events = summary_events(serializer.validated_data["lecture_text"], serializer.validated_data["style"], serializer.validated_data["summary_length"], engine)
+    response = StreamingHttpResponse(events, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@csrf_exempt
+async def summarizer(request):
+    """
+    `/summarizer/`: `?stream=1` streams the summary, anything else is answered by `summarize_lecture`.
+    """
+    if request.GET.get("stream") == "1":
+        return await summarize_lecture_stream(request)
+    return await sync_to_async(summarize_lecture)(request)
+
+
+@api_view(["POST"])
+def summary_jobs(request):
+    """
+    Queues a summary for `run_summary_jobs` and returns the job at once; poll it at `jobs/<id>/`.
+    """
+    serializer = SummarizeSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    try:
+        job = enqueue_job(request.user, **serializer.validated_data)
+    except QueueFull as e:
+        return Response({"error": str(e)}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+    return Response(SummaryJobSerializer(job).data, status=status.HTTP_202_ACCEPTED, headers={"Location": f"{request.path}{job.id}/"})
+
+
+@api_view(["GET"])
+def summary_job(request, job_id):
+    jobs = SummaryJob.objects.all() if request.user.role == User.Role.ADMIN else SummaryJob.objects.filter(user=request.user)
+    return Response(SummaryJobSerializer(get_object_or_404(jobs, pk=job_id)).data)
+
+
+@api_view(["GET", "DELETE"])
+@permission_classes([IsAuthenticated, IsAdmin])
+def summary_cache(request):
+    """
+    GET: hit/miss statistics for this worker's cache tiers.
+    DELETE: invalidates cached summaries; `?stale=true` keeps those from the current prompt version.
+    """
+    if request.method == "DELETE":
+        deleted = clear_cache(stale_only=request.query_params.get("stale") == "true")
+        return Response({"deleted": deleted})
+    return Response(cache_stats())
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdmin])
+def gemini_metrics(request):
+    """
+    Summarizer gateway health for this worker: routing and hedging counters, and for each
+    provider its breaker state, call and retry counters, status codes and latency histogram.
+    """
+    return Response(gateway.metrics())
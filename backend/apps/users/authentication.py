@@ -0,0 +1,112 @@
+# type: ignore
+import copy
+import threading
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.utils.functional import cached_property
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+# Claims copied from the user into each access token.
+USER_CLAIMS = ("role", "department", "year", "semester", "is_active")
+
+_users = TTLCache(maxsize=settings.AUTH_USER_CACHE_SIZE, ttl=settings.AUTH_USER_CACHE_TTL)
+_lock = threading.Lock()
+
+
+def add_user_claims(token, user):
+    """
+    Adds the user's role, cohort and active flag to an access token and returns it.
+    """
+    token["role"] = user.role
+    token["department"] = str(user.department_id) if user.department_id else None
+    token["year"] = user.year
+    token["semester"] = user.semester
+    token["is_active"] = user.is_active
+    return token
+
+
+def get_cached_user(user_id):
+    """
+    Returns the user with `user_id`, or None. Rows are kept in-process for
+    `AUTH_USER_CACHE_TTL` seconds, and each caller gets its own copy.
+    """
+    user_id = str(user_id)
+    with _lock:
+        user = _users.get(user_id)
+    if user is None:
+        user = User.objects.filter(pk=user_id).first()
+        if user is None:
+            return None
+        with _lock:
+            _users[user_id] = user
+    return copy.copy(user)
+
+
+def invalidate_cached_user(user_id):
+    with _lock:
+        _users.pop(str(user_id), None)
+
+
+class ClaimsUser(TokenUser):
+    """
+    A user read from access token claims, without a database row. It answers
+    `role`, `department_id`, `year`, `semester` and `is_active`, which is what
+    permission checks and cohort defaults read, but cannot be saved or used in
+    queries.
+    """
+
+    @cached_property
+    def is_active(self):
+        return self.token.get("is_active", False)
+
+    @cached_property
+    def department_id(self):
+        return self.token.get("department")
+
+
+class CachedUserAuthentication(JWTAuthentication):
+    """
+    `JWTAuthentication` that loads the user through the in-process user cache.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as error:
+            raise InvalidToken("Token contained no recognizable user identification") from error
+        user = get_cached_user(user_id)
+        if user is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
+
+
+class TokenUserAuthentication(CachedUserAuthentication):
+    """
+    Authenticates read requests (GET, HEAD, OPTIONS) from the access token
+    alone, as a `ClaimsUser`; other methods get the cached `User`. Tokens
+    issued before the claims were added also fall back to the cached `User`.
+    """
+
+    def authenticate(self, request):
+        if request.method not in SAFE_METHODS:
+            return super().authenticate(request)
+        header = self.get_header(request)
+        raw_token = self.get_raw_token(header) if header is not None else None
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        if any(claim not in validated_token for claim in USER_CLAIMS):
+            return self.get_user(validated_token), validated_token
+        user = ClaimsUser(validated_token)
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user, validated_token
@@ -103,4 +103,5 @@ class User(AbstractUser):
             models.Index(fields=["student_id"]),
             models.Index(fields=["staff_id"]),
             models.Index(fields=["role"]),
+            models.Index(fields=["date_joined", "id"]),
         ]
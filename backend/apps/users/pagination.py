@@ -1,8 +1,9 @@
 # type: ignore
-from rest_framework.pagination import PageNumberPagination
+from utils.pagination import CursorPageNumberPagination
 
 
-class UserPagination(PageNumberPagination):
+class UserPagination(CursorPageNumberPagination):
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
+    cursor_ordering = ("date_joined", "id")
@@ -10,8 +10,10 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from .authentication import add_user_claims
 from .models import User
 from .pagination import UserPagination
 from .serializers import (
@@ -27,7 +29,7 @@ OAUTH_PROVIDERS = ("google", "github")
 
 def get_tokens_for_user(user):
     refresh = RefreshToken.for_user(user)
-    return {"access_token": str(refresh.access_token), "refresh_token": str(refresh)}
+    return {"access_token": str(add_user_claims(refresh.access_token, user)), "refresh_token": str(refresh)}
 
 
 class RegisterView(generics.CreateAPIView):
@@ -93,9 +95,13 @@ class RefreshTokenView(APIView):
             return Response({"detail": "Refresh token missing."}, status=status.HTTP_401_UNAUTHORIZED)
         try:
             refresh = RefreshToken(refresh_token)
-            return Response({"access_token": str(refresh.access_token)}, status=status.HTTP_200_OK)
         except TokenError:
             return Response({"detail": "Invalid or expired refresh token."}, status=status.HTTP_401_UNAUTHORIZED)
+        # Access tokens carry the user's role and cohort, so read them fresh.
+        user = User.objects.filter(pk=refresh[api_settings.USER_ID_CLAIM], is_active=True).first()
+        if user is None:
+            return Response({"detail": "User not found or inactive."}, status=status.HTTP_401_UNAUTHORIZED)
+        return Response({"access_token": str(add_user_claims(refresh.access_token, user))}, status=status.HTTP_200_OK)
 
 
 class MeView(APIView):
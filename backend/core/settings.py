@@ -39,6 +39,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Third-party apps
     "rest_framework",
     "rest_framework_simplejwt",
@@ -55,6 +56,7 @@ INSTALLED_APPS = [
     "apps.saved_courses",
     "apps.intake",
     "apps.summarizer",
+    "apps.feed",
 ]
 
 
@@ -112,6 +114,112 @@ DATABASES: dict[str, Any] = {
     }
 }
 
+# -------------------------------
+# Cache
+# -------------------------------
+# Unread counters are adjusted in place with the cache's atomic `incr`, and cached feeds are
+# invalidated by whichever worker handles the write, so every worker must share one cache with an
+# atomic `incr`: Redis, at REDIS_URL. Without REDIS_URL the cache is kept in Postgres (the table is
+# created by the notifications migrations). Its `incr` is a get and a set, so each change drops the
+# user's counter, which is recounted on the next read; that fails the `utils.E002` check unless
+# DEBUG is on. A per-process cache fails the `utils.E001` check unless DEBUG is on.
+REDIS_URL = os.environ.get("REDIS_URL")
+# Entries the database cache keeps before culling a tenth of them: an unread counter per user,
+# a member set per cohort and course, and a feed per cohort.
+DJANGO_CACHE_MAX_ENTRIES = int(os.environ.get("DJANGO_CACHE_MAX_ENTRIES", 100_000))
+CACHES: dict[str, Any] = {
+    "default": {
+        "BACKEND": os.environ.get("DJANGO_CACHE_BACKEND", "django.core.cache.backends.redis.RedisCache" if REDIS_URL else "django.core.cache.backends.db.DatabaseCache"),
+        "LOCATION": os.environ.get("DJANGO_CACHE_LOCATION", REDIS_URL or "django_cache"),
+    }
+}
+if CACHES["default"]["BACKEND"] == "django.core.cache.backends.db.DatabaseCache":
+    CACHES["default"]["OPTIONS"] = {"MAX_ENTRIES": DJANGO_CACHE_MAX_ENTRIES, "CULL_FREQUENCY": 10}
+
+# -------------------------------
+# Personalized Feed
+# -------------------------------
+FEED_CACHE_TIMEOUT = int(os.environ.get("FEED_CACHE_TIMEOUT", 15 * 60))
+FEED_CONTENTS_PER_COURSE = int(os.environ.get("FEED_CONTENTS_PER_COURSE", 5))
+
+# -------------------------------
+# Download Log Ingestion
+# -------------------------------
+DOWNLOAD_LOG_SPOOL_DIR = os.environ.get("DOWNLOAD_LOG_SPOOL_DIR", str(BASE_DIR / "var" / "download_logs"))
+DOWNLOAD_LOG_BATCH_SIZE = int(os.environ.get("DOWNLOAD_LOG_BATCH_SIZE", 1000))
+DOWNLOAD_LOG_FLUSH_INTERVAL = float(os.environ.get("DOWNLOAD_LOG_FLUSH_INTERVAL", 2))
+DOWNLOAD_LOG_FLUSH_BYTES = int(os.environ.get("DOWNLOAD_LOG_FLUSH_BYTES", 256 * 1024))
+DOWNLOAD_LOG_PARTITIONS_AHEAD = int(os.environ.get("DOWNLOAD_LOG_PARTITIONS_AHEAD", 3))
+DOWNLOAD_LOG_RETENTION_MONTHS = int(os.environ.get("DOWNLOAD_LOG_RETENTION_MONTHS", 12))
+DOWNLOAD_LOG_ARCHIVE_DIR = os.environ.get("DOWNLOAD_LOG_ARCHIVE_DIR", str(BASE_DIR / "var" / "download_log_archive"))
+DOWNLOAD_LOG_DEFAULT_WINDOW_DAYS = int(os.environ.get("DOWNLOAD_LOG_DEFAULT_WINDOW_DAYS", 90))
+
+# -------------------------------
+# Notifications
+# -------------------------------
+NOTIFICATION_FANOUT_WORKERS = int(os.environ.get("NOTIFICATION_FANOUT_WORKERS", 2))
+NOTIFICATION_FANOUT_CHUNK_SIZE = int(os.environ.get("NOTIFICATION_FANOUT_CHUNK_SIZE", 2000))
+# Seconds without progress before a RUNNING dispatch may be claimed by another worker.
+NOTIFICATION_DISPATCH_STALE_AFTER = int(os.environ.get("NOTIFICATION_DISPATCH_STALE_AFTER", 300))
+NOTIFICATION_UNREAD_CACHE_TIMEOUT = int(os.environ.get("NOTIFICATION_UNREAD_CACHE_TIMEOUT", 10 * 60))
+NOTIFICATION_COHORT_CACHE_TIMEOUT = int(os.environ.get("NOTIFICATION_COHORT_CACHE_TIMEOUT", 10 * 60))
+NOTIFICATION_STREAM_HEARTBEAT = int(os.environ.get("NOTIFICATION_STREAM_HEARTBEAT", 15))
+NOTIFICATION_STREAM_QUEUE_SIZE = int(os.environ.get("NOTIFICATION_STREAM_QUEUE_SIZE", 100))
+NOTIFICATION_STREAM_RETRY_MS = int(os.environ.get("NOTIFICATION_STREAM_RETRY_MS", 5000))
+
+# -------------------------------
+# Summarizer
+# -------------------------------
+SUMMARY_CACHE_MEMORY_SIZE = int(os.environ.get("SUMMARY_CACHE_MEMORY_SIZE", 256))
+SUMMARY_CACHE_MEMORY_TTL = int(os.environ.get("SUMMARY_CACHE_MEMORY_TTL", 60 * 60))
+SUMMARY_CACHE_MAX_ENTRIES = int(os.environ.get("SUMMARY_CACHE_MAX_ENTRIES", 10000))
+# Seconds between refreshes of a cached summary's last use while it is served from memory.
+SUMMARY_CACHE_TOUCH_INTERVAL = int(os.environ.get("SUMMARY_CACHE_TOUCH_INTERVAL", 60))
+SUMMARIZER_REQUEST_TIMEOUT = float(os.environ.get("SUMMARIZER_REQUEST_TIMEOUT", 10))
+SUMMARIZER_MAX_INPUT_CHARS = int(os.environ.get("SUMMARIZER_MAX_INPUT_CHARS", 400_000))
+SUMMARIZER_CHUNK_TOKENS = int(os.environ.get("SUMMARIZER_CHUNK_TOKENS", 3000))
+SUMMARIZER_MAP_WORKERS = int(os.environ.get("SUMMARIZER_MAP_WORKERS", 8))
+SUMMARIZER_MAX_CONCURRENCY = int(os.environ.get("SUMMARIZER_MAX_CONCURRENCY", 16))
+SUMMARIZER_QUEUE_TIMEOUT = float(os.environ.get("SUMMARIZER_QUEUE_TIMEOUT", 5))
+SUMMARIZER_RETRIES = int(os.environ.get("SUMMARIZER_RETRIES", 2))
+SUMMARIZER_RETRY_BACKOFF = float(os.environ.get("SUMMARIZER_RETRY_BACKOFF", 0.5))
+SUMMARIZER_BREAKER_THRESHOLD = int(os.environ.get("SUMMARIZER_BREAKER_THRESHOLD", 5))
+SUMMARIZER_BREAKER_COOLDOWN = float(os.environ.get("SUMMARIZER_BREAKER_COOLDOWN", 30))
+# Most seconds one Gemini call may take, retries and backoff included.
+SUMMARIZER_CALL_DEADLINE = float(os.environ.get("SUMMARIZER_CALL_DEADLINE", 15))
+# A half-open probe that reports nothing for this long is given up, and the next call probes instead.
+SUMMARIZER_BREAKER_PROBE_TIMEOUT = float(os.environ.get("SUMMARIZER_BREAKER_PROBE_TIMEOUT", 2 * SUMMARIZER_CALL_DEADLINE))
+SUMMARIZER_MAX_STREAMS = int(os.environ.get("SUMMARIZER_MAX_STREAMS", 200))
+# Backends behind the summarizer gateway. The first uses GEMINI_URL and GEMINI_API_KEY.
+SUMMARIZER_PROVIDERS = [{"name": "gemini", "backend": "apps.summarizer.providers.GeminiProvider"}]
+if os.environ.get("SUMMARIZER_SECONDARY_URL"):
+    SUMMARIZER_PROVIDERS.append(
+        {
+            "name": os.environ.get("SUMMARIZER_SECONDARY_NAME", "secondary"),
+            "backend": os.environ.get("SUMMARIZER_SECONDARY_BACKEND", "apps.summarizer.providers.GeminiProvider"),
+            "url": os.environ.get("SUMMARIZER_SECONDARY_URL"),
+            "api_key": os.environ.get("SUMMARIZER_SECONDARY_API_KEY", GEMINI_API_KEY),
+        }
+    )
+SUMMARIZER_HEDGE_DELAY = float(os.environ.get("SUMMARIZER_HEDGE_DELAY", 2))
+SUMMARIZER_HEDGE_BUDGET = float(os.environ.get("SUMMARIZER_HEDGE_BUDGET", 0.1))
+SUMMARIZER_EXPLORE_RATE = float(os.environ.get("SUMMARIZER_EXPLORE_RATE", 0.05))
+SUMMARIZER_LATENCY_WINDOW = int(os.environ.get("SUMMARIZER_LATENCY_WINDOW", 200))
+SUMMARIZER_LATENCY_MAX_AGE = int(os.environ.get("SUMMARIZER_LATENCY_MAX_AGE", 300))
+SUMMARIZER_LATENCY_MIN_SAMPLES = int(os.environ.get("SUMMARIZER_LATENCY_MIN_SAMPLES", 20))
+SUMMARIZER_LOCAL_MAX_WORDS = int(os.environ.get("SUMMARIZER_LOCAL_MAX_WORDS", 150))
+SUMMARIZER_LOCAL_FALLBACK = os.environ.get("SUMMARIZER_LOCAL_FALLBACK", "True").lower() == "true"
+SUMMARY_JOB_WORKERS = int(os.environ.get("SUMMARY_JOB_WORKERS", 4))
+SUMMARY_JOB_MAX_QUEUED_PER_USER = int(os.environ.get("SUMMARY_JOB_MAX_QUEUED_PER_USER", 10))
+SUMMARY_JOB_MAX_ATTEMPTS = int(os.environ.get("SUMMARY_JOB_MAX_ATTEMPTS", 3))
+SUMMARY_JOB_POLL_INTERVAL = float(os.environ.get("SUMMARY_JOB_POLL_INTERVAL", 0.5))
+SUMMARY_JOB_STALE_AFTER = int(os.environ.get("SUMMARY_JOB_STALE_AFTER", 300))
+CONTENT_SUMMARY_WORKERS = int(os.environ.get("CONTENT_SUMMARY_WORKERS", 2))
+CONTENT_SUMMARY_LENGTHS = [int(length) for length in os.environ.get("CONTENT_SUMMARY_LENGTHS", "100,300").split(",")]
+CONTENT_SUMMARY_MAX_BYTES = int(os.environ.get("CONTENT_SUMMARY_MAX_BYTES", 20 * 1024 * 1024))
+# Hosts lecture files are downloaded from for summaries, over https only; a leading dot allows subdomains.
+CONTENT_SUMMARY_ALLOWED_HOSTS = [host.strip().lower() for host in os.environ.get("CONTENT_SUMMARY_ALLOWED_HOSTS", "res.cloudinary.com").split(",") if host.strip()]
+
 # -------------------------------
 # Cloud Storage (Cloudinary)
 # -------------------------------
@@ -155,7 +263,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Django REST Framework / JWT
 # -------------------------------
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": ("rest_framework_simplejwt.authentication.JWTAuthentication",),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("apps.users.authentication.CachedUserAuthentication",),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
 }
 
@@ -164,6 +272,9 @@ SIMPLE_JWT: dict[str, Any] = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=30),
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
+# In-process cache of the users loaded to authenticate requests.
+AUTH_USER_CACHE_SIZE = int(os.environ.get("AUTH_USER_CACHE_SIZE", 1024))
+AUTH_USER_CACHE_TTL = int(os.environ.get("AUTH_USER_CACHE_TTL", 30))
 
 # -------------------------------
 # CORS configuration
@@ -12,4 +12,5 @@ urlpatterns = [
     path("v1/", include("apps.saved_courses.urls")),
     path("v1/", include("apps.intake.urls")),
     path("v1/", include("apps.summarizer.urls")),
+    path("v1/", include("apps.feed.urls")),
 ]
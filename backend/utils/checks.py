@@ -0,0 +1,49 @@
+# type: ignore
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+# Backends that keep entries inside one process, so other workers never see their writes.
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+# Shared backends whose `incr` is one atomic operation, which unread counters are adjusted with.
+ATOMIC_INCR_CACHES = (
+    "django.core.cache.backends.redis.RedisCache",
+    "django.core.cache.backends.memcached.PyMemcacheCache",
+    "django.core.cache.backends.memcached.PyLibMCCache",
+)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Unread counters and cached feeds are invalidated by the worker that handles
+    the write; with a per-process cache every other worker keeps serving stale
+    values. An error in production, a warning under DEBUG.
+    """
+    backend = settings.CACHES["default"]["BACKEND"]
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    message = f"The default cache ({backend}) is not shared between processes, so unread counts and feeds go stale on other workers."
+    hint = "Set REDIS_URL to keep the cache in Redis."
+    if settings.DEBUG:
+        return [Warning(message, hint=hint, id="utils.W001")]
+    return [Error(message, hint=hint, id="utils.E001")]
+
+
+@register(Tags.caches)
+def check_atomic_incr(app_configs, **kwargs):
+    """
+    Unread counters are adjusted with the cache's `incr`. Where it is not
+    atomic (the database cache), each change drops the counter instead, and
+    the next read recounts it. An error in production, a warning under DEBUG.
+    """
+    backend = settings.CACHES["default"]["BACKEND"]
+    if backend in ATOMIC_INCR_CACHES or backend in PROCESS_LOCAL_CACHES:
+        return []
+    message = f"The default cache ({backend}) has no atomic incr, so unread counts are recounted from the database after every change."
+    hint = "Set REDIS_URL to keep the cache in Redis."
+    if settings.DEBUG:
+        return [Warning(message, hint=hint, id="utils.W002")]
+    return [Error(message, hint=hint, id="utils.E002")]
@@ -0,0 +1,149 @@
+# type: ignore
+import base64
+import json
+import uuid
+
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+COUNT_EXACT = "exact"
+COUNT_ESTIMATE = "estimate"
+COUNT_NONE = "none"
+
+
+def estimate_count(queryset) -> int:
+    """
+    Planner row estimate for a queryset, without scanning it.
+    Unfiltered querysets read `pg_class.reltuples`; filtered ones use the EXPLAIN estimate.
+    """
+    connection = connections[queryset.db]
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+            # reltuples is -1 until the table has been vacuumed or analyzed.
+            if row and row[0] >= 0:
+                return row[0]
+        sql, params = queryset.order_by().query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class CursorPageNumberPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset mode.
+
+    Sending `?cursor=` (empty for the first page) switches to keyset pagination on
+    `(cursor_ordering[0], cursor_ordering[1])`, newest first. Keyset pages never use
+    OFFSET, and the total is only computed when asked for with `?count=exact` or
+    `?count=estimate`.
+
+    A view may also paginate a list of querysets selecting the same columns (e.g. an
+    inbox merged from two tables). They are combined with UNION ALL; in keyset mode
+    each one is filtered and limited to a page before they are combined.
+
+    Keyset pages replace the queryset's ordering, so a queryset ordered by an
+    annotation first (a search rank or similarity) rejects `?cursor=` with a 400
+    instead of silently dropping its relevance order.
+    """
+
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    cursor_ordering = ("created_at", "id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        field, tiebreaker = self.cursor_ordering
+        parts = queryset if isinstance(queryset, (list, tuple)) else None
+        if not self.cursor_mode:
+            if parts is not None:
+                queryset = self.combine(parts).order_by(f"-{field}", f"-{tiebreaker}")
+            return super().paginate_queryset(queryset, request, view)
+
+        for part in parts or [queryset]:
+            if self.ordered_by_annotation(part):
+                raise ValidationError({self.cursor_query_param: "Cursor pagination is not available for results ordered by relevance; use page numbers."})
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        parts = [part.order_by(f"-{field}", f"-{tiebreaker}") for part in (parts or [queryset])]
+        self.total = self.get_total(parts, request)
+
+        position = self.decode_cursor(request.query_params[self.cursor_query_param])
+        if position is not None:
+            value, key = position
+            parts = [part.filter(Q(**{f"{field}__lt": value}) | Q(**{field: value, f"{tiebreaker}__lt": key})) for part in parts]
+
+        if len(parts) == 1:
+            queryset = parts[0]
+        else:
+            queryset = self.combine([part[: page_size + 1] for part in parts]).order_by(f"-{field}", f"-{tiebreaker}")
+        rows = list(queryset[: page_size + 1])
+        self.page_rows = rows[:page_size]
+        self.next_position = self.position_of(self.page_rows[-1]) if len(rows) > page_size else None
+        return self.page_rows
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response({"count": self.total, "next": self.get_next_link(), "previous": None, "results": data})
+
+    def get_next_link(self):
+        if not self.cursor_mode:
+            return super().get_next_link()
+        if self.next_position is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_previous_link(self):
+        if not self.cursor_mode:
+            return super().get_previous_link()
+        return None
+
+    def get_total(self, parts, request):
+        mode = request.query_params.get(self.count_query_param, COUNT_NONE)
+        if mode == COUNT_EXACT:
+            return sum(part.count() for part in parts)
+        if mode == COUNT_ESTIMATE:
+            return sum(estimate_count(part) for part in parts)
+        return None
+
+    def ordered_by_annotation(self, queryset):
+        ordering = queryset.query.order_by
+        return bool(ordering) and isinstance(ordering[0], str) and ordering[0].lstrip("-") in queryset.query.annotations
+
+    def combine(self, parts):
+        first, *rest = [part.order_by() if not part.query.is_sliced else part for part in parts]
+        return first.union(*rest, all=True) if rest else first
+
+    def position_of(self, instance):
+        field, tiebreaker = self.cursor_ordering
+        if isinstance(instance, dict):
+            return instance[field], instance[tiebreaker]
+        return getattr(instance, field), getattr(instance, tiebreaker)
+
+    def encode_cursor(self, position):
+        value, key = position
+        raw = json.dumps([value.isoformat(), str(key)])
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, encoded):
+        if not encoded:
+            return None
+        try:
+            value, key = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            value = parse_datetime(value)
+            key = uuid.UUID(key)
+        except (TypeError, ValueError, AttributeError):
+            raise NotFound("Invalid cursor.")
+        if value is None:
+            raise NotFound("Invalid cursor.")
+        return value, key